@@ -4,6 +4,7 @@ from circuits.models import Provider, Circuit, CircuitTermination, CircuitType
 from dcim.api.serializers import SiteNestedSerializer, InterfaceNestedSerializer
 from extras.api.serializers import CustomFieldSerializer
 from tenancy.api.serializers import TenantNestedSerializer
+from utilities.api import WritableSerializer
 
 
 #
@@ -69,3 +70,10 @@ class CircuitNestedSerializer(CircuitSerializer):
 
     class Meta(CircuitSerializer.Meta):
         fields = ['id', 'cid']
+
+
+class WritableCircuitSerializer(WritableSerializer):
+
+    class Meta(WritableSerializer.Meta):
+        model = Circuit
+        fields = ['id', 'cid', 'provider', 'type', 'tenant', 'install_date', 'commit_rate', 'comments']
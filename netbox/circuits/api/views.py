@@ -4,6 +4,7 @@ from circuits.models import Provider, CircuitType, Circuit
 from circuits.filters import CircuitFilter
 
 from extras.api.views import CustomFieldModelAPIView
+from utilities.api import BulkWriteMixin
 from . import serializers
 
 
@@ -39,13 +40,14 @@ class CircuitTypeDetailView(generics.RetrieveAPIView):
     serializer_class = serializers.CircuitTypeSerializer
 
 
-class CircuitListView(CustomFieldModelAPIView, generics.ListAPIView):
+class CircuitListView(BulkWriteMixin, CustomFieldModelAPIView, generics.ListAPIView):
     """
-    List circuits (filterable)
+    List circuits (filterable), or create, update, or delete circuits in bulk
     """
     queryset = Circuit.objects.select_related('type', 'tenant', 'provider')\
         .prefetch_related('custom_field_values__field')
     serializer_class = serializers.CircuitSerializer
+    write_serializer_class = serializers.WritableCircuitSerializer
     filter_class = CircuitFilter
 
 
@@ -145,10 +145,10 @@ class CircuitTerminationForm(BootstrapMixin, forms.ModelForm):
                                   widget=APISelect(api_url='/api/dcim/racks/?site_id={{site}}',
                                                    attrs={'filter-for': 'device'}))
     device = forms.ModelChoiceField(queryset=Device.objects.all(), required=False, label='Device',
-                                    widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack}}',
+                                    widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack}}',
                                                      display_field='display_name', attrs={'filter-for': 'interface'}))
     livesearch = forms.CharField(required=False, label='Device', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='device')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='device')
     )
     interface = forms.ModelChoiceField(queryset=Interface.objects.all(), required=False, label='Interface',
                                        widget=APISelect(api_url='/api/dcim/devices/{{device}}/interfaces/?type=physical',
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from utilities.sql import create_trigram_indexes
+
+
+TRIGRAM_INDEXES = (
+    ('circuits_provider', 'name'),
+    ('circuits_provider', 'account'),
+    ('circuits_provider', 'comments'),
+    ('circuits_circuit', 'cid'),
+    ('circuits_circuit', 'comments'),
+    ('circuits_circuittermination', 'xconnect_id'),
+    ('circuits_circuittermination', 'pp_info'),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0006_install_pg_trgm'),
+        ('circuits', '0006_terminations'),
+    ]
+
+    operations = create_trigram_indexes(TRIGRAM_INDEXES)
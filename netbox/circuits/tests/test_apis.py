@@ -0,0 +1,143 @@
+from rest_framework import status
+from rest_framework.filters import DjangoFilterBackend
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from circuits.api.serializers import CircuitSerializer
+from circuits.api.views import CircuitListView
+from circuits.models import Circuit, CircuitTermination, CircuitType, Provider
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Rack, Site
+from netbox.api import get_serializer_plan, optimize_queryset
+from tenancy.models import Tenant
+
+
+class CircuitQueryPlanTest(SimpleTestCase):
+
+    def test_plan(self):
+
+        select_related, prefetch_related = get_serializer_plan(CircuitSerializer, Circuit)
+
+        self.assertEqual(select_related, ['provider', 'type', 'tenant'])
+        self.assertEqual(prefetch_related, [
+            ('terminations', CircuitTermination, ['site', 'interface', 'interface__device'], []),
+        ])
+
+    def test_existing_prefetch(self):
+
+        queryset = optimize_queryset(Circuit.objects.prefetch_related('terminations__site'), CircuitSerializer)
+
+        self.assertEqual(list(queryset._prefetch_related_lookups), ['terminations__site'])
+
+
+class CircuitListQueriesTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.provider = Provider.objects.create(name='Provider 1', slug='provider-1')
+        self.type = CircuitType.objects.create(name='Type 1', slug='type-1')
+        self.tenant = Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+        self.site = Site.objects.create(name='Site 1', slug='site-1')
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        self.device = Device.objects.create(name='Device 1', device_type=device_type, device_role=device_role,
+                                            rack=Rack.objects.create(name='Rack 1', site=self.site))
+        self.url = reverse('circuits-api:circuit_list')
+
+    def create_circuits(self, count):
+        for i in range(Circuit.objects.count(), Circuit.objects.count() + count):
+            circuit = Circuit.objects.create(cid='CID{}'.format(i), provider=self.provider, type=self.type,
+                                             tenant=self.tenant)
+            interface = Interface.objects.create(device=self.device, name='eth{}'.format(i))
+            CircuitTermination.objects.create(circuit=circuit, term_side='A', site=self.site, interface=interface,
+                                              port_speed=1000)
+            CircuitTermination.objects.create(circuit=circuit, term_side='Z', site=self.site, port_speed=1000)
+
+    def count_queries(self, view_class):
+        request = APIRequestFactory().get(self.url)
+        force_authenticate(request, self.user)
+        with CaptureQueriesContext(connection) as context:
+            response = view_class.as_view()(request)
+            response.render()
+        return len(context.captured_queries)
+
+    def test_list(self):
+
+        # Custom fields (twice), circuits (with their provider, type and tenant), custom field values, and terminations
+        # (with their site, interface and device)
+        self.create_circuits(2)
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 2)
+
+        self.create_circuits(8)
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(response.data[0]['terminations'][0]['interface']['device']['name'], 'Device 1')
+
+    def test_list_without_planning(self):
+
+        # Without SerializerQueryPlanBackend, the terminations of each circuit are retrieved separately
+        class UnplannedCircuitListView(CircuitListView):
+            filter_backends = [DjangoFilterBackend]
+
+        self.create_circuits(2)
+        queries = self.count_queries(UnplannedCircuitListView)
+        self.create_circuits(8)
+        self.assertGreater(self.count_queries(UnplannedCircuitListView), queries)
+        self.assertEqual(self.count_queries(CircuitListView), 5)
+
+
+class CircuitBulkWriteTest(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        self.provider = Provider.objects.create(name='Provider 1', slug='provider-1')
+        self.type = CircuitType.objects.create(name='Type 1', slug='type-1')
+        self.url = reverse('circuits-api:circuit_list')
+
+    def test_create(self):
+
+        data = [{'cid': 'CID{}'.format(i), 'provider': self.provider.pk, 'type': self.type.pk} for i in range(3)]
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([c['cid'] for c in response.data], ['CID0', 'CID1', 'CID2'])
+        self.assertEqual(Circuit.objects.count(), 3)
+
+    def test_invalid_create(self):
+
+        Circuit.objects.create(cid='CID0', provider=self.provider, type=self.type)
+        data = [
+            {'cid': 'CID0', 'provider': self.provider.pk, 'type': self.type.pk},
+            {'cid': 'CID1', 'provider': self.provider.pk, 'type': self.type.pk},
+            {'cid': 'CID1', 'provider': self.provider.pk, 'type': self.type.pk},
+        ]
+        response = self.client.post(self.url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([bool(e) for e in response.data], [True, False, True])
+        self.assertEqual(Circuit.objects.count(), 1)
+
+    def test_update_and_delete(self):
+
+        circuits = [Circuit.objects.create(cid='CID{}'.format(i), provider=self.provider, type=self.type)
+                    for i in range(2)]
+        response = self.client.patch(self.url, [{'id': c.pk, 'commit_rate': 1000} for c in circuits], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(Circuit.objects.values_list('commit_rate', flat=True)), [1000, 1000])
+
+        response = self.client.delete(self.url, [c.pk for c in circuits], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Circuit.objects.exists())
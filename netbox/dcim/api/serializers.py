@@ -1,20 +1,38 @@
 from rest_framework import serializers
 
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
+
 from ipam.models import IPAddress
+from dcim.bulk import build_components, clean_components, create_components
 from dcim.models import (
     ConsolePort, ConsolePortTemplate, ConsoleServerPort, ConsoleServerPortTemplate, Device, DeviceBay, DeviceType,
     DeviceRole, Interface, InterfaceConnection, InterfaceTemplate, Manufacturer, Module, Platform, PowerOutlet,
     PowerOutletTemplate, PowerPort, PowerPortTemplate, Rack, RackGroup, RackRole, RACK_FACE_FRONT, RACK_FACE_REAR, Site,
-    SUBDEVICE_ROLE_CHILD, SUBDEVICE_ROLE_PARENT,
+    SUBDEVICE_ROLE_CHILD, SUBDEVICE_ROLE_PARENT, create_device_components,
 )
 from extras.api.serializers import CustomFieldSerializer
+from extras.stats import annotate_stats
 from tenancy.api.serializers import TenantNestedSerializer
+from utilities.api import BULK_MAX_OBJECTS, WritableSerializer
+from utilities.forms import expand_name_string
 
 
 #
 # Sites
 #
 
+class SiteListSerializer(serializers.ListSerializer):
+    """
+    Retrieves the counts of all listed sites together (see annotate_stats()), rather than with five queries per site.
+    """
+
+    def to_representation(self, data):
+        if 'count_racks' in self.child.fields:
+            data = annotate_stats(data.all() if isinstance(data, models.Manager) else data)
+        return super(SiteListSerializer, self).to_representation(data)
+
+
 class SiteSerializer(CustomFieldSerializer, serializers.ModelSerializer):
     tenant = TenantNestedSerializer()
 
@@ -23,6 +41,7 @@ class SiteSerializer(CustomFieldSerializer, serializers.ModelSerializer):
         fields = ['id', 'name', 'slug', 'tenant', 'facility', 'asn', 'physical_address', 'shipping_address',
                   'contact_name', 'contact_phone', 'contact_email', 'comments', 'custom_fields', 'count_prefixes',
                   'count_vlans', 'count_racks', 'count_devices', 'count_circuits']
+        list_serializer_class = SiteListSerializer
 
 
 class SiteNestedSerializer(SiteSerializer):
@@ -288,6 +307,49 @@ class DeviceNestedSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'display_name']
 
 
+class WritableDeviceSerializer(WritableSerializer):
+
+    class Meta(WritableSerializer.Meta):
+        model = Device
+        fields = ['id', 'name', 'device_type', 'device_role', 'tenant', 'platform', 'serial', 'asset_tag', 'rack',
+                  'position', 'face', 'status', 'comments']
+
+    def validate_batch(self, devices):
+        # Device.clean() validates rack space only against the devices already saved, so also check that no two
+        # devices in the batch occupy the same unit of the same rack face.
+        occupied = set()
+        errors = {}
+        for i, device in enumerate(devices):
+            if device.rack_id is None or not device.position or device.face is None:
+                continue
+            device_type = device.device_type
+            faces = (RACK_FACE_FRONT, RACK_FACE_REAR) if device_type.is_full_depth else (device.face,)
+            units = [(device.rack_id, face, u) for face in faces
+                     for u in range(device.position, device.position + device_type.u_height)]
+            if any(unit in occupied for unit in units):
+                errors[i] = {'position': [
+                    "U{} is already occupied by another device in this request or does not have sufficient space to "
+                    "accommodate a(n) {} ({}U).".format(device.position, device_type, device_type.u_height)
+                ]}
+            else:
+                occupied.update(units)
+        return errors
+
+    def post_create(self, devices):
+        create_device_components(devices)
+
+    def post_update(self, devices):
+        # Move any child devices to their parent's (new) rack
+        racks = {d.pk: d.rack_id for d in devices}
+        children = {}
+        for child_pk, parent_pk, rack_pk in Device.objects.filter(parent_bay__device__in=devices)\
+                .values_list('pk', 'parent_bay__device', 'rack'):
+            if rack_pk != racks[parent_pk]:
+                children.setdefault(racks[parent_pk], []).append(child_pk)
+        for rack_pk, child_pks in children.items():
+            Device.objects.filter(pk__in=child_pks).update(rack=rack_pk)
+
+
 #
 # Console server ports
 #
@@ -382,6 +444,13 @@ class InterfaceNestedSerializer(InterfaceSerializer):
         fields = ['id', 'device', 'name']
 
 
+class WritableInterfaceSerializer(WritableSerializer):
+
+    class Meta(WritableSerializer.Meta):
+        model = Interface
+        fields = ['id', 'device', 'name', 'form_factor', 'mac_address', 'mgmt_only', 'description']
+
+
 class InterfaceDetailSerializer(InterfaceSerializer):
     connected_interface = InterfaceSerializer()
 
@@ -416,6 +485,90 @@ class DeviceBayDetailSerializer(DeviceBaySerializer):
         fields = ['id', 'device', 'name', 'installed_device']
 
 
+#
+# Bulk device component creation
+#
+
+class DeviceComponentBulkAddSerializer(WritableSerializer):
+    """
+    Creates components from a name pattern (e.g. `xe-0/0/[0-47]`) on each of a list of devices, all having the same
+    attributes.
+    """
+    devices = serializers.ListField(child=serializers.IntegerField(), help_text="List of device IDs")
+    name = serializers.CharField(help_text="Name, optionally including a numeric range. Example: xe-0/0/[0-47]")
+
+    class Meta(WritableSerializer.Meta):
+        fields = ['devices', 'name']
+
+    def validate_devices(self, value):
+        if len(value) > BULK_MAX_OBJECTS:
+            raise serializers.ValidationError("No more than {} devices may be given.".format(BULK_MAX_OBJECTS))
+        devices = list(Device.objects.select_related('device_type__manufacturer').filter(pk__in=value))
+        missing = set(value) - set(d.pk for d in devices)
+        if missing:
+            raise serializers.ValidationError("Invalid device IDs: {}".format(
+                ', '.join(str(pk) for pk in sorted(missing))
+            ))
+        return devices
+
+    def validate(self, attrs):
+        attrs = dict(attrs)
+        devices = attrs.pop('devices')
+        # Expand no more names than may be created on every device
+        max_names = BULK_MAX_OBJECTS // max(len(devices), 1)
+        names = expand_name_string(attrs.pop('name'), limit=max_names + 1)
+        if len(names) > max_names:
+            raise serializers.ValidationError({
+                'name': ["No more than {} components may be created at once.".format(BULK_MAX_OBJECTS)]
+            })
+        self.components = build_components(self.Meta.model, devices, names, **attrs)
+        try:
+            clean_components(self.components)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'name': e.messages})
+        return attrs
+
+    def create(self, validated_data):
+        return create_components(self.components)
+
+
+class ConsolePortBulkAddSerializer(DeviceComponentBulkAddSerializer):
+
+    class Meta(DeviceComponentBulkAddSerializer.Meta):
+        model = ConsolePort
+
+
+class ConsoleServerPortBulkAddSerializer(DeviceComponentBulkAddSerializer):
+
+    class Meta(DeviceComponentBulkAddSerializer.Meta):
+        model = ConsoleServerPort
+
+
+class PowerPortBulkAddSerializer(DeviceComponentBulkAddSerializer):
+
+    class Meta(DeviceComponentBulkAddSerializer.Meta):
+        model = PowerPort
+
+
+class PowerOutletBulkAddSerializer(DeviceComponentBulkAddSerializer):
+
+    class Meta(DeviceComponentBulkAddSerializer.Meta):
+        model = PowerOutlet
+
+
+class InterfaceBulkAddSerializer(DeviceComponentBulkAddSerializer):
+
+    class Meta(DeviceComponentBulkAddSerializer.Meta):
+        model = Interface
+        fields = ['devices', 'name', 'form_factor', 'mgmt_only', 'description']
+
+
+class DeviceBayBulkAddSerializer(DeviceComponentBulkAddSerializer):
+
+    class Meta(DeviceComponentBulkAddSerializer.Meta):
+        model = DeviceBay
+
+
 #
 # Modules
 #
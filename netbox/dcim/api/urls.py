@@ -45,6 +45,7 @@ urlpatterns = [
 
     # Devices
     url(r'^devices/$', DeviceListView.as_view(), name='device_list'),
+    url(r'^devices/typeahead/$', DeviceTypeaheadView.as_view(), name='device_typeahead'),
     url(r'^devices/(?P<pk>\d+)/$', DeviceDetailView.as_view(), name='device_detail'),
     url(r'^devices/(?P<pk>\d+)/lldp-neighbors/$', LLDPNeighborsView.as_view(), name='device_lldp-neighbors'),
     url(r'^devices/(?P<pk>\d+)/console-ports/$', ConsolePortListView.as_view(), name='device_consoleports'),
@@ -56,6 +57,15 @@ urlpatterns = [
     url(r'^devices/(?P<pk>\d+)/device-bays/$', DeviceBayListView.as_view(), name='device_devicebays'),
     url(r'^devices/(?P<pk>\d+)/modules/$', ModuleListView.as_view(), name='device_modules'),
 
+    # Bulk device component creation
+    url(r'^console-ports/bulk-add/$', ConsolePortBulkAddView.as_view(), name='consoleport_bulk_add'),
+    url(r'^console-server-ports/bulk-add/$', ConsoleServerPortBulkAddView.as_view(),
+        name='consoleserverport_bulk_add'),
+    url(r'^power-ports/bulk-add/$', PowerPortBulkAddView.as_view(), name='powerport_bulk_add'),
+    url(r'^power-outlets/bulk-add/$', PowerOutletBulkAddView.as_view(), name='poweroutlet_bulk_add'),
+    url(r'^interfaces/bulk-add/$', InterfaceBulkAddView.as_view(), name='interface_bulk_add'),
+    url(r'^device-bays/bulk-add/$', DeviceBayBulkAddView.as_view(), name='devicebay_bulk_add'),
+
     # Console ports
     url(r'^console-ports/(?P<pk>\d+)/$', ConsolePortView.as_view(), name='consoleport'),
 
@@ -63,6 +73,7 @@ urlpatterns = [
     url(r'^power-ports/(?P<pk>\d+)/$', PowerPortView.as_view(), name='powerport'),
 
     # Interfaces
+    url(r'^interfaces/$', InterfaceBulkView.as_view(), name='interface_list'),
     url(r'^interfaces/(?P<pk>\d+)/$', InterfaceDetailView.as_view(), name='interface_detail'),
     url(r'^interfaces/(?P<pk>\d+)/graphs/$', GraphListView.as_view(), {'type': GRAPH_TYPE_INTERFACE},
         name='interface_graphs'),
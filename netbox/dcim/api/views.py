@@ -1,5 +1,5 @@
-from rest_framework import generics
-from rest_framework.permissions import DjangoModelPermissionsOrAnonReadOnly
+from rest_framework import generics, status
+from rest_framework.permissions import DjangoModelPermissions, DjangoModelPermissionsOrAnonReadOnly
 from rest_framework.response import Response
 from rest_framework.settings import api_settings
 from rest_framework.views import APIView
@@ -16,7 +16,7 @@ from dcim.models import (
 from dcim import filters
 from extras.api.views import CustomFieldModelAPIView
 from extras.api.renderers import BINDZoneRenderer, FlatJSONRenderer
-from utilities.api import ServiceUnavailable
+from utilities.api import BulkWriteMixin, ServiceUnavailable, TypeaheadView
 from .exceptions import MissingFilterException
 from . import serializers
 
@@ -219,19 +219,31 @@ class PlatformDetailView(generics.RetrieveAPIView):
 # Devices
 #
 
-class DeviceListView(CustomFieldModelAPIView, generics.ListAPIView):
+class DeviceListView(BulkWriteMixin, CustomFieldModelAPIView, generics.ListAPIView):
     """
-    List devices (filterable)
+    List devices (filterable), or create, update, or delete devices in bulk
     """
     queryset = Device.objects.select_related('device_type__manufacturer', 'device_role', 'tenant', 'platform',
                                              'rack__site', 'parent_bay').prefetch_related('primary_ip4__nat_outside',
                                                                                           'primary_ip6__nat_outside',
                                                                                           'custom_field_values__field')
     serializer_class = serializers.DeviceSerializer
+    write_serializer_class = serializers.WritableDeviceSerializer
     filter_class = filters.DeviceFilter
     renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [BINDZoneRenderer, FlatJSONRenderer]
 
 
+class DeviceTypeaheadView(TypeaheadView):
+    """
+    List the ID and name of devices matching a query (filterable)
+    """
+    queryset = Device.objects.select_related('device_type__manufacturer', 'rack')
+    filter_class = filters.DeviceFilter
+    lookup = 'name__icontains'
+    prefix_lookup = 'name__istartswith'
+    fields = ('id', 'name', 'display_name')
+
+
 class DeviceDetailView(CustomFieldModelAPIView, generics.RetrieveAPIView):
     """
     Retrieve a single device
@@ -345,6 +357,16 @@ class InterfaceListView(generics.ListAPIView):
         return queryset
 
 
+class InterfaceBulkView(BulkWriteMixin, generics.ListAPIView):
+    """
+    List all interfaces (filterable), or create, update, or delete interfaces in bulk
+    """
+    queryset = Interface.objects.select_related('device')
+    serializer_class = serializers.InterfaceSerializer
+    write_serializer_class = serializers.WritableInterfaceSerializer
+    filter_class = filters.InterfaceFilter
+
+
 class InterfaceDetailView(generics.RetrieveAPIView):
     """
     Retrieve a single interface
@@ -383,6 +405,55 @@ class DeviceBayListView(generics.ListAPIView):
         return DeviceBay.objects.filter(device=device).select_related('installed_device')
 
 
+#
+# Bulk device component creation
+#
+
+class DeviceComponentBulkAddView(generics.GenericAPIView):
+    """
+    Add components in bulk from a name pattern (e.g. `xe-0/0/[0-47]`) to each of a list of devices
+    """
+
+    def get_permissions(self):
+        return super(DeviceComponentBulkAddView, self).get_permissions() + [DjangoModelPermissions()]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        components = serializer.save()
+        return Response({'count': len(components)}, status=status.HTTP_201_CREATED)
+
+
+class ConsolePortBulkAddView(DeviceComponentBulkAddView):
+    queryset = ConsolePort.objects.all()
+    serializer_class = serializers.ConsolePortBulkAddSerializer
+
+
+class ConsoleServerPortBulkAddView(DeviceComponentBulkAddView):
+    queryset = ConsoleServerPort.objects.all()
+    serializer_class = serializers.ConsoleServerPortBulkAddSerializer
+
+
+class PowerPortBulkAddView(DeviceComponentBulkAddView):
+    queryset = PowerPort.objects.all()
+    serializer_class = serializers.PowerPortBulkAddSerializer
+
+
+class PowerOutletBulkAddView(DeviceComponentBulkAddView):
+    queryset = PowerOutlet.objects.all()
+    serializer_class = serializers.PowerOutletBulkAddSerializer
+
+
+class InterfaceBulkAddView(DeviceComponentBulkAddView):
+    queryset = Interface.objects.all()
+    serializer_class = serializers.InterfaceBulkAddSerializer
+
+
+class DeviceBayBulkAddView(DeviceComponentBulkAddView):
+    queryset = DeviceBay.objects.all()
+    serializer_class = serializers.DeviceBayBulkAddSerializer
+
+
 #
 # Modules
 #
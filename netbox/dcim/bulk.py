@@ -0,0 +1,69 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+
+# Number of components inserted by each query
+CHUNK_SIZE = 500
+
+# Maximum number of invalid components reported for a batch
+MAX_ERRORS = 10
+
+
+def build_components(model, devices, names, **attrs):
+    """
+    Return a list of new (unsaved) components of the given model: one for each name on each of the given Devices, all
+    having the same attributes.
+    """
+    return [model(device=device, name=name, **attrs) for device in devices for name in names]
+
+
+def clean_components(components):
+    """
+    Validate a batch of new device components (all of the same model). The (device, name) pairs already in use by the
+    components' Devices are retrieved with a single query, and all other validation is performed in memory. Raises a
+    ValidationError listing (up to MAX_ERRORS of) the invalid components.
+    """
+    if not components:
+        return
+    model = type(components[0])
+
+    existing = set(model.objects.filter(
+        device__in=set(c.device_id for c in components)
+    ).order_by().values_list('device', 'name'))
+
+    errors = []
+    for component in components:
+        try:
+            # The device itself has already been validated; skip the query which would otherwise be run to check it.
+            component.clean_fields(exclude=['device'])
+            component.clean()
+        except ValidationError as e:
+            errors.append(u"{} {}: {}".format(component.device, component.name, ' '.join(e.messages)))
+            continue
+        key = (component.device_id, component.name)
+        if key in existing:
+            errors.append(u"{} {}: {} with this name already exists.".format(
+                component.device, component.name, model._meta.verbose_name.capitalize()
+            ))
+        else:
+            existing.add(key)
+
+    if errors:
+        if len(errors) > MAX_ERRORS:
+            errors = errors[:MAX_ERRORS] + [u"({} more {} are invalid.)".format(
+                len(errors) - MAX_ERRORS, model._meta.verbose_name_plural
+            )]
+        raise ValidationError(errors)
+
+
+def create_components(components, chunk_size=CHUNK_SIZE):
+    """
+    Save a batch of new (validated) device components with one INSERT per chunk of `chunk_size`, within a single
+    transaction. Returns the list of components.
+    """
+    if components:
+        model = type(components[0])
+        with transaction.atomic():
+            for i in range(0, len(components), chunk_size):
+                model.objects.bulk_create(components[i:i + chunk_size])
+    return components
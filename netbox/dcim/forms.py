@@ -636,8 +636,8 @@ class DeviceBulkEditForm(BootstrapMixin, CustomFieldBulkEditForm):
 class DeviceFilterForm(BootstrapMixin, CustomFieldFilterForm):
     model = Device
     site = FilterChoiceField(queryset=Site.objects.annotate(filter_count=Count('racks__devices')), to_field_name='slug')
-    rack_group_id = FilterChoiceField(queryset=RackGroup.objects.annotate(filter_count=Count('racks__devices')),
-                                      label='Rack Group')
+    rack_group_id = FilterChoiceField(queryset=RackGroup.objects.select_related('site')
+                                      .annotate(filter_count=Count('racks__devices')), label='Rack Group')
     role = FilterChoiceField(queryset=DeviceRole.objects.annotate(filter_count=Count('devices')), to_field_name='slug')
     tenant = FilterChoiceField(queryset=Tenant.objects.annotate(filter_count=Count('devices')), to_field_name='slug',
                                null_option=(0, 'None'))
@@ -654,7 +654,8 @@ class DeviceFilterForm(BootstrapMixin, CustomFieldFilterForm):
 #
 
 class DeviceBulkAddComponentForm(BootstrapMixin, forms.Form):
-    pk = forms.ModelMultipleChoiceField(queryset=Device.objects.all(), widget=forms.MultipleHiddenInput)
+    pk = forms.ModelMultipleChoiceField(queryset=Device.objects.select_related('device_type__manufacturer'),
+                                        widget=forms.MultipleHiddenInput)
     name_pattern = ExpandableNameField(label='Name')
 
 
@@ -754,11 +755,11 @@ class ConsolePortConnectionForm(BootstrapMixin, forms.ModelForm):
     rack = forms.ModelChoiceField(queryset=Rack.objects.all(), label='Rack', required=False,
                                   widget=forms.Select(attrs={'filter-for': 'console_server'}))
     console_server = forms.ModelChoiceField(queryset=Device.objects.all(), label='Console Server', required=False,
-                                            widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack}}&is_console_server=True',
+                                            widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack}}&is_console_server=True',
                                                              display_field='display_name',
                                                              attrs={'filter-for': 'cs_port'}))
     livesearch = forms.CharField(required=False, label='Console Server', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='console_server')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='console_server')
     )
     cs_port = forms.ModelChoiceField(queryset=ConsoleServerPort.objects.all(), label='Port',
                                      widget=APISelect(api_url='/api/dcim/devices/{{console_server}}/console-server-ports/',
@@ -822,10 +823,10 @@ class ConsoleServerPortConnectionForm(BootstrapMixin, forms.Form):
     rack = forms.ModelChoiceField(queryset=Rack.objects.all(), label='Rack', required=False,
                                   widget=forms.Select(attrs={'filter-for': 'device'}))
     device = forms.ModelChoiceField(queryset=Device.objects.all(), label='Device', required=False,
-                                    widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack}}',
+                                    widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack}}',
                                                      display_field='display_name', attrs={'filter-for': 'port'}))
     livesearch = forms.CharField(required=False, label='Device', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='device')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='device')
     )
     port = forms.ModelChoiceField(queryset=ConsolePort.objects.all(), label='Port',
                                   widget=APISelect(api_url='/api/dcim/devices/{{device}}/console-ports/',
@@ -951,10 +952,10 @@ class PowerPortConnectionForm(BootstrapMixin, forms.ModelForm):
     rack = forms.ModelChoiceField(queryset=Rack.objects.all(), label='Rack', required=False,
                                   widget=forms.Select(attrs={'filter-for': 'pdu'}))
     pdu = forms.ModelChoiceField(queryset=Device.objects.all(), label='PDU', required=False,
-                                 widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack}}&is_pdu=True',
+                                 widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack}}&is_pdu=True',
                                                   display_field='display_name', attrs={'filter-for': 'power_outlet'}))
     livesearch = forms.CharField(required=False, label='PDU', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='pdu')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='pdu')
     )
     power_outlet = forms.ModelChoiceField(queryset=PowerOutlet.objects.all(), label='Outlet',
                                           widget=APISelect(api_url='/api/dcim/devices/{{pdu}}/power-outlets/',
@@ -1018,10 +1019,10 @@ class PowerOutletConnectionForm(BootstrapMixin, forms.Form):
     rack = forms.ModelChoiceField(queryset=Rack.objects.all(), label='Rack', required=False,
                                   widget=forms.Select(attrs={'filter-for': 'device'}))
     device = forms.ModelChoiceField(queryset=Device.objects.all(), label='Device', required=False,
-                                    widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack}}',
+                                    widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack}}',
                                                      display_field='display_name', attrs={'filter-for': 'port'}))
     livesearch = forms.CharField(required=False, label='Device', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='device')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='device')
     )
     port = forms.ModelChoiceField(queryset=PowerPort.objects.all(), label='Port',
                                   widget=APISelect(api_url='/api/dcim/devices/{{device}}/power-ports/',
@@ -1101,11 +1102,11 @@ class InterfaceConnectionForm(BootstrapMixin, forms.ModelForm):
                                     widget=APISelect(api_url='/api/dcim/racks/?site_id={{site_b}}',
                                                      attrs={'filter-for': 'device_b'}))
     device_b = forms.ModelChoiceField(queryset=Device.objects.all(), label='Device', required=False,
-                                      widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack_b}}',
+                                      widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack_b}}',
                                                        display_field='display_name',
                                                        attrs={'filter-for': 'interface_b'}))
     livesearch = forms.CharField(required=False, label='Device', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='device_b')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='device_b')
     )
     interface_b = forms.ModelChoiceField(queryset=Interface.objects.all(), label='Interface',
                                          widget=APISelect(api_url='/api/dcim/devices/{{device_b}}/interfaces/?type=physical',
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from utilities.sql import create_trigram_indexes
+
+
+TRIGRAM_INDEXES = (
+    ('dcim_site', 'name'),
+    ('dcim_site', 'facility'),
+    ('dcim_site', 'physical_address'),
+    ('dcim_site', 'shipping_address'),
+    ('dcim_site', 'comments'),
+    ('dcim_rack', 'name'),
+    ('dcim_rack', 'facility_id'),
+    ('dcim_rack', 'comments'),
+    ('dcim_device', 'name'),
+    ('dcim_device', 'serial'),
+    ('dcim_device', 'comments'),
+    ('dcim_module', 'serial'),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0006_install_pg_trgm'),
+        ('dcim', '0024_site_add_contact_fields'),
+    ]
+
+    operations = create_trigram_indexes(TRIGRAM_INDEXES)
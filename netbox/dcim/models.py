@@ -275,25 +275,33 @@ class Site(CreatedUpdatedModel, CustomFieldModel):
             self.contact_email,
         ])
 
+    def _get_count(self, name, queryset):
+        """
+        Return the count of the given queryset, unless the Site has been annotated with its statistics (as `stats`; see
+        extras.stats.annotate_stats()).
+        """
+        stats = getattr(self, 'stats', None)
+        return stats[name] if stats is not None else queryset.count()
+
     @property
     def count_prefixes(self):
-        return self.prefixes.count()
+        return self._get_count('prefix_count', self.prefixes.all())
 
     @property
     def count_vlans(self):
-        return self.vlans.count()
+        return self._get_count('vlan_count', self.vlans.all())
 
     @property
     def count_racks(self):
-        return Rack.objects.filter(site=self).count()
+        return self._get_count('rack_count', Rack.objects.filter(site=self))
 
     @property
     def count_devices(self):
-        return Device.objects.filter(rack__site=self).count()
+        return self._get_count('device_count', Device.objects.filter(rack__site=self))
 
     @property
     def count_circuits(self):
-        return Circuit.objects.filter(terminations__site=self).count()
+        return self._get_count('circuit_count', Circuit.objects.filter(terminations__site=self).distinct())
 
 
 #
@@ -462,7 +470,7 @@ class Rack(CreatedUpdatedModel, CustomFieldModel):
     def get_rear_elevation(self):
         return self.get_rack_units(face=RACK_FACE_REAR, remove_redundant=True)
 
-    def get_available_units(self, u_height=1, rack_face=None, exclude=list()):
+    def get_available_units(self, u_height=1, rack_face=None, exclude=list(), devices=None):
         """
         Return a list of units within the rack available to accommodate a device of a given U height (default 1).
         Optionally exclude one or more devices when calculating empty units (needed when moving a device from one
@@ -471,10 +479,14 @@ class Rack(CreatedUpdatedModel, CustomFieldModel):
         :param u_height: Minimum number of contiguous free units required
         :param rack_face: The face of the rack (front or rear) required; 'None' if device is full depth
         :param exclude: List of devices IDs to exclude (useful when moving a device within a rack)
+        :param devices: The devices installed in the rack, with their types (optional); retrieved if not given
         """
 
         # Gather all devices which consume U space within the rack
-        devices = self.devices.select_related('device_type').filter(position__gte=1).exclude(pk__in=exclude)
+        if devices is None:
+            devices = self.devices.select_related('device_type').filter(position__gte=1).exclude(pk__in=exclude)
+        else:
+            devices = [d for d in devices if d.position and d.position >= 1 and d.pk not in exclude]
 
         # Initialize the rack unit skeleton
         units = range(1, self.u_height + 1)
@@ -502,9 +514,11 @@ class Rack(CreatedUpdatedModel, CustomFieldModel):
 
     def get_utilization(self):
         """
-        Determine the utilization rate of the rack and return it as a percentage.
+        Determine the utilization rate of the rack and return it as a percentage. The devices prefetched for a list of
+        racks (see RackListView) are used if present.
         """
-        u_available = len(self.get_available_units())
+        devices = self._prefetched_objects_cache.get('devices') if hasattr(self, '_prefetched_objects_cache') else None
+        u_available = len(self.get_available_units(devices=devices))
         return int(float(self.u_height - u_available) / self.u_height * 100)
 
 
@@ -785,6 +799,44 @@ class Platform(models.Model):
         return "{}?platform={}".format(reverse('dcim:device_list'), self.slug)
 
 
+def create_device_components(devices):
+    """
+    Instantiate the components of newly created Devices per their DeviceType definitions. The component templates of
+    each DeviceType are retrieved once, and each type of component is created with a single query.
+    """
+    templates = {}
+    for device_type in DeviceType.objects.filter(pk__in=set(d.device_type_id for d in devices)).prefetch_related(
+        'console_port_templates', 'cs_port_templates', 'power_port_templates', 'power_outlet_templates',
+        'interface_templates', 'device_bay_templates',
+    ):
+        templates[device_type.pk] = device_type
+
+    ConsolePort.objects.bulk_create([
+        ConsolePort(device=device, name=template.name)
+        for device in devices for template in templates[device.device_type_id].console_port_templates.all()
+    ])
+    ConsoleServerPort.objects.bulk_create([
+        ConsoleServerPort(device=device, name=template.name)
+        for device in devices for template in templates[device.device_type_id].cs_port_templates.all()
+    ])
+    PowerPort.objects.bulk_create([
+        PowerPort(device=device, name=template.name)
+        for device in devices for template in templates[device.device_type_id].power_port_templates.all()
+    ])
+    PowerOutlet.objects.bulk_create([
+        PowerOutlet(device=device, name=template.name)
+        for device in devices for template in templates[device.device_type_id].power_outlet_templates.all()
+    ])
+    Interface.objects.bulk_create([
+        Interface(device=device, name=template.name, form_factor=template.form_factor, mgmt_only=template.mgmt_only)
+        for device in devices for template in templates[device.device_type_id].interface_templates.all()
+    ])
+    DeviceBay.objects.bulk_create([
+        DeviceBay(device=device, name=template.name)
+        for device in devices for template in templates[device.device_type_id].device_bay_templates.all()
+    ])
+
+
 class DeviceManager(NaturalOrderByManager):
 
     def get_queryset(self):
@@ -882,30 +934,7 @@ class Device(CreatedUpdatedModel, CustomFieldModel):
 
         # If this is a new Device, instantiate all of the related components per the DeviceType definition
         if is_new:
-            ConsolePort.objects.bulk_create(
-                [ConsolePort(device=self, name=template.name) for template in
-                 self.device_type.console_port_templates.all()]
-            )
-            ConsoleServerPort.objects.bulk_create(
-                [ConsoleServerPort(device=self, name=template.name) for template in
-                 self.device_type.cs_port_templates.all()]
-            )
-            PowerPort.objects.bulk_create(
-                [PowerPort(device=self, name=template.name) for template in
-                 self.device_type.power_port_templates.all()]
-            )
-            PowerOutlet.objects.bulk_create(
-                [PowerOutlet(device=self, name=template.name) for template in
-                 self.device_type.power_outlet_templates.all()]
-            )
-            Interface.objects.bulk_create(
-                [Interface(device=self, name=template.name, form_factor=template.form_factor,
-                           mgmt_only=template.mgmt_only) for template in self.device_type.interface_templates.all()]
-            )
-            DeviceBay.objects.bulk_create(
-                [DeviceBay(device=self, name=template.name) for template in
-                 self.device_type.device_bay_templates.all()]
-            )
+            create_device_components([self])
 
         # Update Rack assignment for any child Devices
         Device.objects.filter(parent_bay__device=self).update(rack=self.rack)
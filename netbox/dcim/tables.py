@@ -1,7 +1,13 @@
 import django_tables2 as tables
 from django_tables2.utils import Accessor
 
-from utilities.tables import BaseTable, ToggleColumn
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from extras.stats import annotate_stats
+from utilities.tables import (
+    BaseTable, FormatColumn, FormatLinkColumn, PrecompiledURL, ToggleColumn, utilization_graph,
+)
 
 from .models import (
     ConsolePort, ConsolePortTemplate, ConsoleServerPortTemplate, Device, DeviceBayTemplate, DeviceRole, DeviceType,
@@ -14,12 +20,6 @@ COLOR_LABEL = """
 <label class="label" style="background-color: #{{ record.color }}">{{ record }}</label>
 """
 
-DEVICE_LINK = """
-<a href="{% url 'dcim:device' pk=record.pk %}">
-    {{ record.name|default:'<span class="label label-info">Unnamed device</span>' }}
-</a>
-"""
-
 RACKGROUP_ACTIONS = """
 {% if perms.dcim.change_rackgroup %}
     <a href="{% url 'dcim:rackgroup_edit' pk=record.pk %}" class="btn btn-xs btn-warning"><i class="glyphicon glyphicon-pencil" aria-hidden="true"></i></a>
@@ -32,14 +32,6 @@ RACKROLE_ACTIONS = """
 {% endif %}
 """
 
-RACK_ROLE = """
-{% if record.role %}
-    <label class="label" style="background-color: #{{ record.role.color }}">{{ value }}</label>
-{% else %}
-    &mdash;
-{% endif %}
-"""
-
 DEVICEROLE_ACTIONS = """
 {% if perms.dcim.change_devicerole %}
     <a href="{% url 'dcim:devicerole_edit' slug=record.slug %}" class="btn btn-xs btn-warning"><i class="glyphicon glyphicon-pencil" aria-hidden="true"></i></a>
@@ -58,22 +50,53 @@ PLATFORM_ACTIONS = """
 {% endif %}
 """
 
-DEVICE_ROLE = """
-<label class="label" style="background-color: #{{ record.device_role.color }}">{{ value }}</label>
-"""
 
-STATUS_ICON = """
-{% if record.status %}
-    <span class="glyphicon glyphicon-ok-sign text-success" title="Active" aria-hidden="true"></span>
-{% else %}
-    <span class="glyphicon glyphicon-minus-sign text-danger" title="Offline" aria-hidden="true"></span>
-{% endif %}
-"""
+#
+# Cell formatters
+#
 
-UTILIZATION_GRAPH = """
-{% load helpers %}
-{% utilization_graph value %}
-"""
+DEVICE_URL = PrecompiledURL('dcim:device')
+
+STATUS_ACTIVE_ICON = mark_safe(
+    '<span class="glyphicon glyphicon-ok-sign text-success" title="Active" aria-hidden="true"></span>'
+)
+STATUS_OFFLINE_ICON = mark_safe(
+    '<span class="glyphicon glyphicon-minus-sign text-danger" title="Offline" aria-hidden="true"></span>'
+)
+UNNAMED_DEVICE_LABEL = mark_safe('<span class="label label-info">Unnamed device</span>')
+MDASH = mark_safe('&mdash;')
+
+
+def format_device_link(record, value, context):
+    return format_html(u'<a href="{}">{}</a>', DEVICE_URL(record.pk), record.name or UNNAMED_DEVICE_LABEL)
+
+
+def format_status_icon(record, value, context):
+    return STATUS_ACTIVE_ICON if record.status else STATUS_OFFLINE_ICON
+
+
+def format_device_role(record, value, context):
+    return format_html(u'<label class="label" style="background-color: #{}">{}</label>', record.device_role.color,
+                       value)
+
+
+def format_primary_ip(record, value, context):
+    primary_ip = record.primary_ip
+    return format_html(u'{}', primary_ip.address.ip) if primary_ip else u''
+
+
+def format_rack_role(record, value, context):
+    if record.role:
+        return format_html(u'<label class="label" style="background-color: #{}">{}</label>', record.role.color, value)
+    return MDASH
+
+
+def format_rack_height(record, value, context):
+    return format_html(u'{}U', record.u_height)
+
+
+def format_utilization(record, value, context):
+    return utilization_graph(value)
 
 
 #
@@ -97,6 +120,11 @@ class SiteTable(BaseTable):
         fields = ('pk', 'name', 'facility', 'tenant', 'asn', 'rack_count', 'device_count', 'prefix_count',
                   'vlan_count', 'circuit_count')
 
+    def paginate(self, *args, **kwargs):
+        super(SiteTable, self).paginate(*args, **kwargs)
+        # Retrieve the counts of all sites displayed on this page with a single query
+        annotate_stats(row.record for row in self.page.object_list)
+
 
 #
 # Rack groups
@@ -140,15 +168,15 @@ class RackRoleTable(BaseTable):
 
 class RackTable(BaseTable):
     pk = ToggleColumn()
-    name = tables.LinkColumn('dcim:rack', args=[Accessor('pk')], verbose_name='Name')
-    site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')], verbose_name='Site')
+    name = FormatLinkColumn('dcim:rack', 'pk', verbose_name='Name')
+    site = FormatLinkColumn('dcim:site', 'site.slug', verbose_name='Site')
     group = tables.Column(accessor=Accessor('group.name'), verbose_name='Group')
     facility_id = tables.Column(verbose_name='Facility ID')
-    tenant = tables.LinkColumn('tenancy:tenant', args=[Accessor('tenant.slug')], verbose_name='Tenant')
-    role = tables.TemplateColumn(RACK_ROLE, verbose_name='Role')
-    u_height = tables.TemplateColumn("{{ record.u_height }}U", verbose_name='Height')
+    tenant = FormatLinkColumn('tenancy:tenant', 'tenant.slug', verbose_name='Tenant')
+    role = FormatColumn(format_rack_role, verbose_name='Role')
+    u_height = FormatColumn(format_rack_height, verbose_name='Height')
     devices = tables.Column(accessor=Accessor('device_count'), verbose_name='Devices')
-    get_utilization = tables.TemplateColumn(UTILIZATION_GRAPH, orderable=False, verbose_name='Utilization')
+    get_utilization = FormatColumn(format_utilization, orderable=False, verbose_name='Utilization')
 
     class Meta(BaseTable.Meta):
         model = Rack
@@ -308,16 +336,15 @@ class PlatformTable(BaseTable):
 
 class DeviceTable(BaseTable):
     pk = ToggleColumn()
-    status = tables.TemplateColumn(template_code=STATUS_ICON, verbose_name='')
-    name = tables.TemplateColumn(template_code=DEVICE_LINK, verbose_name='Name')
-    tenant = tables.LinkColumn('tenancy:tenant', args=[Accessor('tenant.slug')], verbose_name='Tenant')
+    status = FormatColumn(format_status_icon, verbose_name='')
+    name = FormatColumn(format_device_link, verbose_name='Name')
+    tenant = FormatLinkColumn('tenancy:tenant', 'tenant.slug', verbose_name='Tenant')
     site = tables.Column(accessor=Accessor('rack.site'), verbose_name='Site')
-    rack = tables.LinkColumn('dcim:rack', args=[Accessor('rack.pk')], verbose_name='Rack')
-    device_role = tables.TemplateColumn(DEVICE_ROLE, verbose_name='Role')
-    device_type = tables.LinkColumn('dcim:devicetype', args=[Accessor('device_type.pk')], verbose_name='Type',
-                                    text=lambda record: record.device_type.full_name)
-    primary_ip = tables.TemplateColumn(orderable=False, verbose_name='IP Address',
-                                       template_code="{{ record.primary_ip.address.ip }}")
+    rack = FormatLinkColumn('dcim:rack', 'rack.pk', verbose_name='Rack')
+    device_role = FormatColumn(format_device_role, verbose_name='Role')
+    device_type = FormatLinkColumn('dcim:devicetype', 'device_type.pk', verbose_name='Type',
+                                   text=lambda record: record.device_type.full_name)
+    primary_ip = FormatColumn(format_primary_ip, orderable=False, verbose_name='IP Address')
 
     class Meta(BaseTable.Meta):
         model = Device
@@ -325,7 +352,7 @@ class DeviceTable(BaseTable):
 
 
 class DeviceImportTable(BaseTable):
-    name = tables.TemplateColumn(template_code=DEVICE_LINK, verbose_name='Name')
+    name = FormatColumn(format_device_link, verbose_name='Name')
     tenant = tables.LinkColumn('tenancy:tenant', args=[Accessor('tenant.slug')], verbose_name='Tenant')
     site = tables.Column(accessor=Accessor('rack.site'), verbose_name='Site')
     rack = tables.LinkColumn('dcim:rack', args=[Accessor('rack.pk')], verbose_name='Rack')
@@ -368,11 +395,11 @@ class PowerConnectionTable(BaseTable):
 
 
 class InterfaceConnectionTable(BaseTable):
-    device_a = tables.LinkColumn('dcim:device', accessor=Accessor('interface_a.device'),
-                                 args=[Accessor('interface_a.device.pk')], verbose_name='Device A')
+    device_a = FormatLinkColumn('dcim:device', 'interface_a.device.pk', accessor=Accessor('interface_a.device'),
+                                verbose_name='Device A')
     interface_a = tables.Column(verbose_name='Interface A')
-    device_b = tables.LinkColumn('dcim:device', accessor=Accessor('interface_b.device'),
-                                 args=[Accessor('interface_b.device.pk')], verbose_name='Device B')
+    device_b = FormatLinkColumn('dcim:device', 'interface_b.device.pk', accessor=Accessor('interface_b.device'),
+                                verbose_name='Device B')
     interface_b = tables.Column(verbose_name='Interface B')
 
     class Meta(BaseTable.Meta):
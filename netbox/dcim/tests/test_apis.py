@@ -3,6 +3,12 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 
 from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+
+from dcim.models import (
+    Device, DeviceRole, DeviceType, Interface, Manufacturer, Rack, RACK_FACE_FRONT, RACK_FACE_REAR, Site,
+)
 
 
 class SiteTest(APITestCase):
@@ -441,6 +447,18 @@ class DeviceTest(APITestCase):
             sorted(self.standard_fields),
         )
 
+    def test_get_typeahead(self, endpoint='/{}api/dcim/devices/typeahead/?q=test1-&limit=3'.format(settings.BASE_PATH)):
+        response = self.client.get(endpoint)
+        content = json.loads(response.content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(content), 3)
+        for device in content:
+            self.assertEqual(
+                sorted(device.keys()),
+                sorted(self.nested_fields),
+            )
+            self.assertTrue(device['name'].startswith('test1-'))
+
 
 class ConsoleServerPortsTest(APITestCase):
 
@@ -664,3 +682,68 @@ class RelatedConnectionsTest(APITestCase):
             sorted(content.keys()),
             sorted(self.standard_fields),
         )
+
+
+class DeviceBulkWriteTest(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        self.rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        self.type_1u = DeviceType.objects.create(manufacturer=manufacturer, model='1U', slug='1u', u_height=1,
+                                                 is_full_depth=False)
+        self.type_2u = DeviceType.objects.create(manufacturer=manufacturer, model='2U', slug='2u', u_height=2)
+        self.role = DeviceRole.objects.create(name='Role 1', slug='role-1')
+
+    def get_device(self, name, device_type, position, face):
+        return {'name': name, 'device_type': device_type.pk, 'device_role': self.role.pk, 'rack': self.rack.pk,
+                'position': position, 'face': face}
+
+    def test_create_overlapping(self):
+        data = [
+            self.get_device('Device 1', self.type_2u, 10, RACK_FACE_FRONT),
+            self.get_device('Device 2', self.type_1u, 11, RACK_FACE_FRONT),     # Overlaps device 1
+            self.get_device('Device 3', self.type_1u, 12, RACK_FACE_FRONT),
+            self.get_device('Device 4', self.type_1u, 12, RACK_FACE_REAR),      # Half depth, so shares U12
+            self.get_device('Device 5', self.type_1u, 11, RACK_FACE_REAR),      # Device 1 is full depth
+        ]
+        response = self.client.post(reverse('dcim-api:device_list'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([bool(e) for e in response.data], [False, True, False, False, True])
+        self.assertFalse(Device.objects.exists())
+
+        response = self.client.post(reverse('dcim-api:device_list'), [data[0], data[2], data[3]], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Device.objects.count(), 3)
+
+
+class InterfaceBulkAddTest(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        self.devices = [
+            Device.objects.create(name='Device {}'.format(i), rack=rack, device_type=device_type,
+                                  device_role=device_role).pk
+            for i in range(4)
+        ]
+        self.url = reverse('dcim-api:interface_bulk_add')
+
+    def test_create(self):
+        response = self.client.post(self.url, {'devices': self.devices, 'name': 'xe-0/0/[0-47]'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Interface.objects.count(), 4 * 48)
+
+    def test_too_many_components(self):
+        # 4 devices * 256 names exceeds BULK_MAX_OBJECTS, although each does not.
+        response = self.client.post(self.url, {'devices': self.devices, 'name': 'xe-0/[0-3]/[0-63]'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', json.loads(response.content))
+        self.assertFalse(Interface.objects.exists())
@@ -0,0 +1,42 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from dcim.bulk import build_components, clean_components, create_components
+from dcim.models import Device, DeviceRole, DeviceType, Interface, Manufacturer, Rack, Site
+from utilities.forms import expand_name_string
+
+
+class DeviceComponentBulkTestCase(TestCase):
+
+    def setUp(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        for i in range(1, 4):
+            Device.objects.create(name='Device {}'.format(i), rack=rack, device_type=device_type,
+                                  device_role=device_role)
+        Interface.objects.create(device=Device.objects.get(name='Device 2'), name='xe-0/0/5')
+
+    def test_create(self):
+
+        devices = list(Device.objects.select_related('device_type').filter(name__in=['Device 1', 'Device 3']))
+        interfaces = build_components(Interface, devices, expand_name_string('xe-0/0/[0-47]'), mgmt_only=True)
+
+        with self.assertNumQueries(1):
+            clean_components(interfaces)
+        create_components(interfaces, chunk_size=40)
+
+        self.assertEqual(Interface.objects.filter(device__in=devices, mgmt_only=True).count(), 96)
+
+    def test_duplicates(self):
+
+        devices = list(Device.objects.select_related('device_type').order_by('name'))
+        interfaces = build_components(Interface, devices, ['xe-0/0/4', 'xe-0/0/5', 'xe-0/0/5'])
+
+        with self.assertRaises(ValidationError) as cm:
+            clean_components(interfaces)
+
+        self.assertEqual(len(cm.exception.messages), 4)
+        self.assertEqual(Interface.objects.count(), 1)
@@ -1,5 +1,16 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import ProtectedError
 from django.test import TestCase
+from django.utils import timezone
+from django.utils.six import StringIO
+
+from dcim.filters import SiteFilter
 from dcim.models import *
+from extras.models import BulkDeletion, BULK_DELETION_COMPLETED, BULK_DELETION_FAILED, BULK_DELETION_RUNNING
+from utilities.deletion import DeletionPlan, get_stale_bulk_deletions, run_bulk_deletion, start_bulk_deletion
 
 
 class RackTestCase(TestCase):
@@ -94,3 +105,133 @@ class RackTestCase(TestCase):
             face=None,
         )
         self.assertTrue(pdu)
+
+
+class DeletionPlanTestCase(TestCase):
+
+    def setUp(self):
+
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        self.rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        self.device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1',
+                                                     slug='device-type-1')
+        InterfaceTemplate.objects.create(device_type=self.device_type, name='eth0')
+        InterfaceTemplate.objects.create(device_type=self.device_type, name='eth1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        self.devices = [
+            Device.objects.create(name='Device {}'.format(i), rack=self.rack, device_type=self.device_type,
+                                  device_role=device_role)
+            for i in range(3)
+        ]
+        InterfaceConnection.objects.create(
+            interface_a=Interface.objects.get(device=self.devices[0], name='eth0'),
+            interface_b=Interface.objects.get(device=self.devices[1], name='eth0'),
+        )
+
+    def test_delete(self):
+
+        progress = []
+        plan = DeletionPlan.for_model(Device)
+        counts = plan.delete([d.pk for d in self.devices[:2]], chunk_size=1, progress=progress.append)
+
+        self.assertEqual(progress, [1, 2])
+        self.assertEqual(counts['dcim.Device'], 2)
+        self.assertEqual(counts['dcim.Interface'], 4)
+        self.assertEqual(counts['dcim.InterfaceConnection'], 1)
+        self.assertEqual(list(Device.objects.values_list('name', flat=True)), ['Device 2'])
+        self.assertEqual(Interface.objects.count(), 2)
+
+    def test_delete_queryset(self):
+
+        progress = []
+        plan = DeletionPlan.for_model(Device)
+        counts = plan.delete(Device.objects.exclude(name='Device 2'), chunk_size=1, progress=progress.append)
+
+        self.assertEqual(progress, [1, 2])
+        self.assertEqual(counts['dcim.Device'], 2)
+        self.assertEqual(list(Device.objects.values_list('name', flat=True)), ['Device 2'])
+
+    def test_protected(self):
+
+        plan = DeletionPlan.for_model(DeviceType)
+
+        with self.assertRaises(ProtectedError):
+            plan.check_protected(DeviceType.objects.filter(pk=self.device_type.pk))
+
+
+class BulkDeletionTestCase(TestCase):
+
+    def setUp(self):
+
+        self.user = User.objects.create_user(username='alice', password='alice')
+        for i in range(5):
+            Site.objects.create(name='Site {}'.format(i), slug='site-{}'.format(i))
+        Site.objects.create(name='Other', slug='other')
+
+    def test_filter(self):
+
+        job = start_bulk_deletion(self.user, Site, filter=SiteFilter, filter_query='q=site')
+        self.assertEqual(job.filter_class, 'dcim.filters.SiteFilter')
+        self.assertEqual(job.total, 5)
+
+        # Objects created after the deletion was started are not deleted, even if they match the filter.
+        Site.objects.create(name='Site 5', slug='site-5')
+
+        job = BulkDeletion.objects.get(pk=job.pk)
+        self.assertTrue(run_bulk_deletion(job))
+
+        job = BulkDeletion.objects.get(pk=job.pk)
+        self.assertEqual(job.status, BULK_DELETION_COMPLETED)
+        self.assertEqual(job.processed, 5)
+        self.assertEqual(sorted(Site.objects.values_list('name', flat=True)), ['Other', 'Site 5'])
+
+    def test_pk_list(self):
+
+        pk_list = list(Site.objects.filter(name__startswith='Site').values_list('pk', flat=True)[:2])
+        job = start_bulk_deletion(self.user, Site, pk_list=pk_list)
+        self.assertEqual(job.total, 2)
+
+        run_bulk_deletion(BulkDeletion.objects.get(pk=job.pk))
+
+        self.assertEqual(Site.objects.filter(pk__in=pk_list).count(), 0)
+        self.assertEqual(Site.objects.count(), 4)
+
+    def test_claim(self):
+
+        job = start_bulk_deletion(self.user, Site, filter=SiteFilter, filter_query='q=site')
+        stale_copy = BulkDeletion.objects.get(pk=job.pk)
+        BulkDeletion.objects.filter(pk=job.pk).update(updated=timezone.now())
+
+        self.assertFalse(run_bulk_deletion(stale_copy))
+        self.assertEqual(Site.objects.count(), 6)
+
+    def test_resume_stale(self):
+
+        job = start_bulk_deletion(self.user, Site, filter=SiteFilter, filter_query='q=site')
+        self.assertFalse(get_stale_bulk_deletions().exists())
+
+        # A job interrupted after its first chunk is resumed by the management command.
+        Site.objects.filter(slug='site-0').delete()
+        BulkDeletion.objects.filter(pk=job.pk).update(
+            status=BULK_DELETION_RUNNING, processed=1, updated=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(list(get_stale_bulk_deletions()), [job])
+
+        call_command('run_bulk_deletions', stdout=StringIO())
+
+        job = BulkDeletion.objects.get(pk=job.pk)
+        self.assertEqual(job.status, BULK_DELETION_COMPLETED)
+        self.assertEqual(job.processed, 5)
+        self.assertEqual(list(Site.objects.values_list('name', flat=True)), ['Other'])
+
+    def test_fail_stale(self):
+
+        job = start_bulk_deletion(self.user, Site, filter=SiteFilter, filter_query='q=site')
+        BulkDeletion.objects.filter(pk=job.pk).update(updated=timezone.now() - timedelta(hours=1))
+
+        call_command('run_bulk_deletions', fail=True, stdout=StringIO())
+
+        job = BulkDeletion.objects.get(pk=job.pk)
+        self.assertEqual(job.status, BULK_DELETION_FAILED)
+        self.assertEqual(Site.objects.count(), 6)
@@ -0,0 +1,147 @@
+from netaddr import IPNetwork
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from dcim.models import (
+    ConsolePort, ConsoleServerPort, Device, DeviceBay, DeviceRole, DeviceType, Interface, Manufacturer, PowerOutlet,
+    PowerPort, Rack, Site,
+)
+from extras.models import Graph, GRAPH_TYPE_INTERFACE
+from ipam.models import IPAddress, Prefix, VLAN
+
+
+class ListViewTestCase(TestCase):
+
+    def setUp(self):
+
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        self.device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1',
+                                                     slug='device-type-1', u_height=2)
+        self.device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+
+    def add_sites(self, start, count):
+        for i in range(start, start + count):
+            site = Site.objects.create(name='Site {}'.format(i), slug='site-{}'.format(i))
+            rack = Rack.objects.create(name='Rack {}'.format(i), site=site, u_height=10)
+            Device.objects.create(name='Device {}'.format(i), rack=rack, position=1, face=0,
+                                  device_type=self.device_type, device_role=self.device_role)
+            Prefix.objects.create(prefix=IPNetwork('10.{}.0.0/16'.format(i)), site=site)
+            VLAN.objects.create(vid=i + 1, name='VLAN {}'.format(i), site=site)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response
+
+    def test_site_list_queries(self):
+
+        url = reverse('dcim:site_list')
+
+        # The counts of the listed sites are retrieved together.
+        self.add_sites(0, 1)
+        self.client.get(url)
+        count, _ = self.count_queries(url)
+        self.add_sites(1, 4)
+        self.assertEqual(self.count_queries(url)[0], count)
+
+        site = [row.record for row in self.count_queries(url)[1].context['table'].page.object_list][3]
+        self.assertEqual(site.stats, {
+            'rack_count': 1, 'device_count': 1, 'prefix_count': 1, 'vlan_count': 1, 'circuit_count': 0,
+        })
+        self.assertEqual(site.count_devices, Site.objects.get(pk=site.pk).count_devices)
+
+    def test_rack_list_queries(self):
+
+        url = reverse('dcim:rack_list')
+
+        # The utilization of the listed racks is computed from their prefetched devices.
+        self.add_sites(0, 1)
+        self.client.get(url)
+        count, _ = self.count_queries(url)
+        self.add_sites(1, 4)
+        count2, response = self.count_queries(url)
+        self.assertEqual(count2, count)
+        self.assertEqual([row.record.get_utilization() for row in response.context['table'].page.object_list],
+                         [20] * 5)
+
+
+class DeviceViewTestCase(TestCase):
+
+    def setUp(self):
+
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        self.device = Device.objects.create(name='Device 1', rack=rack, device_type=device_type,
+                                            device_role=device_role)
+        Graph.objects.create(type=GRAPH_TYPE_INTERFACE, name='Graph 1', source='http://example.com/{{ obj.name }}')
+
+    def add_components(self, count):
+        start = DeviceBay.objects.filter(device=self.device).count()
+        for i in range(start, start + count):
+            name = 'Port {}'.format(i)
+            ConsolePort.objects.create(device=self.device, name=name)
+            ConsoleServerPort.objects.create(device=self.device, name=name)
+            PowerPort.objects.create(device=self.device, name=name)
+            PowerOutlet.objects.create(device=self.device, name=name)
+            DeviceBay.objects.create(device=self.device, name=name)
+            Interface.objects.create(device=self.device, name='eth{}'.format(i))
+            interface = Interface.objects.create(device=self.device, name='mgmt{}'.format(i), mgmt_only=True)
+            IPAddress.objects.create(address=IPNetwork('192.0.2.{}/24'.format(i + 1)), interface=interface)
+
+    def test_device_queries(self):
+
+        url = reverse('dcim:device', kwargs={'pk': self.device.pk})
+
+        # The number of queries does not depend upon the number of components.
+        ContentType.objects.get_for_model(Device)
+        self.add_components(2)
+        with self.assertNumQueries(12):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        self.add_components(8)
+        with self.assertNumQueries(12):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        # The interfaces panel is told whether graphs exist.
+        self.assertContains(response, '{}?show_graphs=1'.format(
+            reverse('dcim:device_interfaces', kwargs={'pk': self.device.pk})
+        ))
+
+    def test_device_components(self):
+
+        self.add_components(2)
+        for panel, component in (('devicebays', DeviceBay), ('interfaces', Interface),
+                                 ('consoleserverports', ConsoleServerPort), ('poweroutlets', PowerOutlet)):
+            response = self.client.get(reverse('dcim:device_{}'.format(panel), kwargs={'pk': self.device.pk}))
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, component.objects.filter(device=self.device).first().name)
+
+    def test_device_interfaces_show_graphs(self):
+
+        url = reverse('dcim:device_interfaces', kwargs={'pk': self.device.pk})
+        self.add_components(1)
+
+        # Graphs are looked up only if the device page has not passed along show_graphs.
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        for show_graphs in ('1', '0'):
+            with self.assertNumQueries(4):
+                response = self.client.get(url, {'show_graphs': show_graphs})
+            self.assertEqual(response.status_code, 200)
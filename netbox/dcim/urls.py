@@ -101,6 +101,10 @@ urlpatterns = [
     url(r'^devices/(?P<pk>\d+)/$', views.device, name='device'),
     url(r'^devices/(?P<pk>\d+)/edit/$', views.DeviceEditView.as_view(), name='device_edit'),
     url(r'^devices/(?P<pk>\d+)/delete/$', views.DeviceDeleteView.as_view(), name='device_delete'),
+    url(r'^devices/(?P<pk>\d+)/device-bays/$', views.device_components, {'panel': 'devicebays'}, name='device_devicebays'),
+    url(r'^devices/(?P<pk>\d+)/interfaces/$', views.device_components, {'panel': 'interfaces'}, name='device_interfaces'),
+    url(r'^devices/(?P<pk>\d+)/console-server-ports/$', views.device_components, {'panel': 'consoleserverports'}, name='device_consoleserverports'),
+    url(r'^devices/(?P<pk>\d+)/power-outlets/$', views.device_components, {'panel': 'poweroutlets'}, name='device_poweroutlets'),
     url(r'^devices/(?P<pk>\d+)/inventory/$', views.device_inventory, name='device_inventory'),
     url(r'^devices/(?P<pk>\d+)/lldp-neighbors/$', views.device_lldp_neighbors, name='device_lldp_neighbors'),
     url(r'^devices/(?P<pk>\d+)/ip-addresses/assign/$', views.ipaddress_assign, name='ipaddress_assign'),
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from copy import deepcopy
 import re
 from natsort import natsorted
@@ -6,6 +7,7 @@ from operator import attrgetter
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.db.models import Count
 from django.http import HttpResponseRedirect
@@ -13,15 +15,17 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.http import urlencode
 from django.views.generic import View
 
-from ipam.models import Prefix, IPAddress, Service, VLAN
-from circuits.models import Circuit
+from ipam.models import IPAddress, Service
 from extras.models import Graph, TopologyMap, GRAPH_TYPE_INTERFACE, GRAPH_TYPE_SITE
+from extras.stats import get_stats
 from utilities.forms import ConfirmationForm
+from utilities.managers import natural_order_by
 from utilities.views import (
     BulkDeleteView, BulkEditView, BulkImportView, ObjectDeleteView, ObjectEditView, ObjectListView,
 )
 
 from . import filters, forms, tables
+from .bulk import build_components, clean_components, create_components
 from .models import (
     CONNECTION_STATUS_CONNECTED, ConsolePort, ConsolePortTemplate, ConsoleServerPort, ConsoleServerPortTemplate, Device,
     DeviceBay, DeviceBayTemplate, DeviceRole, DeviceType, Interface, InterfaceConnection, InterfaceTemplate,
@@ -132,13 +136,7 @@ class SiteListView(ObjectListView):
 def site(request, slug):
 
     site = get_object_or_404(Site, slug=slug)
-    stats = {
-        'rack_count': Rack.objects.filter(site=site).count(),
-        'device_count': Device.objects.filter(rack__site=site).count(),
-        'prefix_count': Prefix.objects.filter(site=site).count(),
-        'vlan_count': VLAN.objects.filter(site=site).count(),
-        'circuit_count': Circuit.objects.filter(terminations__site=site).count(),
-    }
+    stats = get_stats(site)
     rack_groups = RackGroup.objects.filter(site=site).annotate(rack_count=Count('racks'))
     topology_maps = TopologyMap.objects.filter(site=site)
     show_graphs = Graph.objects.filter(type=GRAPH_TYPE_SITE).exists()
@@ -177,6 +175,7 @@ class SiteBulkImportView(PermissionRequiredMixin, BulkImportView):
 class SiteBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'dcim.change_site'
     cls = Site
+    filter = filters.SiteFilter
     form = forms.SiteBulkEditForm
     template_name = 'dcim/site_bulk_edit.html'
     default_redirect_url = 'dcim:site_list'
@@ -206,6 +205,7 @@ class RackGroupEditView(PermissionRequiredMixin, ObjectEditView):
 class RackGroupBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_rackgroup'
     cls = RackGroup
+    filter = filters.RackGroupFilter
     default_redirect_url = 'dcim:rackgroup_list'
 
 
@@ -292,6 +292,7 @@ class RackBulkImportView(PermissionRequiredMixin, BulkImportView):
 class RackBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'dcim.change_rack'
     cls = Rack
+    filter = filters.RackFilter
     form = forms.RackBulkEditForm
     template_name = 'dcim/rack_bulk_edit.html'
     default_redirect_url = 'dcim:rack_list'
@@ -300,6 +301,7 @@ class RackBulkEditView(PermissionRequiredMixin, BulkEditView):
 class RackBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_rack'
     cls = Rack
+    filter = filters.RackFilter
     default_redirect_url = 'dcim:rack_list'
 
 
@@ -403,6 +405,7 @@ class DeviceTypeDeleteView(PermissionRequiredMixin, ObjectDeleteView):
 class DeviceTypeBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'dcim.change_devicetype'
     cls = DeviceType
+    filter = filters.DeviceTypeFilter
     form = forms.DeviceTypeBulkEditForm
     template_name = 'dcim/devicetype_bulk_edit.html'
     default_redirect_url = 'dcim:devicetype_list'
@@ -411,6 +414,7 @@ class DeviceTypeBulkEditView(PermissionRequiredMixin, BulkEditView):
 class DeviceTypeBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_devicetype'
     cls = DeviceType
+    filter = filters.DeviceTypeFilter
     default_redirect_url = 'dcim:devicetype_list'
 
 
@@ -573,8 +577,8 @@ class PlatformBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 #
 
 class DeviceListView(ObjectListView):
-    queryset = Device.objects.select_related('device_type__manufacturer', 'device_role', 'tenant', 'rack__site',
-                                             'primary_ip4', 'primary_ip6')
+    queryset = Device.objects.select_related('device_type__manufacturer', 'device_role', 'tenant', 'platform',
+                                             'rack__site', 'primary_ip4', 'primary_ip6')
     filter = filters.DeviceFilter
     filter_form = forms.DeviceFilterForm
     table = tables.DeviceTable
@@ -582,35 +586,78 @@ class DeviceListView(ObjectListView):
     template_name = 'dcim/device_list.html'
 
 
+# Component panels which are loaded separately from the device page (see device_components()), so that its initial
+# rendering does not wait for a device's (potentially hundreds of) components. Each panel is defined by:
+#   queryset: A function returning the device's components in natural order
+#   template: The template which renders the panel
+DEVICE_COMPONENT_PANELS = {
+    'devicebays': {
+        'queryset': lambda device: natural_order_by(
+            DeviceBay.objects.filter(device=device).select_related('installed_device__device_type__manufacturer'),
+            'name'
+        ),
+        'template': 'dcim/inc/device_devicebays.html',
+    },
+    'interfaces': {
+        'queryset': lambda device: Interface.objects.filter(device=device, mgmt_only=False).select_related(
+            'connected_as_a__interface_b__device',
+            'connected_as_b__interface_a__device',
+            'circuit_termination__circuit',
+        ),
+        'template': 'dcim/inc/device_interfaces.html',
+    },
+    'consoleserverports': {
+        'queryset': lambda device: natural_order_by(
+            ConsoleServerPort.objects.filter(device=device).select_related('connected_console'), 'name'
+        ),
+        'template': 'dcim/inc/device_consoleserverports.html',
+    },
+    'poweroutlets': {
+        'queryset': lambda device: natural_order_by(
+            PowerOutlet.objects.filter(device=device).select_related('connected_port'), 'name'
+        ),
+        'template': 'dcim/inc/device_poweroutlets.html',
+    },
+}
+
+
+def get_device_summary(pk):
+    """
+    Retrieve a Device along with its related objects, the number of each type of component it has (and of its
+    non-management interfaces), and whether any interface graphs exist (`show_graphs`), all with a single query.
+    """
+    select = OrderedDict(
+        ('{}_count'.format(model._meta.model_name),
+         'SELECT COUNT(*) FROM {} WHERE device_id = dcim_device.id'.format(model._meta.db_table))
+        for model in (DeviceBay, Interface, ConsoleServerPort, PowerOutlet)
+    )
+    select['nonmgmt_interface_count'] = 'SELECT COUNT(*) FROM {} WHERE device_id = dcim_device.id AND NOT mgmt_only'\
+        .format(Interface._meta.db_table)
+    select['show_graphs'] = 'SELECT EXISTS(SELECT 1 FROM extras_graph WHERE type = %s)'
+    queryset = Device.objects.select_related(
+        'rack__site', 'tenant', 'device_type__manufacturer', 'device_role', 'platform', 'parent_bay__device',
+        'primary_ip4__nat_inside', 'primary_ip6__nat_inside',
+    ).extra(select=select, select_params=(GRAPH_TYPE_INTERFACE,))
+
+    return get_object_or_404(queryset, pk=pk)
+
+
 def device(request, pk):
 
-    device = get_object_or_404(Device, pk=pk)
-    console_ports = natsorted(
-        ConsolePort.objects.filter(device=device).select_related('cs_port__device'), key=attrgetter('name')
-    )
-    cs_ports = natsorted(
-        ConsoleServerPort.objects.filter(device=device).select_related('connected_console'), key=attrgetter('name')
-    )
-    power_ports = natsorted(
-        PowerPort.objects.filter(device=device).select_related('power_outlet__device'), key=attrgetter('name')
+    device = get_device_summary(pk)
+
+    # Components displayed with the device (the remainder are loaded separately)
+    console_ports = natural_order_by(
+        ConsolePort.objects.filter(device=device).select_related('cs_port__device'), 'name'
     )
-    power_outlets = natsorted(
-        PowerOutlet.objects.filter(device=device).select_related('connected_port'), key=attrgetter('name')
-    )
-    interfaces = Interface.objects.filter(device=device, mgmt_only=False).select_related(
-        'connected_as_a__interface_b__device',
-        'connected_as_b__interface_a__device',
-        'circuit_termination__circuit',
+    power_ports = natural_order_by(
+        PowerPort.objects.filter(device=device).select_related('power_outlet__device'), 'name'
     )
     mgmt_interfaces = Interface.objects.filter(device=device, mgmt_only=True).select_related(
         'connected_as_a__interface_b__device',
         'connected_as_b__interface_a__device',
         'circuit_termination__circuit',
     )
-    device_bays = natsorted(
-        DeviceBay.objects.filter(device=device).select_related('installed_device__device_type__manufacturer'),
-        key=attrgetter('name')
-    )
 
     # Gather relevant device objects
     ip_addresses = IPAddress.objects.filter(interface__device=device).select_related('interface', 'vrf')\
@@ -633,22 +680,36 @@ def device(request, pk):
             related_devices = Device.objects.filter(name__istartswith=base_name).exclude(pk=device.pk)\
                 .select_related('rack', 'device_type__manufacturer')[:10]
 
-    # Show graph button on interfaces only if at least one graph has been created.
-    show_graphs = Graph.objects.filter(type=GRAPH_TYPE_INTERFACE).exists()
-
     return render(request, 'dcim/device.html', {
         'device': device,
         'console_ports': console_ports,
-        'cs_ports': cs_ports,
         'power_ports': power_ports,
-        'power_outlets': power_outlets,
-        'interfaces': interfaces,
         'mgmt_interfaces': mgmt_interfaces,
-        'device_bays': device_bays,
         'ip_addresses': ip_addresses,
         'services': services,
         'secrets': secrets,
         'related_devices': related_devices,
+        'show_graphs': device.show_graphs,
+    })
+
+
+def device_components(request, pk, panel):
+    """
+    Render a single component panel of the device page (retrieved by the page via AJAX). The device page passes along
+    `show_graphs`, which it has already determined, so that the interfaces panel need not look for graphs again.
+    """
+    device = get_object_or_404(Device, pk=pk)
+
+    if panel != 'interfaces':
+        show_graphs = False
+    elif 'show_graphs' in request.GET:
+        show_graphs = request.GET['show_graphs'] == '1'
+    else:
+        show_graphs = Graph.objects.filter(type=GRAPH_TYPE_INTERFACE).exists()
+
+    return render(request, DEVICE_COMPONENT_PANELS[panel]['template'], {
+        'device': device,
+        'components': DEVICE_COMPONENT_PANELS[panel]['queryset'](device),
         'show_graphs': show_graphs,
     })
 
@@ -696,6 +757,7 @@ class ChildDeviceBulkImportView(PermissionRequiredMixin, BulkImportView):
 class DeviceBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'dcim.change_device'
     cls = Device
+    filter = filters.DeviceFilter
     form = forms.DeviceBulkEditForm
     template_name = 'dcim/device_bulk_edit.html'
     default_redirect_url = 'dcim:device_list'
@@ -704,6 +766,7 @@ class DeviceBulkEditView(PermissionRequiredMixin, BulkEditView):
 class DeviceBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'dcim.delete_device'
     cls = Device
+    filter = filters.DeviceFilter
     default_redirect_url = 'dcim:device_list'
 
 
@@ -1229,7 +1292,6 @@ class DeviceBulkAddComponentView(View):
     """
     form = forms.DeviceBulkAddComponentForm
     model = None
-    model_form = None
 
     def get(self):
         return redirect('dcim:device_list')
@@ -1246,36 +1308,28 @@ class DeviceBulkAddComponentView(View):
             form = self.form(request.POST)
             if form.is_valid():
 
-                new_components = []
                 data = deepcopy(form.cleaned_data)
-                for device in data['pk']:
-
-                    names = data['name_pattern']
-                    for name in names:
-                        component_data = {
-                            'device': device.pk,
-                            'name': name,
-                        }
-                        component_data.update(data)
-                        component_form = self.model_form(component_data)
-                        if component_form.is_valid():
-                            new_components.append(component_form.save(commit=False))
-                        else:
-                            for field, errors in component_form.errors.as_data().items():
-                                for e in errors:
-                                    form.add_error(field, u'{} {}: {}'.format(device, name, ', '.join(e)))
+                devices = data.pop('pk')
+                names = data.pop('name_pattern')
+                new_components = build_components(self.model, devices, names, **data)
+
+                try:
+                    clean_components(new_components)
+                except ValidationError as e:
+                    form.add_error(None, e)
 
                 if not form.errors:
-                    self.model.objects.bulk_create(new_components)
+                    create_components(new_components)
                     messages.success(request, u"Added {} {} to {} devices.".format(
-                        len(new_components), self.model._meta.verbose_name_plural, len(form.cleaned_data['pk'])
+                        len(new_components), self.model._meta.verbose_name_plural, len(devices)
                     ))
                     return redirect('dcim:device_list')
 
         else:
             form = self.form(initial={'pk': pk_list})
 
-        selected_devices = Device.objects.filter(pk__in=pk_list)
+        selected_devices = Device.objects.select_related('device_type__manufacturer', 'device_role')\
+            .filter(pk__in=pk_list)
         if not selected_devices:
             messages.warning(request, u"No devices were selected.")
             return redirect('dcim:device_list')
@@ -1291,38 +1345,32 @@ class DeviceBulkAddComponentView(View):
 class DeviceBulkAddConsolePortView(PermissionRequiredMixin, DeviceBulkAddComponentView):
     permission_required = 'dcim.add_consoleport'
     model = ConsolePort
-    model_form = forms.ConsolePortForm
 
 
 class DeviceBulkAddConsoleServerPortView(PermissionRequiredMixin, DeviceBulkAddComponentView):
     permission_required = 'dcim.add_consoleserverport'
     model = ConsoleServerPort
-    model_form = forms.ConsoleServerPortForm
 
 
 class DeviceBulkAddPowerPortView(PermissionRequiredMixin, DeviceBulkAddComponentView):
     permission_required = 'dcim.add_powerport'
     model = PowerPort
-    model_form = forms.PowerPortForm
 
 
 class DeviceBulkAddPowerOutletView(PermissionRequiredMixin, DeviceBulkAddComponentView):
     permission_required = 'dcim.add_poweroutlet'
     model = PowerOutlet
-    model_form = forms.PowerOutletForm
 
 
 class DeviceBulkAddInterfaceView(PermissionRequiredMixin, DeviceBulkAddComponentView):
     permission_required = 'dcim.add_interface'
     form = forms.DeviceBulkAddInterfaceForm
     model = Interface
-    model_form = forms.InterfaceForm
 
 
 class DeviceBulkAddDeviceBayView(PermissionRequiredMixin, DeviceBulkAddComponentView):
     permission_required = 'dcim.add_devicebay'
     model = DeviceBay
-    model_form = forms.DeviceBayForm
 
 
 #
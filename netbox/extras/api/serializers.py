@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from extras.graphs import get_embed_url
 from extras.models import CF_TYPE_SELECT, CustomFieldChoice, Graph
 
 
@@ -50,7 +51,7 @@ class GraphSerializer(serializers.ModelSerializer):
         fields = ['name', 'embed_url', 'embed_link']
 
     def get_embed_url(self, obj):
-        return obj.embed_url(self.context['graphed_object'])
+        return get_embed_url(obj, self.context['graphed_object'])
 
     def get_embed_link(self, obj):
         return obj.embed_link(self.context['graphed_object'])
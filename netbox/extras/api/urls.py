@@ -0,0 +1,12 @@
+from django.conf.urls import url
+
+from .views import GraphEmbedView, GraphImageView
+
+
+urlpatterns = [
+
+    # Graphs
+    url(r'^graphs/embed/$', GraphEmbedView.as_view(), name='graph_embed'),
+    url(r'^graphs/(?P<pk>\d+)/image/$', GraphImageView.as_view(), name='graph_image'),
+
+]
@@ -1,15 +1,23 @@
-import graphviz
+from collections import OrderedDict
 from rest_framework import generics
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.shortcuts import get_object_or_404
 
-from circuits.models import Provider
-from dcim.models import Site, Device, Interface, InterfaceConnection
-from extras.models import Graph, TopologyMap, GRAPH_TYPE_INTERFACE, GRAPH_TYPE_PROVIDER, GRAPH_TYPE_SITE
+from extras.graphs import (
+    GRAPH_TYPE_MODELS, GRAPH_TYPE_RELATED_FIELDS, GraphProxyError, fetch_graph_image, get_embed_url,
+)
+from extras.models import Graph, TopologyMap
+from extras.search import SEARCH_MAX_RESULTS, SEARCH_TYPES, search
+from extras.topology import (
+    TOPOLOGY_MAP_FORMATS, build_topology_graph, get_graph_hash, render_topology_graph,
+)
+from utilities.api import ServiceUnavailable
 
 from .serializers import GraphSerializer
 
@@ -39,13 +47,9 @@ class GraphListView(generics.ListAPIView):
     serializer_class = GraphSerializer
 
     def get_serializer_context(self):
-        cls = {
-            GRAPH_TYPE_INTERFACE: Interface,
-            GRAPH_TYPE_PROVIDER: Provider,
-            GRAPH_TYPE_SITE: Site,
-        }
+        cls = GRAPH_TYPE_MODELS[self.kwargs.get('type')]
         context = super(GraphListView, self).get_serializer_context()
-        context.update({'graphed_object': get_object_or_404(cls[self.kwargs.get('type')], pk=self.kwargs['pk'])})
+        context.update({'graphed_object': get_object_or_404(cls, pk=self.kwargs['pk'])})
         return context
 
     def get_queryset(self):
@@ -56,60 +60,127 @@ class GraphListView(generics.ListAPIView):
         return queryset
 
 
+class GraphEmbedView(APIView):
+    """
+    Return the relevant graphs for many objects of the same type at once, keyed by object ID.
+
+    type: The graph type (e.g. 100 for interfaces)
+    obj_id: A comma-separated list of object IDs
+    """
+
+    def get(self, request):
+
+        try:
+            graph_type = int(request.GET.get('type'))
+            cls = GRAPH_TYPE_MODELS[graph_type]
+            pk_list = [int(pk) for pk in request.GET.get('obj_id', '').split(',') if pk]
+        except (TypeError, ValueError, KeyError):
+            raise ValidationError("A valid graph type and list of object IDs must be specified.")
+
+        graphs = list(Graph.objects.filter(type=graph_type))
+        objects = cls.objects.select_related(*GRAPH_TYPE_RELATED_FIELDS[graph_type]).filter(pk__in=pk_list)
+
+        data = OrderedDict()
+        for obj in objects:
+            data[obj.pk] = [
+                {
+                    'name': graph.name,
+                    'embed_url': get_embed_url(graph, obj),
+                    'embed_link': graph.embed_link(obj),
+                } for graph in graphs
+            ]
+
+        return Response(data)
+
+
+class GraphImageView(APIView):
+    """
+    Retrieve a graph image for an object on behalf of the client (requires GRAPH_PROXY to be enabled). Images are cached
+    on disk for GRAPH_PROXY_CACHE_TIMEOUT seconds.
+    """
+
+    def get(self, request, pk):
+
+        if not settings.GRAPH_PROXY:
+            raise Http404()
+        graph = get_object_or_404(Graph, pk=pk)
+        cls = GRAPH_TYPE_MODELS[graph.type]
+        obj = get_object_or_404(cls.objects.select_related(*GRAPH_TYPE_RELATED_FIELDS[graph.type]),
+                                pk=request.GET.get('obj_id'))
+
+        try:
+            content_type, image_data = fetch_graph_image(graph.embed_url(obj))
+        except GraphProxyError as e:
+            raise ServiceUnavailable(str(e))
+
+        return HttpResponse(image_data, content_type=content_type)
+
+
 class TopologyMapView(APIView):
     """
-    Generate a topology diagram
+    Generate a topology diagram. Rendered images are cached by the hash of the underlying graph, so an unchanged map is
+    served without invoking GraphViz. Specify `img_format=svg` to retrieve an SVG image rather than a PNG.
     """
 
     def get(self, request, slug):
 
         tmap = get_object_or_404(TopologyMap, slug=slug)
+        img_format = request.GET.get('img_format', 'png')
+        if img_format not in TOPOLOGY_MAP_FORMATS:
+            raise Http404()
 
         # Construct the graph
-        graph = graphviz.Graph()
-        graph.graph_attr['ranksep'] = '1'
-        for i, device_set in enumerate(tmap.device_sets):
-
-            subgraph = graphviz.Graph(name='sg{}'.format(i))
-            subgraph.graph_attr['rank'] = 'same'
-
-            # Add a pseudonode for each device_set to enforce hierarchical layout
-            subgraph.node('set{}'.format(i), label='', shape='none', width='0')
-            if i:
-                graph.edge('set{}'.format(i - 1), 'set{}'.format(i), style='invis')
-
-            # Add each device to the graph
-            devices = []
-            for query in device_set.split(';'):  # Split regexes on semicolons
-                devices += Device.objects.filter(name__regex=query)
-            for d in devices:
-                subgraph.node(d.name)
-
-            # Add an invisible connection to each successive device in a set to enforce horizontal order
-            for j in range(0, len(devices) - 1):
-                subgraph.edge(devices[j].name, devices[j + 1].name, style='invis')
-
-            graph.subgraph(subgraph)
-
-        # Compile list of all devices
-        device_superset = Q()
-        for device_set in tmap.device_sets:
-            for query in device_set.split(';'):  # Split regexes on semicolons
-                device_superset = device_superset | Q(name__regex=query)
-
-        # Add all connections to the graph
-        devices = Device.objects.filter(*(device_superset,))
-        connections = InterfaceConnection.objects.filter(interface_a__device__in=devices,
-                                                         interface_b__device__in=devices)
-        for c in connections:
-            graph.edge(c.interface_a.device.name, c.interface_b.device.name)
+        graph = build_topology_graph(tmap)
+        graph_hash = get_graph_hash(graph)
+        etag = '"{}.{}"'.format(graph_hash, img_format)
+        if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+            return HttpResponseNotModified()
 
         # Get the image data and return
         try:
-            topo_data = graph.pipe(format='png')
+            topo_data = render_topology_graph(graph, img_format, graph_hash)
         except:
             return HttpResponse("There was an error generating the requested graph. Ensure that the GraphViz "
                                 "executables have been installed correctly.")
-        response = HttpResponse(topo_data, content_type='image/png')
+        response = HttpResponse(topo_data, content_type=TOPOLOGY_MAP_FORMATS[img_format])
+        response['ETag'] = etag
 
         return response
+
+
+class SearchView(APIView):
+    """
+    Search across all object types. Returns the total number of matches and the highest-ranked results for each type.
+
+    q: The search query
+    obj_type: Limit the search to these object types (may be specified multiple times)
+    limit: The maximum number of results to return per object type
+    """
+
+    def get(self, request):
+
+        query = request.GET.get('q', '').strip()
+        obj_types = [t for t in request.GET.getlist('obj_type') if t in SEARCH_TYPES]
+        try:
+            limit = min(max(int(request.GET.get('limit', SEARCH_MAX_RESULTS)), 1), 1000)
+        except ValueError:
+            limit = SEARCH_MAX_RESULTS
+
+        if not query:
+            return Response({})
+
+        data = OrderedDict()
+        for obj_type, obj_type_results in search(query, obj_types, limit).items():
+            data[obj_type] = {
+                'count': obj_type_results['count'],
+                'results': [
+                    {
+                        'id': obj.pk,
+                        'display_name': u'{}'.format(obj),
+                        'url': obj.get_absolute_url(),
+                        'rank': obj.search_rank,
+                    } for obj in obj_type_results['objects']
+                ],
+            }
+
+        return Response(data)
@@ -0,0 +1,10 @@
+from __future__ import unicode_literals
+
+from django.apps import AppConfig
+
+
+class ExtrasConfig(AppConfig):
+    name = 'extras'
+
+    def ready(self):
+        import extras.signals
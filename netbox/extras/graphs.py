@@ -0,0 +1,80 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.urlresolvers import reverse
+from django.utils.six.moves.urllib.parse import urlparse
+from django.utils.six.moves.urllib.request import urlopen
+
+from circuits.models import Provider
+from dcim.models import Interface, Site
+
+from .models import GRAPH_TYPE_INTERFACE, GRAPH_TYPE_PROVIDER, GRAPH_TYPE_SITE
+
+
+GRAPH_TYPE_MODELS = {
+    GRAPH_TYPE_INTERFACE: Interface,
+    GRAPH_TYPE_PROVIDER: Provider,
+    GRAPH_TYPE_SITE: Site,
+}
+
+# Related objects which may be referenced by graph templates
+GRAPH_TYPE_RELATED_FIELDS = {
+    GRAPH_TYPE_INTERFACE: ['device'],
+    GRAPH_TYPE_PROVIDER: [],
+    GRAPH_TYPE_SITE: [],
+}
+
+GRAPH_PROXY_TIMEOUT = 10
+
+
+def get_embed_url(graph, obj):
+    """
+    Return the URL from which the graph image for an object is to be retrieved. If GRAPH_PROXY is enabled, this will be
+    the graph image proxy rather than the graphing backend.
+    """
+    if settings.GRAPH_PROXY:
+        return '{}?obj_id={}'.format(reverse('extras-api:graph_image', kwargs={'pk': graph.pk}), obj.pk)
+    return graph.embed_url(obj)
+
+
+class GraphProxyError(Exception):
+    pass
+
+
+_image_cache = {}
+
+
+def get_image_cache():
+    """
+    Return the on-disk cache in which proxied graph images are stored.
+    """
+    if 'cache' not in _image_cache:
+        _image_cache['cache'] = FileBasedCache(settings.GRAPH_PROXY_CACHE_DIR, {
+            'TIMEOUT': settings.GRAPH_PROXY_CACHE_TIMEOUT,
+        })
+    return _image_cache['cache']
+
+
+def fetch_graph_image(url):
+    """
+    Retrieve the image at the given URL, returning a tuple of (content type, image data). Images are cached on disk for
+    GRAPH_PROXY_CACHE_TIMEOUT seconds, so that repeated views of the same graph do not each query the graphing backend.
+    """
+    if urlparse(url).scheme not in ('http', 'https'):
+        raise GraphProxyError("Unsupported graph URL: {}".format(url))
+
+    cache = get_image_cache()
+    cache_key = 'graph_{}'.format(hashlib.sha256(url.encode('utf-8')).hexdigest())
+    image = cache.get(cache_key)
+
+    if image is None:
+        try:
+            response = urlopen(url, timeout=GRAPH_PROXY_TIMEOUT)
+            image = (response.info().get('Content-Type', 'application/octet-stream'), response.read())
+            response.close()
+        except Exception as e:
+            raise GraphProxyError("Unable to retrieve graph from {}: {}".format(url, e))
+        cache.set(cache_key, image)
+
+    return image
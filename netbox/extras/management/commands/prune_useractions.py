@@ -0,0 +1,60 @@
+import io
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from extras.models import UserAction
+
+
+class Command(BaseCommand):
+    help = "Delete (and optionally archive) user actions older than the configured retention period"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-d', '--days', dest='days', type=int,
+                            default=getattr(settings, 'USERACTION_RETENTION', 0),
+                            help="Retain actions logged within this many days (default: USERACTION_RETENTION)")
+        parser.add_argument('-b', '--batch-size', dest='batch_size', type=int, default=1000,
+                            help="Number of actions to delete per query (default: 1000)")
+        parser.add_argument('-a', '--archive', dest='archive',
+                            help="Append pruned actions to this file (one JSON object per line) before deleting them")
+
+    def handle(self, *args, **options):
+
+        if options['days'] < 1:
+            raise CommandError("A retention period of at least one day must be specified (--days).")
+        if options['batch_size'] < 1:
+            raise CommandError("Batch size must be a positive integer.")
+
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        self.stdout.write("Pruning user actions logged before {}...".format(cutoff.strftime('%Y-%m-%d %H:%M')))
+
+        archive = io.open(options['archive'], 'a', encoding='utf-8') if options['archive'] else None
+        expired_actions = UserAction.objects.filter(time__lt=cutoff).order_by('pk')
+        deleted_count = 0
+        try:
+            while True:
+                if archive:
+                    batch = list(expired_actions.values(
+                        'pk', 'time', 'user__username', 'content_type__app_label', 'content_type__model',
+                        'object_id', 'action', 'message',
+                    )[:options['batch_size']])
+                    for action in batch:
+                        action['time'] = action['time'].isoformat()
+                        archive.write(u'{}\n'.format(json.dumps(action)))
+                    archive.flush()
+                    pk_list = [action['pk'] for action in batch]
+                else:
+                    pk_list = list(expired_actions.values_list('pk', flat=True)[:options['batch_size']])
+                if not pk_list:
+                    break
+                UserAction.objects.filter(pk__in=pk_list).delete()
+                deleted_count += len(pk_list)
+                self.stdout.write("Deleted {} actions".format(deleted_count))
+        finally:
+            if archive:
+                archive.close()
+
+        self.stdout.write("Finished.")
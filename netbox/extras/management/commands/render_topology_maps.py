@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from extras.models import TopologyMap
+from extras.topology import render_topology_maps
+
+
+class Command(BaseCommand):
+    help = "Render and cache the images for topology maps"
+
+    def add_arguments(self, parser):
+        parser.add_argument('slug', nargs='*', help="Render only the topology maps with these slugs")
+
+    def handle(self, *args, **options):
+
+        queryset = TopologyMap.objects.all()
+        if options['slug']:
+            queryset = queryset.filter(slug__in=options['slug'])
+            if not queryset:
+                raise CommandError("No matching topology maps found.")
+
+        try:
+            render_topology_maps(queryset)
+        except Exception as e:
+            raise CommandError("Error rendering topology maps: {}".format(e))
+
+        self.stdout.write("Rendered {} topology map(s).".format(queryset.count()))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from utilities.deletion import BULK_DELETION_TIMEOUT, fail_bulk_deletion, get_stale_bulk_deletions, run_bulk_deletion
+
+
+class Command(BaseCommand):
+    help = "Resume (or fail) background bulk deletions which are no longer making progress, such as those " \
+           "interrupted by the restart of the process running them"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-t', '--timeout', dest='timeout', type=int, default=BULK_DELETION_TIMEOUT,
+                            help="Seconds without progress after which a deletion is considered stale (default: {})"
+                            .format(BULK_DELETION_TIMEOUT))
+        parser.add_argument('--fail', action='store_true', dest='fail', default=False,
+                            help="Mark stale deletions as failed rather than resuming them")
+
+    def handle(self, *args, **options):
+
+        stale_jobs = get_stale_bulk_deletions(options['timeout']).select_related('user', 'obj_type').order_by('pk')
+        for job in stale_jobs:
+            if options['fail']:
+                if fail_bulk_deletion(job, u'Interrupted after {} of {} objects'.format(job.processed, job.total)):
+                    self.stdout.write("Failed {}".format(job))
+            else:
+                self.stdout.write("Resuming {} ({} processed)...".format(job, job.processed))
+                if not run_bulk_deletion(job):
+                    self.stdout.write("Already resumed by another process")
+
+        self.stdout.write("Finished.")
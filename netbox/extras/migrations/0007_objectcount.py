@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('extras', '0006_install_pg_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObjectCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('obj_id', models.PositiveIntegerField()),
+                ('name', models.CharField(max_length=50)),
+                ('count', models.PositiveIntegerField()),
+                ('obj_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.ContentType')),
+            ],
+            options={
+                'ordering': ['obj_type', 'obj_id', 'name'],
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='objectcount',
+            unique_together=set([('obj_type', 'obj_id', 'name')]),
+        ),
+    ]
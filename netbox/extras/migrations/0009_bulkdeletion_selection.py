@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0008_bulkdeletion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bulkdeletion',
+            name='filter_class',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='bulkdeletion',
+            name='filter_query',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='bulkdeletion',
+            name='max_pk',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bulkdeletion',
+            name='pk_list',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='bulkdeletion',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
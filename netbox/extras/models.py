@@ -1,3 +1,4 @@
+import threading
 from collections import OrderedDict
 from datetime import date
 
@@ -6,8 +7,9 @@ from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.validators import ValidationError
 from django.db import models
-from django.http import HttpResponse
+from django.http import HttpResponse, QueryDict
 from django.template import Template, Context
+from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
 
 
@@ -64,6 +66,17 @@ ACTION_CHOICES = (
     (ACTION_BULK_DELETE, 'bulk deleted')
 )
 
+BULK_DELETION_PENDING = 1
+BULK_DELETION_RUNNING = 2
+BULK_DELETION_COMPLETED = 3
+BULK_DELETION_FAILED = 4
+BULK_DELETION_STATUS_CHOICES = (
+    (BULK_DELETION_PENDING, 'Pending'),
+    (BULK_DELETION_RUNNING, 'Running'),
+    (BULK_DELETION_COMPLETED, 'Completed'),
+    (BULK_DELETION_FAILED, 'Failed'),
+)
+
 
 class CustomFieldModel(object):
 
@@ -207,6 +220,23 @@ class CustomFieldChoice(models.Model):
         CustomFieldValue.objects.filter(field__type=CF_TYPE_SELECT, serialized_value=str(pk)).delete()
 
 
+# Compiled Templates, keyed by their source code
+_compiled_templates = {}
+COMPILED_TEMPLATE_CACHE_SIZE = 1000
+
+
+def get_compiled_template(template_code):
+    """
+    Return a compiled Template for the given code, compiling it only if it has not been compiled previously.
+    """
+    template = _compiled_templates.get(template_code)
+    if template is None:
+        if len(_compiled_templates) >= COMPILED_TEMPLATE_CACHE_SIZE:
+            _compiled_templates.clear()
+        template = _compiled_templates[template_code] = Template(template_code)
+    return template
+
+
 class Graph(models.Model):
     type = models.PositiveSmallIntegerField(choices=GRAPH_TYPE_CHOICES)
     weight = models.PositiveSmallIntegerField(default=1000)
@@ -221,13 +251,13 @@ class Graph(models.Model):
         return self.name
 
     def embed_url(self, obj):
-        template = Template(self.source)
+        template = get_compiled_template(self.source)
         return template.render(Context({'obj': obj}))
 
     def embed_link(self, obj):
-        if self.link is None:
+        if not self.link:
             return ''
-        template = Template(self.link)
+        template = get_compiled_template(self.link)
         return template.render(Context({'obj': obj}))
 
 
@@ -288,11 +318,39 @@ class TopologyMap(models.Model):
         return [line.strip() for line in self.device_patterns.split('\n')]
 
 
+# Per-thread buffer of UserActions awaiting insertion (None when buffering is inactive)
+_useraction_buffer = threading.local()
+
+
 class UserActionManager(models.Manager):
 
+    # Buffering
+    def start_buffering(self):
+        """
+        Hold all subsequently logged actions in memory until flush() is called.
+        """
+        _useraction_buffer.actions = []
+
+    def flush(self):
+        """
+        Write any buffered actions to the database in a single query and stop buffering.
+        """
+        actions = getattr(_useraction_buffer, 'actions', None)
+        _useraction_buffer.actions = None
+        if actions:
+            self.bulk_create(actions)
+
+    def _record(self, **kwargs):
+        action = self.model(**kwargs)
+        buffered_actions = getattr(_useraction_buffer, 'actions', None)
+        if buffered_actions is not None:
+            buffered_actions.append(action)
+        else:
+            action.save()
+
     # Actions affecting a single object
     def log_action(self, user, obj, action, message):
-        self.model.objects.create(
+        self._record(
             content_type=ContentType.objects.get_for_model(obj),
             object_id=obj.pk,
             user=user,
@@ -311,7 +369,7 @@ class UserActionManager(models.Manager):
 
     # Actions affecting multiple objects
     def log_bulk_action(self, user, content_type, action, message):
-        self.model.objects.create(
+        self._record(
             content_type=content_type,
             user=user,
             action=action,
@@ -332,7 +390,7 @@ class UserAction(models.Model):
     """
     A record of an action (add, edit, or delete) performed on an object by a User.
     """
-    time = models.DateTimeField(auto_now_add=True, editable=False)
+    time = models.DateTimeField(auto_now_add=True, editable=False, db_index=True)
     user = models.ForeignKey(User, related_name='actions', on_delete=models.CASCADE)
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField(blank=True, null=True)
@@ -343,6 +401,9 @@ class UserAction(models.Model):
 
     class Meta:
         ordering = ['-time']
+        index_together = [
+            ['user', 'time'],
+        ]
 
     def __unicode__(self):
         if self.message:
@@ -358,3 +419,93 @@ class UserAction(models.Model):
             return mark_safe('<i class="glyphicon glyphicon-remove text-danger"></i>')
         else:
             return ''
+
+
+#
+# Statistics
+#
+
+class ObjectCount(models.Model):
+    """
+    A materialized count of the objects of some type related to a Site or Tenant (for example, the number of devices
+    assigned to a tenant). Counts are maintained only if STATS_SUMMARY is enabled; see extras.stats.
+    """
+    obj_type = models.ForeignKey(ContentType, related_name='+', on_delete=models.CASCADE)
+    obj_id = models.PositiveIntegerField()
+    obj = GenericForeignKey('obj_type', 'obj_id')
+    name = models.CharField(max_length=50)
+    count = models.PositiveIntegerField()
+
+    class Meta:
+        ordering = ['obj_type', 'obj_id', 'name']
+        unique_together = ['obj_type', 'obj_id', 'name']
+
+    def __unicode__(self):
+        return u'{} {}: {}'.format(self.obj, self.name, self.count)
+
+
+#
+# Bulk deletions
+#
+
+class BulkDeletion(models.Model):
+    """
+    The deletion of a set of objects (and all objects which depend upon them) in the background. The objects are
+    recorded as the filter (or list of PKs) by which they were selected, bounded by the greatest PK selected at the
+    time. The number of objects processed is recorded, and `updated` is set, as each chunk is deleted; see
+    utilities.deletion.
+    """
+    user = models.ForeignKey(User, related_name='bulk_deletions', blank=True, null=True, on_delete=models.SET_NULL)
+    obj_type = models.ForeignKey(ContentType, related_name='+', on_delete=models.CASCADE)
+    status = models.PositiveSmallIntegerField(choices=BULK_DELETION_STATUS_CHOICES, default=BULK_DELETION_PENDING)
+    total = models.PositiveIntegerField()
+    processed = models.PositiveIntegerField(default=0)
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+    completed = models.DateTimeField(blank=True, null=True)
+    message = models.TextField(blank=True)
+    filter_class = models.CharField(max_length=100, blank=True)
+    filter_query = models.TextField(blank=True)
+    pk_list = models.TextField(blank=True)
+    max_pk = models.PositiveIntegerField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created']
+
+    def __unicode__(self):
+        return u'Deletion of {} {}'.format(self.total, self.obj_type_plural)
+
+    @property
+    def obj_type_plural(self):
+        return self.obj_type.model_class()._meta.verbose_name_plural
+
+    @property
+    def in_progress(self):
+        return self.status in (BULK_DELETION_PENDING, BULK_DELETION_RUNNING)
+
+    @property
+    def percent_complete(self):
+        return min(int(100 * self.processed / self.total), 100) if self.total else 100
+
+    def get_selected_objects(self):
+        """
+        Return all objects currently selected by the filter (or list of PKs).
+        """
+        model = self.obj_type.model_class()
+        if self.filter_class:
+            return import_string(self.filter_class)(QueryDict(self.filter_query), model.objects.all()).qs
+        return model.objects.filter(pk__in=[int(pk) for pk in self.pk_list.split(',') if pk])
+
+    def get_queryset(self):
+        """
+        Return the objects which remain to be deleted.
+        """
+        return self.get_selected_objects().filter(pk__lte=self.max_pk or 0)
+
+    def get_status_class(self):
+        return {
+            BULK_DELETION_PENDING: 'default',
+            BULK_DELETION_RUNNING: 'info',
+            BULK_DELETION_COMPLETED: 'success',
+            BULK_DELETION_FAILED: 'danger',
+        }[self.status]
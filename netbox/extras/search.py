@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import CharField, F, Func
+from django.db.models.functions import Greatest
+
+from circuits.filters import CircuitFilter
+from circuits.models import Circuit
+from dcim.filters import DeviceFilter, RackFilter, SiteFilter
+from dcim.models import Device, Rack, Site
+from ipam.filters import IPAddressFilter, PrefixFilter, VLANFilter
+from ipam.models import IPAddress, Prefix, VLAN
+from tenancy.filters import TenantFilter
+from tenancy.models import Tenant
+
+
+SEARCH_MAX_RESULTS = 10
+
+# Each searchable object type is defined by:
+#   queryset: The base queryset to be searched
+#   filter: The FilterSet whose `q` filter performs the search (backed by the trigram indexes on the searched fields)
+#   rank_fields: The fields (or expressions) whose trigram similarity to the query determines the rank of each result
+#   url: The name of the URL of the object list, which displays the complete set of results
+SEARCH_TYPES = OrderedDict((
+    ('site', {
+        'queryset': Site.objects.all(),
+        'filter': SiteFilter,
+        'rank_fields': ['name', 'facility'],
+        'url': 'dcim:site_list',
+    }),
+    ('rack', {
+        'queryset': Rack.objects.select_related('site'),
+        'filter': RackFilter,
+        'rank_fields': ['name', 'facility_id'],
+        'url': 'dcim:rack_list',
+    }),
+    ('device', {
+        'queryset': Device.objects.select_related('device_type__manufacturer'),
+        'filter': DeviceFilter,
+        'rank_fields': ['name', 'serial'],
+        'url': 'dcim:device_list',
+    }),
+    ('prefix', {
+        'queryset': Prefix.objects.select_related('vrf'),
+        'filter': PrefixFilter,
+        'rank_fields': [Func(F('prefix'), function='TEXT', output_field=CharField()), 'description'],
+        'url': 'ipam:prefix_list',
+    }),
+    ('ipaddress', {
+        'queryset': IPAddress.objects.select_related('vrf'),
+        'filter': IPAddressFilter,
+        'rank_fields': [Func(F('address'), function='HOST', output_field=CharField()), 'description'],
+        'url': 'ipam:ipaddress_list',
+    }),
+    ('vlan', {
+        'queryset': VLAN.objects.select_related('site', 'group'),
+        'filter': VLANFilter,
+        'rank_fields': ['name', 'description'],
+        'url': 'ipam:vlan_list',
+    }),
+    ('circuit', {
+        'queryset': Circuit.objects.select_related('provider'),
+        'filter': CircuitFilter,
+        'rank_fields': ['cid'],
+        'url': 'circuits:circuit_list',
+    }),
+    ('tenant', {
+        'queryset': Tenant.objects.all(),
+        'filter': TenantFilter,
+        'rank_fields': ['name', 'description'],
+        'url': 'tenancy:tenant_list',
+    }),
+))
+
+
+def get_rank_expression(fields, query):
+    """
+    Return an expression evaluating to the greatest trigram similarity between the query and any of the given fields.
+    """
+    similarities = [TrigramSimilarity(field, query) for field in fields]
+    if len(similarities) == 1:
+        return similarities[0]
+    return Greatest(*similarities)
+
+
+def search(query, obj_types=None, limit=SEARCH_MAX_RESULTS):
+    """
+    Search all (or the specified) object types. Returns an OrderedDict mapping each object type having at least one
+    match to a dictionary containing the total number of matches (`count`) and up to `limit` of the highest-ranked
+    matching objects (`objects`), each annotated with its `search_rank`.
+    """
+    results = OrderedDict()
+
+    for obj_type, search_type in SEARCH_TYPES.items():
+        if obj_types and obj_type not in obj_types:
+            continue
+
+        queryset = search_type['filter']({'q': query}, search_type['queryset'].all()).qs
+        count = queryset.count()
+        if not count:
+            continue
+
+        objects = queryset.annotate(
+            search_rank=get_rank_expression(search_type['rank_fields'], query)
+        ).order_by('-search_rank', 'pk')[:limit]
+
+        results[obj_type] = {
+            'model': queryset.model,
+            'count': count,
+            'objects': list(objects),
+            'url': search_type['url'],
+        }
+
+    return results
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from dcim.models import Device, InterfaceConnection
+
+from .models import ObjectCount, TopologyMap
+from .stats import STATS, STATS_MODELS, invalidate_object_stats, record_stats_fields
+from .topology import schedule_topology_map_rendering
+
+
+@receiver((post_save, post_delete), sender=Device)
+def regenerate_device_topology_maps(instance, **kwargs):
+    """
+    Regenerate the images of topology maps which may include a Device once its change has been committed.
+    """
+    device_pks, device_names = [instance.pk], [instance.name]
+    transaction.on_commit(lambda: schedule_topology_map_rendering(device_pks=device_pks, device_names=device_names))
+
+
+@receiver((post_save, post_delete), sender=InterfaceConnection)
+def regenerate_connection_topology_maps(instance, **kwargs):
+    """
+    Regenerate the images of topology maps which may include either end of an InterfaceConnection once its change has
+    been committed.
+    """
+    interface_pks = [instance.interface_a_id, instance.interface_b_id]
+    transaction.on_commit(lambda: schedule_topology_map_rendering(interface_pks=interface_pks))
+
+
+@receiver(post_save, sender=TopologyMap)
+def regenerate_topology_map(instance, **kwargs):
+    """
+    Regenerate the image of a TopologyMap once its change has been committed.
+    """
+    map_pks = [instance.pk]
+    transaction.on_commit(lambda: schedule_topology_map_rendering(map_pks=map_pks))
+
+
+def record_object_relations(sender, instance, **kwargs):
+    """
+    Remember the Tenants and Sites to which an object counted by their statistics is related when it is retrieved.
+    """
+    if settings.STATS_SUMMARY:
+        record_stats_fields(instance)
+
+
+def invalidate_object_counts(sender, instance, **kwargs):
+    """
+    Discard the materialized statistics affected by the creation, modification, or deletion of an object.
+    """
+    if settings.STATS_SUMMARY:
+        invalidate_object_stats(instance)
+        record_stats_fields(instance)
+
+
+def delete_object_counts(sender, instance, **kwargs):
+    """
+    Delete the materialized statistics of a Tenant or Site which has been deleted.
+    """
+    if settings.STATS_SUMMARY:
+        ObjectCount.objects.filter(obj_type=ContentType.objects.get_for_model(sender), obj_id=instance.pk).delete()
+
+
+for model in STATS_MODELS:
+    post_init.connect(record_object_relations, sender=model)
+    post_save.connect(invalidate_object_counts, sender=model)
+    post_delete.connect(invalidate_object_counts, sender=model)
+for model in STATS:
+    post_delete.connect(delete_object_counts, sender=model)
@@ -0,0 +1,242 @@
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction, IntegrityError
+from django.db.models import Q
+
+from circuits.models import Circuit, CircuitTermination
+from dcim.models import Device, Rack, Site
+from ipam.models import IPAddress, Prefix, VLAN, VRF
+from tenancy.models import Tenant
+
+from .models import ObjectCount
+
+
+# The statistics displayed for each Tenant and Site. Each statistic is defined by:
+#   querysets: A function returning the querysets whose combined count is the value of the statistic. (Counts are
+#              summed rather than the querysets ORed together, so that each can be satisfied by an index.)
+#   models: The models whose modification may change the value of the statistic, each mapped to the paths from an
+#           instance of that model to the Tenants or Sites whose statistic it changes (e.g. `rack__site` for a Device)
+STATS = {
+    Tenant: OrderedDict((
+        ('site_count', {
+            'querysets': lambda tenant: [Site.objects.filter(tenant=tenant)],
+            'models': {Site: ['tenant']},
+        }),
+        ('rack_count', {
+            'querysets': lambda tenant: [Rack.objects.filter(tenant=tenant)],
+            'models': {Rack: ['tenant']},
+        }),
+        ('device_count', {
+            'querysets': lambda tenant: [Device.objects.filter(tenant=tenant)],
+            'models': {Device: ['tenant']},
+        }),
+        ('vrf_count', {
+            'querysets': lambda tenant: [VRF.objects.filter(tenant=tenant)],
+            'models': {VRF: ['tenant']},
+        }),
+        ('prefix_count', {
+            'querysets': lambda tenant: [
+                Prefix.objects.filter(tenant=tenant),
+                Prefix.objects.filter(tenant__isnull=True, vrf__tenant=tenant),
+            ],
+            'models': {Prefix: ['tenant', 'vrf__tenant'], VRF: ['tenant']},
+        }),
+        ('ipaddress_count', {
+            'querysets': lambda tenant: [
+                IPAddress.objects.filter(tenant=tenant),
+                IPAddress.objects.filter(tenant__isnull=True, vrf__tenant=tenant),
+            ],
+            'models': {IPAddress: ['tenant', 'vrf__tenant'], VRF: ['tenant']},
+        }),
+        ('vlan_count', {
+            'querysets': lambda tenant: [VLAN.objects.filter(tenant=tenant)],
+            'models': {VLAN: ['tenant']},
+        }),
+        ('circuit_count', {
+            'querysets': lambda tenant: [Circuit.objects.filter(tenant=tenant)],
+            'models': {Circuit: ['tenant']},
+        }),
+    )),
+    Site: OrderedDict((
+        ('rack_count', {
+            'querysets': lambda site: [Rack.objects.filter(site=site)],
+            'models': {Rack: ['site']},
+        }),
+        ('device_count', {
+            'querysets': lambda site: [Device.objects.filter(rack__site=site)],
+            'models': {Device: ['rack__site'], Rack: ['site']},
+        }),
+        ('prefix_count', {
+            'querysets': lambda site: [Prefix.objects.filter(site=site)],
+            'models': {Prefix: ['site']},
+        }),
+        ('vlan_count', {
+            'querysets': lambda site: [VLAN.objects.filter(site=site)],
+            'models': {VLAN: ['site']},
+        }),
+        ('circuit_count', {
+            'querysets': lambda site: [Circuit.objects.filter(terminations__site=site).distinct()],
+            'models': {CircuitTermination: ['site']},
+        }),
+    )),
+}
+
+# All models on which any statistic depends
+STATS_MODELS = set(model for stats in STATS.values() for stat in stats.values() for model in stat['models'])
+
+# The foreign key fields (by attname) of each model through which it is related to the Tenants and Sites counting it
+STATS_FIELDS = {
+    model: set(
+        model._meta.get_field(path.split('__')[0]).attname
+        for stats in STATS.values() for stat in stats.values() for path in stat['models'].get(model, [])
+    ) for model in STATS_MODELS
+}
+
+
+def count_stats(obj, names=None):
+    """
+    Compute the statistics (or only those named) for a Tenant or Site with a single query, in which the count of each
+    queryset is a scalar subquery. Returns an OrderedDict mapping each statistic to its value.
+    """
+    return count_bulk_stats([obj], names)[obj.pk]
+
+
+def count_bulk_stats(objs, names=None):
+    """
+    Compute the statistics (or only those named) for several Tenants or Sites of the same model with a single query,
+    combining the row of each object (see count_stats()) with UNION ALL. Returns a dict mapping the PK of each object to
+    an OrderedDict of its statistics.
+    """
+    objs = list(objs)
+    if not objs:
+        return {}
+    stats = STATS[objs[0]._meta.concrete_model]
+    names = [name for name in stats if names is None or name in names]
+
+    rows = []
+    params = []
+    for obj in objs:
+        columns = ['%s']
+        params.append(obj.pk)
+        for name in names:
+            subqueries = []
+            for i, queryset in enumerate(stats[name]['querysets'](obj)):
+                sql, sql_params = queryset.order_by().values('pk').query.sql_with_params()
+                subqueries.append('(SELECT COUNT(*) FROM ({}) AS {})'.format(sql, '_{}_{}'.format(name, i)))
+                params.extend(sql_params)
+            columns.append('{} AS {}'.format(' + '.join(subqueries), connection.ops.quote_name(name)))
+        rows.append('SELECT {}'.format(', '.join(columns)))
+
+    with connection.cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(rows), params)
+        return {row[0]: OrderedDict(zip(names, row[1:])) for row in cursor.fetchall()}
+
+
+def get_stats(obj):
+    """
+    Return the statistics for a Tenant or Site. If STATS_SUMMARY is enabled, materialized counts are used where
+    available, and any missing counts are computed and saved.
+    """
+    return get_bulk_stats([obj])[obj.pk]
+
+
+def get_bulk_stats(objs):
+    """
+    Return the statistics for several Tenants or Sites of the same model (see get_stats()), as a dict mapping the PK of
+    each object to an OrderedDict of its statistics. The number of queries does not depend on the number of objects.
+    """
+    objs = list(objs)
+    if not objs:
+        return {}
+    stats = STATS[objs[0]._meta.concrete_model]
+
+    if not settings.STATS_SUMMARY:
+        return count_bulk_stats(objs)
+
+    obj_type = ContentType.objects.get_for_model(objs[0])
+    counts = {obj.pk: {} for obj in objs}
+    for obj_id, name, count in ObjectCount.objects.filter(obj_type=obj_type, obj_id__in=counts.keys())\
+            .values_list('obj_id', 'name', 'count'):
+        counts[obj_id][name] = count
+    missing = {obj.pk: [name for name in stats if name not in counts[obj.pk]] for obj in objs}
+
+    incomplete = [obj for obj in objs if missing[obj.pk]]
+    if incomplete:
+        computed = count_bulk_stats(incomplete, set(name for obj in incomplete for name in missing[obj.pk]))
+        for obj in incomplete:
+            counts[obj.pk].update(computed[obj.pk])
+        try:
+            with transaction.atomic():
+                ObjectCount.objects.bulk_create([
+                    ObjectCount(obj_type=obj_type, obj_id=obj.pk, name=name, count=counts[obj.pk][name])
+                    for obj in incomplete for name in missing[obj.pk]
+                ])
+        except IntegrityError:
+            # Some of the counts have been saved by a concurrent request.
+            pass
+
+    return {obj.pk: OrderedDict((name, counts[obj.pk][name]) for name in stats) for obj in objs}
+
+
+def annotate_stats(objs):
+    """
+    Annotate each of the given Tenants or Sites with its statistics (as `stats`; see get_bulk_stats()). Returns the
+    list of objects.
+    """
+    objs = list(objs)
+    stats = get_bulk_stats(objs)
+    for obj in objs:
+        obj.stats = stats[obj.pk]
+    return objs
+
+
+def invalidate_stats(model):
+    """
+    Discard the materialized counts of every Tenant and Site which depend on the given model (for use after bulk
+    changes which send no signals). They will be recomputed when next requested.
+    """
+    for obj_model, stats in STATS.items():
+        names = [name for name, stat in stats.items() if model in stat['models']]
+        if names:
+            ObjectCount.objects.filter(obj_type=ContentType.objects.get_for_model(obj_model), name__in=names).delete()
+
+
+def record_stats_fields(instance):
+    """
+    Remember the values of the fields through which an object is related to the Tenants and Sites counting it, so that
+    the statistics of both the old and the new Tenants and Sites can be invalidated once the object has been modified.
+    """
+    instance._stats_fields = {
+        attname: instance.__dict__[attname] for attname in STATS_FIELDS[instance._meta.concrete_model]
+        if attname in instance.__dict__
+    }
+
+
+def invalidate_object_stats(instance):
+    """
+    Discard the materialized counts which may have been changed by the creation, modification, or deletion of an
+    object: those of the Tenants and Sites to which it is related, either now or as it was last saved or retrieved.
+    """
+    model = instance._meta.concrete_model
+    original = getattr(instance, '_stats_fields', {})
+    conditions = Q()
+
+    for obj_model, stats in STATS.items():
+        obj_type = ContentType.objects.get_for_model(obj_model)
+        for name, stat in stats.items():
+            for path in stat['models'].get(model, []):
+                field_name, _, related_path = path.partition('__')
+                attname = model._meta.get_field(field_name).attname
+                pks = {original.get(attname), getattr(instance, attname)} - {None}
+                if not pks:
+                    continue
+                if related_path:
+                    # Resolve the Tenants or Sites with a subquery of the DELETE
+                    related_model = model._meta.get_field(field_name).related_model
+                    pks = related_model._default_manager.filter(pk__in=pks).values(related_path)
+                conditions |= Q(obj_type=obj_type, name=name, obj_id__in=pks)
+
+    if conditions:
+        ObjectCount.objects.filter(conditions).delete()
@@ -0,0 +1,77 @@
+import shutil
+import tempfile
+import threading
+
+from django.test import TestCase, override_settings
+from django.utils.six.moves.BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+from dcim.models import Site
+from extras import graphs
+from extras.models import GRAPH_TYPE_SITE, Graph, get_compiled_template
+
+
+class GraphBackendHandler(BaseHTTPRequestHandler):
+    """
+    A stand-in for a graphing backend which counts the requests it receives.
+    """
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.end_headers()
+        self.wfile.write(b'PNG:' + self.path.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+class GraphTestCase(TestCase):
+
+    def setUp(self):
+
+        self.site = Site.objects.create(name='Site 1', slug='site-1')
+        self.server = HTTPServer(('127.0.0.1', 0), GraphBackendHandler)
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.graph = Graph.objects.create(
+            type=GRAPH_TYPE_SITE,
+            name='Traffic',
+            source='http://127.0.0.1:{}/graphs/{{{{ obj.slug }}}}.png'.format(self.server.server_port),
+        )
+        self.cache_dir = tempfile.mkdtemp()
+        graphs._image_cache.clear()
+        GraphBackendHandler.requests = []
+
+    def tearDown(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+        graphs._image_cache.clear()
+
+    def test_compiled_template_cache(self):
+
+        self.assertIs(get_compiled_template(self.graph.source), get_compiled_template(self.graph.source))
+        self.assertEqual(
+            self.graph.embed_url(self.site),
+            'http://127.0.0.1:{}/graphs/site-1.png'.format(self.server.server_port)
+        )
+
+    def test_graph_proxy_cache(self):
+
+        with override_settings(GRAPH_PROXY_CACHE_DIR=self.cache_dir, GRAPH_PROXY_CACHE_TIMEOUT=60):
+            url = self.graph.embed_url(self.site)
+            for i in range(3):
+                content_type, image_data = graphs.fetch_graph_image(url)
+                self.assertEqual(content_type, 'image/png')
+                self.assertEqual(image_data, b'PNG:/graphs/site-1.png')
+
+        self.assertEqual(GraphBackendHandler.requests, ['/graphs/site-1.png'])
+
+    def test_graph_proxy_invalid_scheme(self):
+
+        with self.assertRaises(graphs.GraphProxyError):
+            graphs.fetch_graph_image('file:///etc/passwd')
@@ -0,0 +1,94 @@
+from netaddr import IPNetwork
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from dcim.models import Site
+from extras.search import search
+from ipam.models import IPAddress, Prefix
+from tenancy.models import Tenant
+
+
+class SearchTestCase(TestCase):
+
+    def setUp(self):
+
+        # Created in the reverse order of their expected rank
+        Site.objects.create(name='Alphabet Soup', slug='alphabet-soup')
+        Site.objects.create(name='Alpha', slug='alpha')
+        Site.objects.create(name='Bravo', slug='bravo')
+        Tenant.objects.create(name='Alpha Tenant', slug='alpha-tenant')
+
+    def test_results_per_type(self):
+
+        results = search('alpha')
+
+        self.assertEqual(list(results.keys()), ['site', 'tenant'])
+        self.assertEqual(results['site']['count'], 2)
+        self.assertEqual(results['site']['url'], 'dcim:site_list')
+        self.assertEqual(results['tenant']['count'], 1)
+
+    def test_obj_types_and_limit(self):
+
+        results = search('alpha', obj_types=['site'], limit=1)
+
+        self.assertEqual(list(results.keys()), ['site'])
+        self.assertEqual(results['site']['count'], 2)
+        self.assertEqual([s.name for s in results['site']['objects']], ['Alpha'])
+
+    def test_ranking(self):
+
+        sites = search('alpha')['site']['objects']
+
+        self.assertEqual([s.name for s in sites], ['Alpha', 'Alphabet Soup'])
+        self.assertEqual(sites[0].search_rank, 1)
+        self.assertLess(sites[1].search_rank, 1)
+
+    def test_prefix_ranking(self):
+
+        Prefix.objects.create(prefix=IPNetwork('10.0.0.0/8'))
+        Prefix.objects.create(prefix=IPNetwork('10.1.0.0/16'))
+
+        prefixes = search('10.1.0.0/16')['prefix']['objects']
+
+        self.assertEqual([str(p.prefix) for p in prefixes], ['10.1.0.0/16', '10.0.0.0/8'])
+
+    def test_ipaddress_ranking(self):
+
+        IPAddress.objects.create(address=IPNetwork('10.9.9.9/24'), description='Peer of 10.1.0.1')
+        IPAddress.objects.create(address=IPNetwork('10.1.0.1/24'))
+
+        ips = search('10.1.0.1')['ipaddress']['objects']
+
+        self.assertEqual([str(ip.address) for ip in ips], ['10.1.0.1/24', '10.9.9.9/24'])
+
+
+class SearchAPITestCase(TestCase):
+
+    def setUp(self):
+
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        Site.objects.create(name='Alphabet Soup', slug='alphabet-soup')
+        Site.objects.create(name='Alpha', slug='alpha')
+        Tenant.objects.create(name='Alpha Tenant', slug='alpha-tenant')
+
+    def test_search(self):
+
+        response = self.client.get(reverse('search-api'), {'q': 'alpha', 'obj_type': 'site', 'limit': 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data.keys()), ['site'])
+        self.assertEqual(response.data['site']['count'], 2)
+        self.assertEqual([r['display_name'] for r in response.data['site']['results']], ['Alpha'])
+        self.assertEqual(response.data['site']['results'][0]['url'], reverse('dcim:site', kwargs={'slug': 'alpha'}))
+
+    def test_empty_query(self):
+
+        response = self.client.get(reverse('search-api'), {'q': ''})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {})
@@ -0,0 +1,120 @@
+from netaddr import IPNetwork
+
+from django.test import TestCase, override_settings
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+from extras.models import ObjectCount
+from extras.stats import get_bulk_stats, get_stats
+from ipam.models import Prefix, VRF
+from tenancy.models import Tenant
+
+
+class TenantStatsTestCase(TestCase):
+
+    def setUp(self):
+
+        self.tenant = Tenant.objects.create(name='Tenant 1', slug='tenant-1')
+        Site.objects.create(name='Site 1', slug='site-1', tenant=self.tenant)
+        vrf = VRF.objects.create(name='VRF 1', rd='65000:1', tenant=self.tenant)
+        Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'), tenant=self.tenant)
+        Prefix.objects.create(prefix=IPNetwork('10.0.1.0/24'), vrf=vrf)
+        Prefix.objects.create(prefix=IPNetwork('10.0.2.0/24'))
+
+    def test_stats(self):
+
+        with self.assertNumQueries(1):
+            stats = get_stats(self.tenant)
+
+        self.assertEqual(stats['site_count'], 1)
+        self.assertEqual(stats['vrf_count'], 1)
+        self.assertEqual(stats['prefix_count'], 2)
+        self.assertEqual(stats['device_count'], 0)
+
+    def test_bulk_stats(self):
+
+        tenant2 = Tenant.objects.create(name='Tenant 2', slug='tenant-2')
+        Prefix.objects.create(prefix=IPNetwork('10.0.3.0/24'), tenant=tenant2)
+
+        with self.assertNumQueries(1):
+            stats = get_bulk_stats([self.tenant, tenant2])
+
+        self.assertEqual(stats[self.tenant.pk], get_stats(self.tenant))
+        self.assertEqual(stats[tenant2.pk]['prefix_count'], 1)
+        self.assertEqual(stats[tenant2.pk]['site_count'], 0)
+
+    @override_settings(STATS_SUMMARY=True)
+    def test_bulk_stats_summary(self):
+
+        tenant2 = Tenant.objects.create(name='Tenant 2', slug='tenant-2')
+        get_stats(self.tenant)
+
+        # Only the counts of the tenant which has none are computed and saved
+        self.assertEqual(get_bulk_stats([self.tenant, tenant2])[tenant2.pk]['vrf_count'], 0)
+        self.assertEqual(ObjectCount.objects.filter(obj_id=tenant2.pk).count(), len(get_stats(tenant2)))
+        with self.assertNumQueries(1):
+            stats = get_bulk_stats([self.tenant, tenant2])
+        self.assertEqual(stats[self.tenant.pk]['prefix_count'], 2)
+
+    @override_settings(STATS_SUMMARY=True)
+    def test_stats_summary(self):
+
+        self.assertEqual(get_stats(self.tenant)['prefix_count'], 2)
+        self.assertEqual(ObjectCount.objects.filter(obj_id=self.tenant.pk).count(), len(get_stats(self.tenant)))
+
+        # Creating a Prefix discards only the counts which depend on Prefixes
+        Prefix.objects.create(prefix=IPNetwork('10.0.3.0/24'), tenant=self.tenant)
+        self.assertFalse(ObjectCount.objects.filter(name='prefix_count').exists())
+        self.assertTrue(ObjectCount.objects.filter(name='site_count').exists())
+        self.assertEqual(get_stats(self.tenant)['prefix_count'], 3)
+
+    @override_settings(STATS_SUMMARY=True)
+    def test_stats_invalidation(self):
+
+        tenant2 = Tenant.objects.create(name='Tenant 2', slug='tenant-2')
+        site = Site.objects.get(name='Site 1')
+        site2 = Site.objects.create(name='Site 2', slug='site-2')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        rack2 = Rack.objects.create(name='Rack 2', site=site2)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        Device.objects.create(name='Device 2', device_type=device_type, device_role=device_role, rack=rack2,
+                              tenant=tenant2)
+        for obj in (self.tenant, tenant2, site, site2):
+            get_stats(obj)
+
+        def cached(obj):
+            return set(ObjectCount.objects.filter(obj_id=obj.pk, obj_type__model=obj._meta.model_name)
+                       .values_list('name', flat=True))
+
+        # Creating one tenant's device leaves the counts of the other tenant (and site) in place
+        device = Device.objects.create(name='Device 1', device_type=device_type, device_role=device_role, rack=rack,
+                                       tenant=self.tenant)
+        self.assertNotIn('device_count', cached(self.tenant))
+        self.assertIn('site_count', cached(self.tenant))
+        self.assertIn('device_count', cached(tenant2))
+        self.assertNotIn('device_count', cached(site))
+        self.assertIn('device_count', cached(site2))
+        self.assertEqual(get_stats(self.tenant)['device_count'], 1)
+        self.assertEqual(get_stats(site)['device_count'], 1)
+
+        # Moving a device discards the counts of both its old and its new tenant and site
+        device = Device.objects.get(pk=device.pk)
+        device.tenant = tenant2
+        device.rack = rack2
+        device.save()
+        self.assertNotIn('device_count', cached(self.tenant))
+        self.assertNotIn('device_count', cached(tenant2))
+        self.assertNotIn('device_count', cached(site))
+        self.assertNotIn('device_count', cached(site2))
+        self.assertEqual(get_stats(self.tenant)['device_count'], 0)
+        self.assertEqual(get_stats(tenant2)['device_count'], 2)
+        self.assertEqual(get_stats(site2)['device_count'], 2)
+
+        # Changing a VRF's tenant affects the prefix counts of the old and the new tenant
+        get_stats(tenant2)
+        vrf = VRF.objects.get(name='VRF 1')
+        vrf.tenant = tenant2
+        vrf.save()
+        self.assertEqual(get_stats(self.tenant)['prefix_count'], 1)
+        self.assertEqual(get_stats(tenant2)['prefix_count'], 1)
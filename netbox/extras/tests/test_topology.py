@@ -0,0 +1,66 @@
+from django.test import TestCase
+
+from dcim.models import Device, DeviceRole, DeviceType, Interface, InterfaceConnection, Manufacturer, Rack, Site
+from extras.models import TopologyMap
+from extras.topology import build_topology_graph, get_affected_topology_maps, get_graph_hash
+
+
+class TopologyMapTestCase(TestCase):
+
+    def setUp(self):
+
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+
+        for name in ['core1', 'core2', 'access1', 'access2', 'other1']:
+            device = Device.objects.create(name=name, device_type=device_type, device_role=device_role, rack=rack)
+            Interface.objects.create(device=device, name='eth0')
+            Interface.objects.create(device=device, name='eth1')
+
+        self.tmap = TopologyMap.objects.create(name='Map 1', slug='map-1', site=site,
+                                               device_patterns='core\\d\naccess1;access2')
+
+    def test_graph_construction(self):
+
+        InterfaceConnection.objects.create(
+            interface_a=Interface.objects.get(device__name='core1', name='eth0'),
+            interface_b=Interface.objects.get(device__name='access1', name='eth0'),
+        )
+        InterfaceConnection.objects.create(
+            interface_a=Interface.objects.get(device__name='core2', name='eth0'),
+            interface_b=Interface.objects.get(device__name='other1', name='eth0'),
+        )
+
+        with self.assertNumQueries(2):
+            graph = build_topology_graph(self.tmap)
+
+        self.assertIn('core1', graph.source)
+        self.assertIn('access2', graph.source)
+        self.assertNotIn('other1', graph.source)
+        self.assertIn('core1 -- access1', graph.source)
+
+    def test_graph_hash(self):
+
+        hash1 = get_graph_hash(build_topology_graph(self.tmap))
+        self.assertEqual(hash1, get_graph_hash(build_topology_graph(self.tmap)))
+
+        InterfaceConnection.objects.create(
+            interface_a=Interface.objects.get(device__name='core1', name='eth1'),
+            interface_b=Interface.objects.get(device__name='access2', name='eth1'),
+        )
+        self.assertNotEqual(hash1, get_graph_hash(build_topology_graph(self.tmap)))
+
+    def test_affected_maps(self):
+
+        site2 = Site.objects.create(name='Site 2', slug='site-2')
+        tmap2 = TopologyMap.objects.create(name='Map 2', slug='map-2', site=site2, device_patterns='edge\\d')
+
+        self.assertEqual(get_affected_topology_maps({'core9'}, set()), [self.tmap])
+        self.assertEqual(get_affected_topology_maps({'access2'}, set()), [self.tmap])
+        self.assertEqual(get_affected_topology_maps({'edge1'}, set()), [tmap2])
+        self.assertEqual(get_affected_topology_maps({'other1'}, set()), [])
+        self.assertEqual(get_affected_topology_maps({'other1'}, {site2.pk}), [tmap2])
+        self.assertEqual(get_affected_topology_maps({'core1', 'edge1'}, set()), [self.tmap, tmap2])
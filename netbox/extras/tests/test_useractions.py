@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from dcim.models import Site
+from extras.models import UserAction
+
+
+class UserActionBufferTestCase(TestCase):
+
+    def setUp(self):
+
+        self.user = User.objects.create_user(username='testuser', password='testuser')
+        self.sites = [Site.objects.create(name='Site {}'.format(i), slug='site-{}'.format(i)) for i in range(1, 4)]
+
+    def tearDown(self):
+
+        # Ensure buffering does not leak into other tests
+        UserAction.objects.flush()
+
+    def test_unbuffered_logging(self):
+
+        UserAction.objects.log_create(self.user, self.sites[0], 'Created site')
+        self.assertEqual(UserAction.objects.count(), 1)
+
+    def test_buffered_logging(self):
+
+        UserAction.objects.start_buffering()
+        for site in self.sites:
+            UserAction.objects.log_create(self.user, site, 'Created site')
+        self.assertEqual(UserAction.objects.count(), 0)
+
+        with self.assertNumQueries(1):
+            UserAction.objects.flush()
+        self.assertEqual(UserAction.objects.count(), 3)
+
+        # Buffering stops once flushed
+        UserAction.objects.log_edit(self.user, self.sites[0], 'Modified site')
+        self.assertEqual(UserAction.objects.count(), 4)
@@ -0,0 +1,216 @@
+import graphviz
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+
+from dcim.models import Device, InterfaceConnection
+
+from .models import TopologyMap
+
+logger = logging.getLogger(__name__)
+
+TOPOLOGY_MAP_FORMATS = OrderedDict((
+    ('png', 'image/png'),
+    ('svg', 'image/svg+xml'),
+))
+
+# Rendered images are keyed by the hash of the graph from which they were generated, so a cached image never becomes
+# stale; the timeout merely evicts images of graphs which no longer exist.
+TOPOLOGY_MAP_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Number of seconds to wait before regenerating topology maps, allowing a burst of changes to be coalesced
+TOPOLOGY_MAP_RENDER_DELAY = 5
+
+
+def build_topology_graph(tmap):
+    """
+    Construct the graphviz Graph for a TopologyMap. All devices matching any of the map's patterns are retrieved with a
+    single query (annotated with the patterns they match), and all connections among them with a second query.
+    """
+    device_sets = tmap.device_sets or []
+
+    # Flatten all patterns into a list of (tier, regex) tuples
+    patterns = []
+    for i, device_set in enumerate(device_sets):
+        for query in device_set.split(';'):  # Split regexes on semicolons
+            patterns.append((i, query))
+
+    devices = []
+    if patterns:
+        device_superset = Q()
+        match_fields = OrderedDict()
+        for k, (i, query) in enumerate(patterns):
+            device_superset |= Q(name__regex=query)
+            match_fields['_match{}'.format(k)] = '{}.name ~ %s'.format(Device._meta.db_table)
+        devices = list(
+            Device.objects.filter(device_superset)
+            .extra(select=match_fields, select_params=[query for i, query in patterns])
+            .values('pk', 'name', *match_fields.keys())
+        )
+
+    # Construct the graph
+    graph = graphviz.Graph()
+    graph.graph_attr['ranksep'] = '1'
+    for i, device_set in enumerate(device_sets):
+
+        subgraph = graphviz.Graph(name='sg{}'.format(i))
+        subgraph.graph_attr['rank'] = 'same'
+
+        # Add a pseudonode for each device_set to enforce hierarchical layout
+        subgraph.node('set{}'.format(i), label='', shape='none', width='0')
+        if i:
+            graph.edge('set{}'.format(i - 1), 'set{}'.format(i), style='invis')
+
+        # Add each device to the graph, grouped by the pattern it matches
+        names = []
+        for k, (tier, query) in enumerate(patterns):
+            if tier == i:
+                names += [d['name'] for d in devices if d['_match{}'.format(k)]]
+        for name in names:
+            subgraph.node(name)
+
+        # Add an invisible connection to each successive device in a set to enforce horizontal order
+        for j in range(0, len(names) - 1):
+            subgraph.edge(names[j], names[j + 1], style='invis')
+
+        graph.subgraph(subgraph)
+
+    # Add all connections to the graph
+    device_pks = [d['pk'] for d in devices]
+    if device_pks:
+        connections = InterfaceConnection.objects.filter(
+            interface_a__device__in=device_pks, interface_b__device__in=device_pks
+        ).order_by('pk').values_list('interface_a__device__name', 'interface_b__device__name')
+        for device_a, device_b in connections:
+            graph.edge(device_a, device_b)
+
+    return graph
+
+
+def get_graph_hash(graph):
+    """
+    Return a hash of the graph's DOT source, which uniquely identifies the rendered output.
+    """
+    return hashlib.sha256(graph.source.encode('utf-8')).hexdigest()
+
+
+def render_topology_graph(graph, img_format='png', graph_hash=None):
+    """
+    Return the rendered image data for a graph, rendering it only if it is not already cached.
+    """
+    if graph_hash is None:
+        graph_hash = get_graph_hash(graph)
+    cache_key = 'topology_map_{}.{}'.format(graph_hash, img_format)
+
+    image_data = cache.get(cache_key)
+    if image_data is None:
+        image_data = graph.pipe(format=img_format)
+        cache.set(cache_key, image_data, TOPOLOGY_MAP_CACHE_TIMEOUT)
+
+    return image_data
+
+
+def render_topology_maps(queryset=None):
+    """
+    Render and cache the images for all (or the specified) TopologyMaps.
+    """
+    if queryset is None:
+        queryset = TopologyMap.objects.all()
+    for tmap in queryset:
+        graph = build_topology_graph(tmap)
+        graph_hash = get_graph_hash(graph)
+        for img_format in TOPOLOGY_MAP_FORMATS:
+            render_topology_graph(graph, img_format, graph_hash)
+
+
+def _matches_device_patterns(tmap, device_names):
+    for device_set in tmap.device_sets or []:
+        for query in device_set.split(';'):
+            try:
+                regex = re.compile(query)
+            except re.error:
+                # The pattern may be valid for PostgreSQL; assume it matches
+                return True
+            if any(regex.search(name) for name in device_names):
+                return True
+    return False
+
+
+def get_affected_topology_maps(device_names, site_ids):
+    """
+    Return the TopologyMaps which may depict any of the given devices: those assigned to one of the devices' sites, and
+    those having a device pattern which matches one of the devices' names.
+    """
+    return [
+        tmap for tmap in TopologyMap.objects.all()
+        if tmap.site_id in site_ids or _matches_device_patterns(tmap, device_names)
+    ]
+
+
+_render_lock = threading.Lock()
+_render_pending = {}
+
+
+def _reset_pending():
+    _render_pending.update({
+        'scheduled': False,
+        'map_pks': set(),
+        'device_pks': set(),
+        'device_names': set(),
+        'interface_pks': set(),
+    })
+
+
+_reset_pending()
+
+
+def _render_worker():
+    time.sleep(TOPOLOGY_MAP_RENDER_DELAY)
+    with _render_lock:
+        pending = dict(_render_pending)
+        _reset_pending()
+    try:
+        device_names = set(pending['device_names'])
+        site_ids = set()
+        if pending['device_pks'] or pending['interface_pks']:
+            devices = Device.objects.filter(
+                Q(pk__in=pending['device_pks']) | Q(interfaces__pk__in=pending['interface_pks'])
+            ).values_list('name', 'rack__site').distinct()
+            for name, site_id in devices:
+                if name:
+                    device_names.add(name)
+                site_ids.add(site_id)
+        maps = get_affected_topology_maps(device_names, site_ids) if device_names or site_ids else []
+        maps += list(TopologyMap.objects.filter(pk__in=pending['map_pks']).exclude(pk__in=[m.pk for m in maps]))
+        render_topology_maps(maps)
+    except Exception:
+        # The affected maps will be rendered on demand instead
+        logger.exception("Error rendering topology maps in the background")
+    finally:
+        connection.close()
+
+
+def schedule_topology_map_rendering(map_pks=(), device_pks=(), device_names=(), interface_pks=()):
+    """
+    Regenerate the topology maps affected by a change in a background thread: the given maps, and those which may
+    depict the given devices (identified by pk or name) or the devices of the given interfaces. Multiple calls made
+    before the thread begins rendering are coalesced into a single regeneration.
+    """
+    with _render_lock:
+        _render_pending['map_pks'].update(map_pks)
+        _render_pending['device_pks'].update(device_pks)
+        _render_pending['device_names'].update(name for name in device_names if name)
+        _render_pending['interface_pks'].update(interface_pks)
+        if _render_pending['scheduled']:
+            return
+        _render_pending['scheduled'] = True
+    thread = threading.Thread(target=_render_worker, name='topology_map_renderer')
+    thread.daemon = True
+    thread.start()
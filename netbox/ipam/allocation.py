@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from extras.stats import invalidate_stats
+
+from .models import VLAN, VLANGroup
+
+
+# Range of valid VLAN IDs
+VLAN_VID_MIN = 1
+VLAN_VID_MAX = 4094
+
+# Placeholder for the VLAN ID in the name given to allocated VLANs
+VID_PLACEHOLDER = '{vid}'
+
+
+class VLANBitmap(object):
+    """
+    A 4094-bit occupancy bitmap of the VLAN IDs in use within a VLANGroup: bit n is set if VLAN ID n + 1 is in use.
+    Free VLAN IDs are found with bitwise operations, one run of free IDs at a time.
+    """
+
+    def __init__(self, vids=()):
+        self.bits = 0
+        for vid in vids:
+            self.bits |= 1 << (vid - VLAN_VID_MIN)
+
+    @classmethod
+    def for_group(cls, group):
+        """
+        Return the bitmap of a VLANGroup, computed with a single query.
+        """
+        return cls(VLAN.objects.filter(group=group).order_by().values_list('vid', flat=True))
+
+    def __contains__(self, vid):
+        return bool(self.bits >> (vid - VLAN_VID_MIN) & 1)
+
+    def get_free_ranges(self, start=VLAN_VID_MIN, end=VLAN_VID_MAX):
+        """
+        Return a list of (first, last) tuples for each range of free VLAN IDs between `start` and `end` (inclusive).
+        """
+        start = max(start, VLAN_VID_MIN)
+        end = min(end, VLAN_VID_MAX)
+        if start > end:
+            return []
+
+        # Bits for the free VLAN IDs within the requested range
+        free = ~self.bits & ((1 << (end - VLAN_VID_MIN + 1)) - 1) & ~((1 << (start - VLAN_VID_MIN)) - 1)
+
+        ranges = []
+        while free:
+            # Position of the lowest free bit, and the length of the run of free bits beginning there
+            offset = (free & -free).bit_length() - 1
+            run = free >> offset
+            length = (run ^ (run + 1)).bit_length() - 1
+            ranges.append((offset + VLAN_VID_MIN, offset + VLAN_VID_MIN + length - 1))
+            free &= ~(((1 << length) - 1) << offset)
+
+        return ranges
+
+    def get_free_vids(self, count, start=VLAN_VID_MIN, end=VLAN_VID_MAX):
+        """
+        Return a list of (up to) the first `count` free VLAN IDs between `start` and `end` (inclusive).
+        """
+        vids = []
+        for first, last in self.get_free_ranges(start, end):
+            vids.extend(range(first, min(last, first + count - len(vids) - 1) + 1))
+            if len(vids) >= count:
+                break
+        return vids
+
+
+def allocate_vlans(group, count, name, start=VLAN_VID_MIN, end=VLAN_VID_MAX, **attrs):
+    """
+    Create VLANs within the given VLANGroup for the first `count` free VLAN IDs between `start` and `end`, all having
+    the same attributes. Each VLAN is named by replacing `{vid}` in the given name with its VLAN ID. The group's row is
+    locked for the duration of the transaction, so that concurrent allocations within the same group cannot claim the
+    same VLAN IDs. Raises a ValidationError if too few VLAN IDs are available. Returns the list of VLANs created.
+    """
+    if count > 1 and VID_PLACEHOLDER not in name:
+        raise ValidationError(u"The name must include {} when allocating more than one VLAN.".format(VID_PLACEHOLDER))
+
+    with transaction.atomic():
+        group = VLANGroup.objects.select_for_update().get(pk=group.pk)
+        existing = list(VLAN.objects.filter(group=group).order_by().values_list('vid', 'name'))
+
+        vids = VLANBitmap(vid for vid, vlan_name in existing).get_free_vids(count, start, end)
+        if len(vids) < count:
+            raise ValidationError(u"Only {} VLAN IDs are available between {} and {} in {} ({} requested).".format(
+                len(vids), start, end, group, count
+            ))
+
+        vlans = [
+            VLAN(site_id=group.site_id, group=group, vid=vid, name=name.replace(VID_PLACEHOLDER, str(vid)), **attrs)
+            for vid in vids
+        ]
+        for vlan in vlans:
+            # Related objects have already been validated
+            vlan.clean_fields(exclude=['site', 'group', 'tenant', 'role'])
+        names = set(vlan_name for vid, vlan_name in existing)
+        duplicates = [vlan.name for vlan in vlans if vlan.name in names]
+        if duplicates:
+            raise ValidationError(u"VLANs named {} already exist in {}.".format(', '.join(duplicates), group))
+
+        VLAN.objects.bulk_create(vlans)
+
+    # QuerySet.bulk_create() sends no signals, so invalidate any statistics affected by the change here.
+    if settings.STATS_SUMMARY:
+        invalidate_stats(VLAN)
+
+    return vlans
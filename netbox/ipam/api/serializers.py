@@ -1,9 +1,18 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models
 
 from dcim.api.serializers import DeviceNestedSerializer, InterfaceNestedSerializer, SiteNestedSerializer
 from extras.api.serializers import CustomFieldSerializer
+from ipam.allocation import VLAN_VID_MAX, VLAN_VID_MIN, allocate_vlans
+from ipam.bulk import clean_ips, create_ips, find_duplicate_ips
 from ipam.models import Aggregate, IPAddress, Prefix, RIR, Role, Service, VLAN, VLANGroup, VRF
+from ipam.utilization import annotate_prefix_utilization
 from tenancy.api.serializers import TenantNestedSerializer
+from utilities.api import BULK_MAX_OBJECTS, WritableSerializer
+from utilities.forms import expand_ipaddress_string
 
 
 #
@@ -125,21 +134,85 @@ class VLANNestedSerializer(VLANSerializer):
         fields = ['id', 'vid', 'name', 'display_name']
 
 
+class WritableVLANSerializer(WritableSerializer):
+
+    class Meta(WritableSerializer.Meta):
+        model = VLAN
+        fields = ['id', 'site', 'group', 'vid', 'name', 'tenant', 'status', 'role', 'description']
+
+
+class VLANRangeSerializer(serializers.Serializer):
+    """
+    A range of VLAN IDs (by default, all valid VLAN IDs).
+    """
+    start = serializers.IntegerField(min_value=VLAN_VID_MIN, max_value=VLAN_VID_MAX, default=VLAN_VID_MIN)
+    end = serializers.IntegerField(min_value=VLAN_VID_MIN, max_value=VLAN_VID_MAX, default=VLAN_VID_MAX)
+
+    def validate(self, attrs):
+        if attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("The start of the range must not exceed its end.")
+        return attrs
+
+
+class VLANAllocationSerializer(WritableSerializer):
+    """
+    Allocates the next available VLAN IDs (optionally within a range) in a VLAN group, creating a VLAN for each.
+    """
+    count = serializers.IntegerField(min_value=1, max_value=VLAN_VID_MAX, default=1,
+                                     help_text="Number of VLANs to allocate")
+    start = serializers.IntegerField(min_value=VLAN_VID_MIN, max_value=VLAN_VID_MAX, default=VLAN_VID_MIN)
+    end = serializers.IntegerField(min_value=VLAN_VID_MIN, max_value=VLAN_VID_MAX, default=VLAN_VID_MAX)
+    name = serializers.CharField(default='VLAN {vid}', help_text="Name of each VLAN, in which {vid} is replaced by "
+                                                                 "its VLAN ID")
+
+    class Meta(WritableSerializer.Meta):
+        model = VLAN
+        fields = ['count', 'start', 'end', 'name', 'tenant', 'status', 'role', 'description']
+
+    def create(self, validated_data):
+        try:
+            return allocate_vlans(self.context['group'], **validated_data)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({api_settings.NON_FIELD_ERRORS_KEY: e.messages})
+
+
 #
 # Prefixes
 #
 
+class PrefixListSerializer(serializers.ListSerializer):
+    """
+    Lists the utilization of prefixes only if requested (`?utilization=1`), since the list is not paginated. The
+    utilization of all listed prefixes is then annotated with a single query (see annotate_prefix_utilization()).
+    """
+
+    def to_representation(self, data):
+        request = self.context.get('request')
+        if request is not None and not request.query_params.get('utilization'):
+            self.child.fields.pop('utilization', None)
+        elif 'utilization' in self.child.fields:
+            data = annotate_prefix_utilization(data.all() if isinstance(data, models.Manager) else data)
+        return super(PrefixListSerializer, self).to_representation(data)
+
+
 class PrefixSerializer(CustomFieldSerializer, serializers.ModelSerializer):
     site = SiteNestedSerializer()
     vrf = VRFTenantSerializer()
     tenant = TenantNestedSerializer()
     vlan = VLANNestedSerializer()
     role = RoleNestedSerializer()
+    utilization = serializers.SerializerMethodField()
 
     class Meta:
         model = Prefix
-        fields = ['id', 'family', 'prefix', 'site', 'vrf', 'tenant', 'vlan', 'status', 'role', 'is_pool', 'description',
-                  'custom_fields']
+        fields = ['id', 'family', 'prefix', 'site', 'vrf', 'tenant', 'vlan', 'status', 'role', 'is_pool', 'utilization',
+                  'description', 'custom_fields']
+        list_serializer_class = PrefixListSerializer
+
+    def get_utilization(self, obj):
+        if not hasattr(obj, 'utilization'):
+            annotate_prefix_utilization([obj])
+        return obj.utilization
 
 
 class PrefixNestedSerializer(PrefixSerializer):
@@ -148,6 +221,19 @@ class PrefixNestedSerializer(PrefixSerializer):
         fields = ['id', 'family', 'prefix']
 
 
+class WritablePrefixSerializer(WritableSerializer):
+    prepared_fields = ('family',)
+
+    class Meta(WritableSerializer.Meta):
+        model = Prefix
+        fields = ['id', 'prefix', 'site', 'vrf', 'tenant', 'vlan', 'status', 'role', 'is_pool', 'description']
+
+    def prepare_object(self, prefix):
+        # Performed by Prefix.save()
+        prefix.prefix = prefix.prefix.cidr
+        prefix.family = prefix.prefix.version
+
+
 #
 # IP addresses
 #
@@ -172,6 +258,55 @@ IPAddressSerializer._declared_fields['nat_inside'] = IPAddressNestedSerializer()
 IPAddressSerializer._declared_fields['nat_outside'] = IPAddressNestedSerializer()
 
 
+class WritableIPAddressSerializer(WritableSerializer):
+    prepared_fields = ('family',)
+
+    class Meta(WritableSerializer.Meta):
+        model = IPAddress
+        fields = ['id', 'address', 'vrf', 'tenant', 'status', 'interface', 'nat_inside', 'description']
+
+    def prepare_object(self, ip):
+        # Performed by IPAddress.save()
+        ip.family = ip.address.version
+
+    def clean_object(self, ip):
+        # IPAddress.clean() enforces unique IP space, which is validated for the whole batch by validate_batch().
+        pass
+
+    def validate_batch(self, ips):
+        # Enforce unique IP space with a single query for the entire batch
+        return {i: {'address': [message]} for i, message in find_duplicate_ips(ips).items()}
+
+
+class IPAddressBulkAddSerializer(WritableSerializer):
+    """
+    Creates IPAddresses from an address pattern (e.g. `192.0.2.[1-254]/24`), all having the same attributes.
+    """
+    address = serializers.CharField(help_text="IPv4 or IPv6 address (with mask), optionally including a numeric "
+                                              "range. Example: 192.0.2.[1-254]/24")
+
+    class Meta(WritableSerializer.Meta):
+        model = IPAddress
+        fields = ['address', 'vrf', 'tenant', 'status', 'description']
+
+    def validate(self, attrs):
+        attrs = dict(attrs)
+        addresses = expand_ipaddress_string(attrs.pop('address'), limit=BULK_MAX_OBJECTS + 1)
+        if len(addresses) > BULK_MAX_OBJECTS:
+            raise serializers.ValidationError({
+                'address': ["No more than {} IP addresses may be created at once.".format(BULK_MAX_OBJECTS)]
+            })
+        self.ips = [IPAddress(address=address, **attrs) for address in addresses]
+        try:
+            clean_ips(self.ips)
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'address': e.messages})
+        return attrs
+
+    def create(self, validated_data):
+        return create_ips(self.ips)
+
+
 #
 # Services
 #
@@ -27,11 +27,15 @@ urlpatterns = [
 
     # IP addresses
     url(r'^ip-addresses/$', IPAddressListView.as_view(), name='ipaddress_list'),
+    url(r'^ip-addresses/bulk-add/$', IPAddressBulkAddView.as_view(), name='ipaddress_bulk_add'),
+    url(r'^ip-addresses/typeahead/$', IPAddressTypeaheadView.as_view(), name='ipaddress_typeahead'),
     url(r'^ip-addresses/(?P<pk>\d+)/$', IPAddressDetailView.as_view(), name='ipaddress_detail'),
 
     # VLAN groups
     url(r'^vlan-groups/$', VLANGroupListView.as_view(), name='vlangroup_list'),
     url(r'^vlan-groups/(?P<pk>\d+)/$', VLANGroupDetailView.as_view(), name='vlangroup_detail'),
+    url(r'^vlan-groups/(?P<pk>\d+)/available-vlans/$', VLANGroupAvailableVLANsView.as_view(),
+        name='vlangroup_available_vlans'),
 
     # VLANs
     url(r'^vlans/$', VLANListView.as_view(), name='vlan_list'),
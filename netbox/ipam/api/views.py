@@ -1,9 +1,15 @@
-from rest_framework import generics
+from rest_framework import generics, status
+from rest_framework.permissions import DjangoModelPermissions, DjangoModelPermissionsOrAnonReadOnly
+from rest_framework.response import Response
 
+from django.shortcuts import get_object_or_404
+
+from ipam.allocation import VLANBitmap
 from ipam.models import Aggregate, IPAddress, Prefix, RIR, Role, Service, VLAN, VLANGroup, VRF
 from ipam import filters
 
 from extras.api.views import CustomFieldModelAPIView
+from utilities.api import BulkWriteMixin, TypeaheadView
 from . import serializers
 
 
@@ -93,13 +99,14 @@ class AggregateDetailView(CustomFieldModelAPIView, generics.RetrieveAPIView):
 # Prefixes
 #
 
-class PrefixListView(CustomFieldModelAPIView, generics.ListAPIView):
+class PrefixListView(BulkWriteMixin, CustomFieldModelAPIView, generics.ListAPIView):
     """
-    List prefixes (filterable)
+    List prefixes (filterable), or create, update, or delete prefixes in bulk
     """
     queryset = Prefix.objects.select_related('site', 'vrf__tenant', 'tenant', 'vlan', 'role')\
         .prefetch_related('custom_field_values__field')
     serializer_class = serializers.PrefixSerializer
+    write_serializer_class = serializers.WritablePrefixSerializer
     filter_class = filters.PrefixFilter
 
 
@@ -116,16 +123,49 @@ class PrefixDetailView(CustomFieldModelAPIView, generics.RetrieveAPIView):
 # IP addresses
 #
 
-class IPAddressListView(CustomFieldModelAPIView, generics.ListAPIView):
+class IPAddressListView(BulkWriteMixin, CustomFieldModelAPIView, generics.ListAPIView):
     """
-    List IP addresses (filterable)
+    List IP addresses (filterable), or create, update, or delete IP addresses in bulk
     """
     queryset = IPAddress.objects.select_related('vrf__tenant', 'tenant', 'interface__device', 'nat_inside')\
         .prefetch_related('nat_outside', 'custom_field_values__field')
     serializer_class = serializers.IPAddressSerializer
+    write_serializer_class = serializers.WritableIPAddressSerializer
     filter_class = filters.IPAddressFilter
 
 
+class IPAddressBulkAddView(generics.GenericAPIView):
+    """
+    Create IP addresses in bulk from an address pattern (e.g. `192.0.2.[1-254]/24`)
+    """
+    queryset = IPAddress.objects.all()
+    serializer_class = serializers.IPAddressBulkAddSerializer
+
+    def get_permissions(self):
+        return super(IPAddressBulkAddView, self).get_permissions() + [DjangoModelPermissions()]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ips = serializer.save()
+        return Response({'count': len(ips)}, status=status.HTTP_201_CREATED)
+
+
+class IPAddressTypeaheadView(TypeaheadView):
+    """
+    List the ID and address of IP addresses beginning with a query (filterable)
+    """
+    queryset = IPAddress.objects.all()
+    filter_class = filters.IPAddressFilter
+    lookup = 'address__net_host_startswith'
+    ordering = ('family', 'address')
+    fields = ('id', 'address')
+
+    def clean_query(self, query):
+        # IPv6 addresses are rendered in lowercase by PostgreSQL
+        return query.lower()
+
+
 class IPAddressDetailView(CustomFieldModelAPIView, generics.RetrieveAPIView):
     """
     Retrieve a single IP address
@@ -156,17 +196,51 @@ class VLANGroupDetailView(generics.RetrieveAPIView):
     serializer_class = serializers.VLANGroupSerializer
 
 
+class VLANGroupAvailableVLANsView(generics.GenericAPIView):
+    """
+    List the ranges of available VLAN IDs (optionally between `start` and `end`) within a VLAN group, or allocate the
+    next available VLAN IDs
+    """
+    # Allocation requires permission to add VLANs
+    queryset = VLAN.objects.all()
+    serializer_class = serializers.VLANAllocationSerializer
+
+    def get_permissions(self):
+        return super(VLANGroupAvailableVLANsView, self).get_permissions() + [DjangoModelPermissionsOrAnonReadOnly()]
+
+    def get(self, request, pk):
+        group = get_object_or_404(VLANGroup, pk=pk)
+        vid_range = serializers.VLANRangeSerializer(data=request.query_params)
+        vid_range.is_valid(raise_exception=True)
+        ranges = VLANBitmap.for_group(group).get_free_ranges(vid_range.validated_data['start'],
+                                                             vid_range.validated_data['end'])
+        return Response([{'start': first, 'end': last, 'count': last - first + 1} for first, last in ranges])
+
+    def get_serializer_context(self):
+        context = super(VLANGroupAvailableVLANsView, self).get_serializer_context()
+        context['group'] = getattr(self, 'group', None)
+        return context
+
+    def post(self, request, pk):
+        self.group = get_object_or_404(VLANGroup.objects.select_related('site'), pk=pk)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        vlans = serializer.save()
+        return Response(serializers.VLANNestedSerializer(vlans, many=True).data, status=status.HTTP_201_CREATED)
+
+
 #
 # VLANs
 #
 
-class VLANListView(CustomFieldModelAPIView, generics.ListAPIView):
+class VLANListView(BulkWriteMixin, CustomFieldModelAPIView, generics.ListAPIView):
     """
-    List VLANs (filterable)
+    List VLANs (filterable), or create, update, or delete VLANs in bulk
     """
     queryset = VLAN.objects.select_related('site', 'group', 'tenant', 'role')\
         .prefetch_related('custom_field_values__field')
     serializer_class = serializers.VLANSerializer
+    write_serializer_class = serializers.WritableVLANSerializer
     filter_class = filters.VLANFilter
 
 
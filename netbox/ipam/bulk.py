@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+import netaddr
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+
+from extras.stats import invalidate_stats
+
+from .models import IPAddress
+
+
+# Number of IPAddresses inserted by each query
+CHUNK_SIZE = 500
+
+# Existing IPs are retrieved from the smallest set of networks covering a batch, unless more than this number of
+# networks would be needed, in which case they are retrieved from the single network spanning each address family.
+MAX_COVERING_NETWORKS = 100
+
+# Maximum number of invalid IPs reported for a batch
+MAX_ERRORS = 10
+
+
+def get_covering_networks(hosts):
+    """
+    Return a list of networks which together contain all of the given host addresses.
+    """
+    networks = netaddr.cidr_merge(hosts)
+    if len(networks) > MAX_COVERING_NETWORKS:
+        networks = []
+        for family in (4, 6):
+            family_hosts = [host for host in hosts if host.version == family]
+            if family_hosts:
+                networks.append(netaddr.spanning_cidr(family_hosts))
+    return networks
+
+
+def find_duplicate_ips(ips):
+    """
+    Enforce unique IP space (as IPAddress.clean() does for a single IP) for a batch of new or modified IPAddresses.
+    Existing IPs within the networks covering the batch are retrieved with a single query, and duplicates within the
+    batch are detected in memory. Returns a dictionary mapping the index of each duplicate IPAddress to an error
+    message.
+    """
+    hosts = OrderedDict()
+    for i, ip in enumerate(ips):
+        if ip.vrf.enforce_unique if ip.vrf else settings.ENFORCE_GLOBAL_UNIQUE:
+            hosts.setdefault((ip.vrf_id, ip.address.ip), []).append(i)
+    if not hosts:
+        return {}
+
+    vrfs = set(vrf_id for vrf_id, host in hosts)
+    vrf_query = Q(vrf__in=[vrf_id for vrf_id in vrfs if vrf_id is not None])
+    if None in vrfs:
+        vrf_query |= Q(vrf__isnull=True)
+    networks = get_covering_networks([host for vrf_id, host in hosts])
+    existing_ips = IPAddress.objects.filter(vrf_query).extra(
+        where=['INET(HOST(ipam_ipaddress.address)) <<= ANY(%s::inet[])'], params=[[str(n) for n in networks]]
+    ).exclude(pk__in=[ip.pk for ip in ips if ip.pk]).order_by().values_list('vrf', 'address')
+    existing = {}
+    for vrf_id, address in existing_ips:
+        existing.setdefault((vrf_id, address.ip), address)
+
+    errors = {}
+    for key, indices in hosts.items():
+        if key in existing:
+            duplicate, conflicting = existing[key], indices
+        elif len(indices) > 1:
+            duplicate, conflicting = ips[indices[0]].address, indices[1:]
+        else:
+            continue
+        for i in conflicting:
+            if ips[i].vrf:
+                errors[i] = "Duplicate IP address found in VRF {}: {}".format(ips[i].vrf, duplicate)
+            else:
+                errors[i] = "Duplicate IP address found in global table: {}".format(duplicate)
+
+    return errors
+
+
+def clean_ips(ips):
+    """
+    Validate the address of each in a batch of new IPAddresses, and enforce unique IP space for the batch as a whole.
+    Raises a ValidationError listing (up to MAX_ERRORS of) the invalid IPs.
+    """
+    address_field = IPAddress._meta.get_field('address')
+    errors = []
+    for ip in ips:
+        try:
+            ip.address = address_field.to_python(ip.address)
+        except ValidationError as e:
+            errors.append(u"{}: {}".format(ip.address, ' '.join(e.messages)))
+        except netaddr.AddrFormatError as e:
+            errors.append(u"{}: {}".format(ip.address, e))
+    if not errors:
+        duplicates = find_duplicate_ips(ips)
+        errors = [duplicates[i] for i in sorted(duplicates)]
+
+    if errors:
+        if len(errors) > MAX_ERRORS:
+            errors = errors[:MAX_ERRORS] + [u"({} more IPs are invalid.)".format(len(errors) - MAX_ERRORS)]
+        raise ValidationError(errors)
+
+
+def create_ips(ips, chunk_size=CHUNK_SIZE):
+    """
+    Save a batch of new (validated) IPAddresses with one INSERT per chunk of `chunk_size`, within a single transaction.
+    Returns the list of IPAddresses.
+    """
+    for ip in ips:
+        # Performed by IPAddress.save()
+        ip.family = ip.address.version
+    with transaction.atomic():
+        for i in range(0, len(ips), chunk_size):
+            IPAddress.objects.bulk_create(ips[i:i + chunk_size])
+
+    # QuerySet.bulk_create() sends no signals, so invalidate any statistics affected by the change here.
+    if settings.STATS_SUMMARY and ips:
+        invalidate_stats(IPAddress)
+
+    return ips
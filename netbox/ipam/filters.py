@@ -10,6 +10,7 @@ from tenancy.models import Tenant
 from utilities.filters import NullableModelMultipleChoiceFilter
 
 from .models import Aggregate, IPAddress, Prefix, RIR, Role, Service, VLAN, VLANGroup, VRF
+from .utilization import filter_prefixes_by_utilization
 
 
 class VRFFilter(CustomFieldFilterSet, django_filters.FilterSet):
@@ -146,6 +147,14 @@ class PrefixFilter(CustomFieldFilterSet, django_filters.FilterSet):
         to_field_name='slug',
         label='Role (slug)',
     )
+    utilization__gte = django_filters.MethodFilter(
+        action='_utilization_gte',
+        label='Minimum utilization (%)',
+    )
+    utilization__lte = django_filters.MethodFilter(
+        action='_utilization_lte',
+        label='Maximum utilization (%)',
+    )
 
     class Meta:
         model = Prefix
@@ -170,6 +179,18 @@ class PrefixFilter(CustomFieldFilterSet, django_filters.FilterSet):
         except AddrFormatError:
             return queryset.none()
 
+    def _utilization_gte(self, queryset, value):
+        try:
+            return filter_prefixes_by_utilization(queryset, minimum=int(value))
+        except ValueError:
+            return queryset.none()
+
+    def _utilization_lte(self, queryset, value):
+        try:
+            return filter_prefixes_by_utilization(queryset, maximum=int(value))
+        except ValueError:
+            return queryset.none()
+
     def _tenant(self, queryset, value):
         if str(value) == '':
             return queryset
@@ -278,18 +278,18 @@ class IPAddressForm(BootstrapMixin, CustomFieldForm):
     nat_site = forms.ModelChoiceField(queryset=Site.objects.all(), required=False, label='Site',
                                       widget=forms.Select(attrs={'filter-for': 'nat_device'}))
     nat_device = forms.ModelChoiceField(queryset=Device.objects.all(), required=False, label='Device',
-                                        widget=APISelect(api_url='/api/dcim/devices/?site_id={{nat_site}}',
+                                        widget=APISelect(api_url='/api/dcim/devices/typeahead/?site_id={{nat_site}}',
                                                          display_field='display_name',
                                                          attrs={'filter-for': 'nat_inside'}))
     livesearch = forms.CharField(required=False, label='IP Address', widget=Livesearch(
-        query_key='q', query_url='ipam-api:ipaddress_list', field_to_update='nat_inside', obj_label='address')
+        query_key='q', query_url='ipam-api:ipaddress_typeahead', field_to_update='nat_inside', obj_label='address')
     )
 
     class Meta:
         model = IPAddress
         fields = ['address', 'vrf', 'tenant', 'status', 'nat_inside', 'description']
         widgets = {
-            'nat_inside': APISelect(api_url='/api/ipam/ip-addresses/?device_id={{nat_device}}', display_field='address')
+            'nat_inside': APISelect(api_url='/api/ipam/ip-addresses/typeahead/?device_id={{nat_device}}', display_field='address')
         }
 
     def __init__(self, *args, **kwargs):
@@ -346,9 +346,9 @@ class IPAddressAssignForm(BootstrapMixin, forms.Form):
     rack = forms.ModelChoiceField(queryset=Rack.objects.all(), label='Rack', required=False,
                                   widget=APISelect(api_url='/api/dcim/racks/?site_id={{site}}', display_field='display_name', attrs={'filter-for': 'device'}))
     device = forms.ModelChoiceField(queryset=Device.objects.all(), label='Device', required=False,
-                                    widget=APISelect(api_url='/api/dcim/devices/?rack_id={{rack}}', display_field='display_name', attrs={'filter-for': 'interface'}))
+                                    widget=APISelect(api_url='/api/dcim/devices/typeahead/?rack_id={{rack}}', display_field='display_name', attrs={'filter-for': 'interface'}))
     livesearch = forms.CharField(required=False, label='Device', widget=Livesearch(
-        query_key='q', query_url='dcim-api:device_list', field_to_update='device')
+        query_key='q', query_url='dcim-api:device_typeahead', field_to_update='device')
     )
     interface = forms.ModelChoiceField(queryset=Interface.objects.all(), label='Interface',
                                        widget=APISelect(api_url='/api/dcim/devices/{{device}}/interfaces/'))
@@ -557,8 +557,8 @@ def vlan_status_choices():
 class VLANFilterForm(BootstrapMixin, CustomFieldFilterForm):
     model = VLAN
     site = FilterChoiceField(queryset=Site.objects.annotate(filter_count=Count('vlans')), to_field_name='slug')
-    group_id = FilterChoiceField(queryset=VLANGroup.objects.annotate(filter_count=Count('vlans')), label='VLAN group',
-                                 null_option=(0, 'None'))
+    group_id = FilterChoiceField(queryset=VLANGroup.objects.select_related('site')
+                                 .annotate(filter_count=Count('vlans')), label='VLAN group', null_option=(0, 'None'))
     tenant = FilterChoiceField(queryset=Tenant.objects.annotate(filter_count=Count('vlans')), to_field_name='slug',
                                null_option=(0, 'None'))
     status = forms.MultipleChoiceField(choices=vlan_status_choices, required=False)
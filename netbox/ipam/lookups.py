@@ -87,3 +87,15 @@ class NetHost(Lookup):
             rhs_params[0] = rhs_params[0].split('/')[0]
         params = lhs_params + rhs_params
         return 'HOST(%s) = %s' % (lhs, rhs), params
+
+
+class NetHostStartsWith(Lookup):
+    lookup_name = 'net_host_startswith'
+    # The query is matched as text, so it must not be converted to an IPNetwork (which a partial address may not be).
+    prepare_rhs = False
+
+    def as_sql(self, qn, connection):
+        lhs, lhs_params = self.process_lhs(qn, connection)
+        rhs, rhs_params = self.process_rhs(qn, connection)
+        params = lhs_params + [u'{}%'.format(connection.ops.prep_for_like_query(p)) for p in rhs_params]
+        return 'HOST(%s) LIKE %s' % (lhs, rhs), params
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from utilities.sql import create_trigram_indexes
+
+
+TRIGRAM_INDEXES = (
+    ('ipam_vrf', 'name'),
+    ('ipam_vrf', 'rd'),
+    ('ipam_vrf', 'description'),
+    ('ipam_aggregate', 'description'),
+    ('ipam_prefix', 'description'),
+    ('ipam_ipaddress', 'description'),
+    ('ipam_vlan', 'name'),
+    ('ipam_vlan', 'description'),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0006_install_pg_trgm'),
+        ('ipam', '0013_prefix_add_is_pool'),
+    ]
+
+    operations = create_trigram_indexes(TRIGRAM_INDEXES)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0014_search_trigram_indexes'),
+    ]
+
+    operations = [
+        # Supports prefix matching of IP addresses (e.g. `address__startswith`)
+        migrations.RunSQL(
+            sql='CREATE INDEX ipam_ipaddress_address_text ON ipam_ipaddress (TEXT(address) text_pattern_ops)',
+            reverse_sql='DROP INDEX ipam_ipaddress_address_text',
+        ),
+    ]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0015_ipaddress_address_text_index'),
+    ]
+
+    operations = [
+        # Superseded by the index on HOST(address)
+        migrations.RunSQL(
+            sql='DROP INDEX ipam_ipaddress_address_text',
+            reverse_sql='CREATE INDEX ipam_ipaddress_address_text ON ipam_ipaddress (TEXT(address) text_pattern_ops)',
+        ),
+        # IP addresses are prefix matched on their host portion (`address__net_host_startswith`)
+        migrations.RunSQL(
+            sql='CREATE INDEX ipam_ipaddress_address_host ON ipam_ipaddress (HOST(address) text_pattern_ops)',
+            reverse_sql='DROP INDEX ipam_ipaddress_address_host',
+        ),
+    ]
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def create_host_index(apps, schema_editor):
+    # Supports finding the IP addresses within a prefix by host address (`INET(HOST(address)) <<= prefix`), as prefix
+    # utilization and the duplicate IP checks do. The inet_ops GiST operator class was added in PostgreSQL 9.4; on
+    # earlier versions the index is omitted and those queries scan the table instead.
+    if schema_editor.connection.pg_version >= 90400:
+        schema_editor.execute(
+            'CREATE INDEX ipam_ipaddress_host_inet ON ipam_ipaddress USING gist ((INET(HOST(address))) inet_ops)'
+        )
+
+
+def drop_host_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS ipam_ipaddress_host_inet')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipam', '0016_ipaddress_address_host_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_host_index, drop_host_index),
+    ]
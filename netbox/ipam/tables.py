@@ -1,9 +1,17 @@
 import django_tables2 as tables
-from django_tables2.utils import Accessor
+from django_tables2.rows import BoundRows
+from django_tables2.utils import Accessor, OrderBy
 
-from utilities.tables import BaseTable, ToggleColumn
+from django.utils import six
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+from utilities.tables import (
+    BaseTable, FormatColumn, FormatLinkColumn, PrecompiledURL, ToggleColumn, utilization_graph,
+)
 
 from .models import Aggregate, IPAddress, Prefix, RIR, Role, VLAN, VLANGroup, VRF
+from .utilization import annotate_prefix_utilization
 
 
 RIR_UTILIZATION = """
@@ -31,69 +39,18 @@ RIR_ACTIONS = """
 {% endif %}
 """
 
-UTILIZATION_GRAPH = """
-{% load helpers %}
-{% utilization_graph value %}
-"""
-
 ROLE_ACTIONS = """
 {% if perms.ipam.change_role %}
     <a href="{% url 'ipam:role_edit' slug=record.slug %}" class="btn btn-xs btn-warning"><i class="glyphicon glyphicon-pencil" aria-hidden="true"></i></a>
 {% endif %}
 """
 
-PREFIX_LINK = """
-{% if record.has_children %}
-    <span style="padding-left: {{ record.depth }}0px "><i class="fa fa-caret-right"></i></a>
-{% else %}
-    <span style="padding-left: {{ record.depth }}9px">
-{% endif %}
-    <a href="{% if record.pk %}{% url 'ipam:prefix' pk=record.pk %}{% else %}{% url 'ipam:prefix_add' %}?prefix={{ record }}{% if parent.vrf %}&vrf={{ parent.vrf.pk }}{% endif %}{% if parent.site %}&site={{ parent.site.pk }}{% endif %}{% endif %}">{{ record.prefix }}</a>
-</span>
-"""
-
 PREFIX_LINK_BRIEF = """
 <span style="padding-left: {{ record.depth }}0px">
     <a href="{% if record.pk %}{% url 'ipam:prefix' pk=record.pk %}{% else %}{% url 'ipam:prefix_add' %}?prefix={{ record }}{% if parent.vrf %}&vrf={{ parent.vrf.pk }}{% endif %}{% if parent.site %}&site={{ parent.site.pk }}{% endif %}{% endif %}">{{ record.prefix }}</a>
 </span>
 """
 
-PREFIX_ROLE_LINK = """
-{% if record.role %}
-    <a href="{% url 'ipam:prefix_list' %}?role={{ record.role.slug }}">{{ record.role }}</a>
-{% else %}
-    &mdash;
-{% endif %}
-"""
-
-IPADDRESS_LINK = """
-{% if record.pk %}
-    <a href="{{ record.get_absolute_url }}">{{ record.address }}</a>
-{% elif perms.ipam.add_ipaddress %}
-    <a href="{% url 'ipam:ipaddress_add' %}?address={{ record.1 }}{% if prefix.vrf %}&vrf={{ prefix.vrf.pk }}{% endif %}" class="btn btn-xs btn-success">{% if record.0 <= 65536 %}{{ record.0 }}{% else %}Lots of{% endif %} free IP{{ record.0|pluralize }}</a>
-{% else %}
-    {{ record.0 }}
-{% endif %}
-"""
-
-VRF_LINK = """
-{% if record.vrf %}
-    <a href="{{ record.vrf.get_absolute_url }}">{{ record.vrf }}</a>
-{% elif prefix.vrf %}
-    {{ prefix.vrf }}
-{% else %}
-    Global
-{% endif %}
-"""
-
-STATUS_LABEL = """
-{% if record.pk %}
-    <span class="label label-{{ record.get_status_class }}">{{ record.get_status_display }}</span>
-{% else %}
-    <span class="label label-success">Available</span>
-{% endif %}
-"""
-
 VLAN_PREFIXES = """
 {% for prefix in record.prefixes.all %}
     <a href="{% url 'ipam:prefix' pk=prefix.pk %}">{{ prefix }}</a>{% if not forloop.last %}<br />{% endif %}
@@ -111,20 +68,101 @@ VLAN_ROLE_LINK = """
 """
 
 VLANGROUP_ACTIONS = """
+<a href="{% url 'ipam:vlangroup_available_vlans' pk=record.pk %}" class="btn btn-xs btn-info" title="Available VLANs"><i class="fa fa-list" aria-hidden="true"></i></a>
 {% if perms.ipam.change_vlangroup %}
     <a href="{% url 'ipam:vlangroup_edit' pk=record.pk %}" class="btn btn-xs btn-warning"><i class="glyphicon glyphicon-pencil" aria-hidden="true"></i></a>
 {% endif %}
 """
 
-TENANT_LINK = """
-{% if record.tenant %}
-    <a href="{% url 'tenancy:tenant' slug=record.tenant.slug %}">{{ record.tenant }}</a>
-{% elif record.vrf.tenant %}
-    <a href="{% url 'tenancy:tenant' slug=record.vrf.tenant.slug %}">{{ record.vrf.tenant }}</a>*
-{% else %}
-    &mdash;
-{% endif %}
-"""
+
+#
+# Cell formatters
+#
+
+PREFIX_URL = PrecompiledURL('ipam:prefix')
+PREFIX_ADD_URL = PrecompiledURL('ipam:prefix_add')
+PREFIX_LIST_URL = PrecompiledURL('ipam:prefix_list')
+IPADDRESS_URL = PrecompiledURL('ipam:ipaddress')
+IPADDRESS_ADD_URL = PrecompiledURL('ipam:ipaddress_add')
+VRF_URL = PrecompiledURL('ipam:vrf')
+TENANT_URL = PrecompiledURL('tenancy:tenant')
+
+AVAILABLE_LABEL = mark_safe('<span class="label label-success">Available</span>')
+MDASH = mark_safe('&mdash;')
+
+
+def format_prefix_link(record, value, context):
+    if record.pk:
+        url = PREFIX_URL(record.pk)
+    else:
+        # Link available prefixes to the creation form, within the VRF and site of the parent prefix (if any)
+        url = u'{}?prefix={}'.format(PREFIX_ADD_URL(), record)
+        parent = context.get('parent')
+        if getattr(parent, 'vrf', None):
+            url += u'&vrf={}'.format(parent.vrf.pk)
+        if getattr(parent, 'site', None):
+            url += u'&site={}'.format(parent.site.pk)
+    if getattr(record, 'has_children', False):
+        return format_html(u'<span style="padding-left: {}0px"><i class="fa fa-caret-right"></i> '
+                           u'<a href="{}">{}</a></span>', getattr(record, 'depth', u''), url, record.prefix)
+    return format_html(u'<span style="padding-left: {}9px"><a href="{}">{}</a></span>',
+                       getattr(record, 'depth', u''), url, record.prefix)
+
+
+def format_ipaddress_link(record, value, context):
+    if getattr(record, 'pk', None):
+        return format_html(u'<a href="{}">{}</a>', IPADDRESS_URL(record.pk), record.address)
+    # An available range, given as a (size, first IP) tuple
+    count, first_ip = record[0], record[1]
+    perms = context.get('perms')
+    if perms is not None and 'ipam.add_ipaddress' in perms:
+        url = u'{}?address={}'.format(IPADDRESS_ADD_URL(), first_ip)
+        prefix = context.get('prefix')
+        if getattr(prefix, 'vrf', None):
+            url += u'&vrf={}'.format(prefix.vrf.pk)
+        return format_html(u'<a href="{}" class="btn btn-xs btn-success">{} free IP{}</a>', url,
+                           count if count <= 65536 else u'Lots of', u's' if count != 1 else u'')
+    return format_html(u'{}', count)
+
+
+def format_status_label(record, value, context):
+    if getattr(record, 'pk', None):
+        return format_html(u'<span class="label label-{}">{}</span>', record.get_status_class(),
+                           record.get_status_display())
+    return AVAILABLE_LABEL
+
+
+def format_vrf_link(record, value, context):
+    vrf = getattr(record, 'vrf', None)
+    if vrf:
+        return format_html(u'<a href="{}">{}</a>', VRF_URL(vrf.pk), vrf)
+    prefix = context.get('prefix')
+    if getattr(prefix, 'vrf', None):
+        return format_html(u'{}', prefix.vrf)
+    return u'Global'
+
+
+def format_tenant_link(record, value, context):
+    tenant = getattr(record, 'tenant', None)
+    if tenant:
+        return format_html(u'<a href="{}">{}</a>', TENANT_URL(tenant.slug), tenant)
+    vrf = getattr(record, 'vrf', None)
+    if vrf and vrf.tenant:
+        # Tenant inherited from the VRF
+        return format_html(u'<a href="{}">{}</a>*', TENANT_URL(vrf.tenant.slug), vrf.tenant)
+    return MDASH
+
+
+def format_prefix_role_link(record, value, context):
+    if record.role:
+        return format_html(u'<a href="{}?role={}">{}</a>', PREFIX_LIST_URL(), record.role.slug, record.role)
+    return MDASH
+
+
+def format_utilization(record, value, context):
+    if value is None:
+        return MDASH
+    return utilization_graph(value)
 
 
 #
@@ -180,13 +218,13 @@ class AggregateTable(BaseTable):
     prefix = tables.LinkColumn('ipam:aggregate', args=[Accessor('pk')], verbose_name='Aggregate')
     rir = tables.Column(verbose_name='RIR')
     child_count = tables.Column(verbose_name='Prefixes')
-    get_utilization = tables.TemplateColumn(UTILIZATION_GRAPH, orderable=False, verbose_name='Utilization')
+    utilization = FormatColumn(format_utilization, verbose_name='Utilization')
     date_added = tables.DateColumn(format="Y-m-d", verbose_name='Added')
     description = tables.Column(orderable=False, verbose_name='Description')
 
     class Meta(BaseTable.Meta):
         model = Aggregate
-        fields = ('pk', 'prefix', 'rir', 'child_count', 'get_utilization', 'date_added', 'description')
+        fields = ('pk', 'prefix', 'rir', 'child_count', 'utilization', 'date_added', 'description')
 
 
 #
@@ -212,28 +250,50 @@ class RoleTable(BaseTable):
 
 class PrefixTable(BaseTable):
     pk = ToggleColumn()
-    status = tables.TemplateColumn(STATUS_LABEL, verbose_name='Status')
-    prefix = tables.TemplateColumn(PREFIX_LINK, verbose_name='Prefix', attrs={'th': {'style': 'padding-left: 17px'}})
-    vrf = tables.TemplateColumn(VRF_LINK, verbose_name='VRF')
-    tenant = tables.TemplateColumn(TENANT_LINK, verbose_name='Tenant')
-    site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')], verbose_name='Site')
-    vlan = tables.LinkColumn('ipam:vlan', args=[Accessor('vlan.pk')], verbose_name='VLAN')
-    role = tables.TemplateColumn(PREFIX_ROLE_LINK, verbose_name='Role')
+    status = FormatColumn(format_status_label, verbose_name='Status')
+    prefix = FormatColumn(format_prefix_link, verbose_name='Prefix', attrs={'th': {'style': 'padding-left: 17px'}})
+    vrf = FormatColumn(format_vrf_link, verbose_name='VRF')
+    tenant = FormatColumn(format_tenant_link, verbose_name='Tenant')
+    site = FormatLinkColumn('dcim:site', 'site.slug', verbose_name='Site')
+    vlan = FormatLinkColumn('ipam:vlan', 'vlan.pk', verbose_name='VLAN')
+    role = FormatColumn(format_prefix_role_link, verbose_name='Role')
+    utilization = FormatColumn(format_utilization, verbose_name='Utilization')
     description = tables.Column(orderable=False, verbose_name='Description')
 
     class Meta(BaseTable.Meta):
         model = Prefix
-        fields = ('pk', 'prefix', 'status', 'vrf', 'tenant', 'site', 'vlan', 'role', 'description')
+        fields = ('pk', 'prefix', 'status', 'vrf', 'tenant', 'site', 'vlan', 'role', 'utilization', 'description')
         row_attrs = {
             'class': lambda record: 'success' if not record.pk else '',
         }
 
+    @property
+    def order_by(self):
+        return self._order_by
+
+    @order_by.setter
+    def order_by(self, value):
+        # Ordering by utilization requires the utilization of every listed prefix, which is computed with a single
+        # query and sorted in Python
+        aliases = value.split(',') if isinstance(value, six.string_types) else value or ()
+        if 'utilization' in [OrderBy(alias).bare for alias in aliases]:
+            self.data = self.TableDataClass(data=annotate_prefix_utilization(self.data.data), table=self)
+            self.rows = BoundRows(data=self.data, table=self)
+        BaseTable.order_by.fset(self, value)
+
+    def paginate(self, *args, **kwargs):
+        super(PrefixTable, self).paginate(*args, **kwargs)
+        # Otherwise, compute the utilization of only the prefixes displayed on this page (with a single query)
+        annotate_prefix_utilization(
+            row.record for row in self.page.object_list if not hasattr(row.record, 'utilization')
+        )
+
 
 class PrefixBriefTable(BaseTable):
     prefix = tables.TemplateColumn(PREFIX_LINK_BRIEF, verbose_name='Prefix')
     vrf = tables.LinkColumn('ipam:vrf', args=[Accessor('vrf.pk')], default='Global', verbose_name='VRF')
     site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')], verbose_name='Site')
-    status = tables.TemplateColumn(STATUS_LABEL, verbose_name='Status')
+    status = FormatColumn(format_status_label, verbose_name='Status')
     role = tables.Column(verbose_name='Role')
 
     class Meta(BaseTable.Meta):
@@ -248,12 +308,11 @@ class PrefixBriefTable(BaseTable):
 
 class IPAddressTable(BaseTable):
     pk = ToggleColumn()
-    address = tables.TemplateColumn(IPADDRESS_LINK, verbose_name='IP Address')
-    status = tables.TemplateColumn(STATUS_LABEL, verbose_name='Status')
-    vrf = tables.TemplateColumn(VRF_LINK, verbose_name='VRF')
-    tenant = tables.TemplateColumn(TENANT_LINK, verbose_name='Tenant')
-    device = tables.LinkColumn('dcim:device', args=[Accessor('interface.device.pk')], orderable=False,
-                               verbose_name='Device')
+    address = FormatColumn(format_ipaddress_link, verbose_name='IP Address')
+    status = FormatColumn(format_status_label, verbose_name='Status')
+    vrf = FormatColumn(format_vrf_link, verbose_name='VRF')
+    tenant = FormatColumn(format_tenant_link, verbose_name='Tenant')
+    device = FormatLinkColumn('dcim:device', 'interface.device.pk', orderable=False, verbose_name='Device')
     interface = tables.Column(orderable=False, verbose_name='Interface')
     description = tables.Column(orderable=False, verbose_name='Description')
 
@@ -308,7 +367,7 @@ class VLANTable(BaseTable):
     name = tables.Column(verbose_name='Name')
     prefixes = tables.TemplateColumn(VLAN_PREFIXES, orderable=False, verbose_name='Prefixes')
     tenant = tables.LinkColumn('tenancy:tenant', args=[Accessor('tenant.slug')], verbose_name='Tenant')
-    status = tables.TemplateColumn(STATUS_LABEL, verbose_name='Status')
+    status = FormatColumn(format_status_label, verbose_name='Status')
     role = tables.TemplateColumn(VLAN_ROLE_LINK, verbose_name='Role')
 
     class Meta(BaseTable.Meta):
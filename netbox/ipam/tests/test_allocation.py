@@ -0,0 +1,48 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from dcim.models import Site
+from ipam.allocation import VLAN_VID_MAX, VLANBitmap, allocate_vlans
+from ipam.models import VLAN, VLANGroup
+
+
+class VLANBitmapTestCase(TestCase):
+
+    def test_free_ranges(self):
+
+        bitmap = VLANBitmap([1, 2, 5, 100, 4094])
+
+        self.assertIn(5, bitmap)
+        self.assertNotIn(6, bitmap)
+        self.assertEqual(bitmap.get_free_ranges(), [(3, 4), (6, 99), (101, 4093)])
+        self.assertEqual(bitmap.get_free_ranges(4, 50), [(4, 4), (6, 50)])
+        self.assertEqual(bitmap.get_free_vids(4), [3, 4, 6, 7])
+
+    def test_full(self):
+
+        bitmap = VLANBitmap(range(1, VLAN_VID_MAX + 1))
+
+        self.assertEqual(bitmap.get_free_ranges(), [])
+
+
+class VLANAllocationTestCase(TestCase):
+
+    def setUp(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        self.group = VLANGroup.objects.create(name='VLAN Group 1', slug='vlan-group-1', site=site)
+        for vid in [100, 101, 103]:
+            VLAN.objects.create(site=site, group=self.group, vid=vid, name='VLAN {}'.format(vid))
+
+    def test_allocate(self):
+
+        vlans = allocate_vlans(self.group, 3, 'Customer {vid}', start=100, end=199)
+
+        self.assertEqual([v.vid for v in vlans], [102, 104, 105])
+        self.assertTrue(VLAN.objects.filter(group=self.group, vid=105, name='Customer 105').exists())
+
+    def test_exhausted(self):
+
+        with self.assertRaises(ValidationError):
+            allocate_vlans(self.group, 2, 'Customer {vid}', start=100, end=103)
+
+        self.assertEqual(VLAN.objects.filter(group=self.group).count(), 3)
@@ -0,0 +1,184 @@
+import json
+
+from netaddr import IPNetwork
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+
+from dcim.models import Site
+from ipam.models import IPAddress, Prefix, VLAN, VLANGroup
+from users.models import Token
+
+
+class IPAddressTypeaheadTest(APITestCase):
+
+    def setUp(self):
+        for address in ('10.1.0.1/24', '10.1.0.2/24', '10.10.0.1/16', '2001:db8::1/64', '2001:db8:1::1/64'):
+            IPAddress.objects.create(address=IPNetwork(address))
+        self.url = reverse('ipam-api:ipaddress_typeahead')
+
+    def get_addresses(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [ip['address'] for ip in json.loads(response.content)]
+
+    def test_partial_ipv4(self):
+        self.assertEqual(self.get_addresses(q='10.1.'), ['10.1.0.1/24', '10.1.0.2/24'])
+        self.assertEqual(self.get_addresses(q='10.1'), ['10.1.0.1/24', '10.1.0.2/24', '10.10.0.1/16'])
+
+    def test_exact_address(self):
+        self.assertEqual(self.get_addresses(q='10.1.0.2'), ['10.1.0.2/24'])
+
+    def test_partial_ipv6(self):
+        self.assertEqual(self.get_addresses(q='2001:DB8:'), ['2001:db8::1/64', '2001:db8:1::1/64'])
+        self.assertEqual(self.get_addresses(q='2001:db8::'), ['2001:db8::1/64'])
+
+    def test_wildcards(self):
+        self.assertEqual(self.get_addresses(q='10_1'), [])
+        self.assertEqual(self.get_addresses(q='%'), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.get_addresses(q='10.', limit=2)), 2)
+        self.assertEqual(len(self.get_addresses(q='10.', limit=-1)), 1)
+
+    def test_limit_without_query(self):
+        for i in range(1, 21):
+            IPAddress.objects.create(address=IPNetwork('192.0.2.{}/24'.format(i)))
+        self.assertEqual(len(self.get_addresses()), 20)
+        self.assertEqual(len(self.get_addresses(limit=3)), 3)
+
+
+class IPAddressBulkAddTest(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        self.url = reverse('ipam-api:ipaddress_bulk_add')
+
+    def test_create(self):
+        response = self.client.post(self.url, {'address': '192.0.2.[1-10]/24', 'status': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IPAddress.objects.count(), 10)
+
+    def test_invalid_address(self):
+        response = self.client.post(self.url, {'address': 'bogus', 'status': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('address', json.loads(response.content))
+
+    def test_too_many_addresses(self):
+        response = self.client.post(self.url, {'address': '10.0.[0-255].[0-255]/16', 'status': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IPAddress.objects.exists())
+
+
+class BulkUpdateFamilyTest(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+    def test_update_prefixes(self):
+        prefixes = [Prefix.objects.create(prefix=IPNetwork('10.41.{}.0/24'.format(i))) for i in range(2)]
+        data = [{'id': prefixes[0].pk, 'prefix': '2001:db8:41::/48'}, {'id': prefixes[1].pk, 'description': 'Foo'}]
+        response = self.client.patch(reverse('ipam-api:prefix_list'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(p.family, str(p.prefix)) for p in Prefix.objects.order_by('pk')],
+                         [(6, '2001:db8:41::/48'), (4, '10.41.1.0/24')])
+
+    def test_update_ipaddresses(self):
+        ip = IPAddress.objects.create(address=IPNetwork('10.41.0.1/24'))
+        response = self.client.patch(reverse('ipam-api:ipaddress_list'), [{'id': ip.pk, 'address': '2001:db8::41/64'}],
+                                     format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(IPAddress.objects.get(pk=ip.pk).family, 6)
+
+
+class BulkUpdateDuplicatesTest(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+    def test_duplicate_ids(self):
+        prefixes = [Prefix.objects.create(prefix=IPNetwork('10.42.{}.0/24'.format(i))) for i in range(2)]
+        data = [
+            {'id': prefixes[0].pk, 'description': 'Foo'},
+            {'id': prefixes[1].pk, 'description': 'Bar'},
+            {'id': prefixes[0].pk, 'description': 'Baz'},
+        ]
+        response = self.client.patch(reverse('ipam-api:prefix_list'), data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = json.loads(response.content)
+        self.assertEqual(errors[:2], [{}, {}])
+        self.assertIn('id', errors[2])
+        self.assertFalse(Prefix.objects.exclude(description='').exists())
+
+
+class PrefixUtilizationTest(APITestCase):
+
+    def setUp(self):
+        self.prefix = Prefix.objects.create(prefix=IPNetwork('10.43.0.0/30'))
+        Prefix.objects.create(prefix=IPNetwork('10.43.1.0/30'))
+        IPAddress.objects.create(address=IPNetwork('10.43.0.1/30'))
+        self.url = reverse('ipam-api:prefix_list')
+
+    def test_list(self):
+
+        # The utilization of listed prefixes is computed only if requested.
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('utilization', json.loads(response.content)[0])
+
+        response = self.client.get(self.url, {'utilization': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({p['prefix']: p['utilization'] for p in json.loads(response.content)},
+                         {'10.43.0.0/30': 50, '10.43.1.0/30': 0})
+
+    def test_detail(self):
+
+        response = self.client.get(reverse('ipam-api:prefix_detail', kwargs={'pk': self.prefix.pk}))
+        self.assertEqual(json.loads(response.content)['utilization'], 50)
+
+
+class VLANAllocationTest(APITestCase):
+
+    def setUp(self):
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        self.group = VLANGroup.objects.create(name='Group 1', slug='group-1', site=site)
+        VLAN.objects.create(site=site, group=self.group, vid=1, name='VLAN 1')
+        self.url = reverse('ipam-api:vlangroup_available_vlans', kwargs={'pk': self.group.pk})
+
+    def test_available(self):
+        response = self.client.get(self.url, {'end': 10})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), [{'start': 2, 'end': 10, 'count': 9}])
+
+    def test_allocate(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = self.client.post(self.url, {'count': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(sorted(VLAN.objects.filter(group=self.group).values_list('vid', flat=True)), [1, 2, 3])
+
+    def test_allocate_permissions(self):
+
+        # Anonymous users may not allocate VLANs.
+        response = self.client.post(self.url, {'count': 1}, format='json')
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+        # Nor may users without permission to add VLANs, nor read-only tokens.
+        user = User.objects.create_user('alice', password='alice')
+        self.client.force_authenticate(user)
+        response = self.client.post(self.url, {'count': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(None)
+        token = Token(user=User.objects.create_superuser('admin', 'admin@example.com', 'admin'), write_enabled=False)
+        key = token.set_key()
+        token.save()
+        self.client.credentials(HTTP_AUTHORIZATION='Token {}'.format(key))
+        response = self.client.post(self.url, {'count': 1}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.assertEqual(VLAN.objects.filter(group=self.group).count(), 1)
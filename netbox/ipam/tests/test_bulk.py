@@ -0,0 +1,56 @@
+from netaddr import IPNetwork
+
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+
+from ipam.bulk import clean_ips, create_ips, find_duplicate_ips
+from ipam.models import IPAddress, VRF
+
+
+class IPAddressBulkTestCase(TestCase):
+
+    def setUp(self):
+        self.vrf = VRF.objects.create(name='VRF 1', rd='65000:1', enforce_unique=True)
+        IPAddress.objects.create(address=IPNetwork('192.0.2.1/24'), vrf=self.vrf)
+        IPAddress.objects.create(address=IPNetwork('192.0.2.2/24'))
+
+    def test_duplicates(self):
+
+        ips = [
+            IPAddress(address=IPNetwork('192.0.2.1/25'), vrf=self.vrf),     # Duplicate in VRF
+            IPAddress(address=IPNetwork('192.0.2.2/24'), vrf=self.vrf),
+            IPAddress(address=IPNetwork('192.0.2.2/32'), vrf=self.vrf),     # Duplicate within batch
+            IPAddress(address=IPNetwork('192.0.2.1/24')),                   # Global table is not enforced
+        ]
+
+        with override_settings(ENFORCE_GLOBAL_UNIQUE=False), self.assertNumQueries(1):
+            errors = find_duplicate_ips(ips)
+
+        self.assertEqual(sorted(errors), [0, 2])
+
+    def test_create(self):
+
+        ips = [IPAddress(address='198.51.100.{}/24'.format(i), status=1) for i in range(1, 255)]
+        clean_ips(ips)
+        create_ips(ips, chunk_size=100)
+
+        queryset = IPAddress.objects.filter(family=4, address__net_contained_or_equal='198.51.100.0/24')
+        self.assertEqual(queryset.count(), 254)
+
+    @override_settings(ENFORCE_GLOBAL_UNIQUE=True)
+    def test_invalid(self):
+
+        ips = [IPAddress(address='192.0.2.2/24'), IPAddress(address='192.0.2.3/24')]
+
+        with self.assertRaises(ValidationError) as cm:
+            clean_ips(ips)
+
+        self.assertEqual(len(cm.exception.messages), 1)
+
+    def test_invalid_format(self):
+
+        with self.assertRaises(ValidationError) as cm:
+            clean_ips([IPAddress(address='bogus'), IPAddress(address='192.0.2.10/24')])
+
+        self.assertEqual(len(cm.exception.messages), 1)
+        self.assertTrue(cm.exception.messages[0].startswith('bogus: '))
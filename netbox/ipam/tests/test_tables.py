@@ -0,0 +1,55 @@
+from netaddr import IPNetwork
+
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory, TestCase
+from django_tables2 import RequestConfig
+
+from ipam.models import IPAddress, Prefix, PREFIX_STATUS_CONTAINER, VRF
+from ipam.tables import IPAddressTable, PrefixTable
+
+
+class PrefixTableTestCase(TestCase):
+
+    def test_render(self):
+
+        vrf = VRF(pk=1, name='<b>VRF 1</b>', rd='65000:1')
+        prefix = Prefix(pk=5, prefix=IPNetwork('10.1.0.0/16'), vrf=vrf)
+        prefix.utilization = 80
+        row = list(PrefixTable([prefix]).rows)[0]
+
+        prefix_link = u'<a href="{}">10.1.0.0/16</a>'.format(reverse('ipam:prefix', args=[5]))
+        self.assertEqual(row.get_cell('prefix'), u'<span style="padding-left: 9px">{}</span>'.format(prefix_link))
+        self.assertEqual(row.get_cell('vrf'), u'<a href="{}">&lt;b&gt;VRF 1&lt;/b&gt;</a>'.format(
+            reverse('ipam:vrf', args=[1])
+        ))
+        self.assertIn('progress-bar-warning', row.get_cell('utilization'))
+
+    def test_order_by_utilization(self):
+
+        Prefix.objects.create(prefix=IPNetwork('10.0.0.0/16'), status=PREFIX_STATUS_CONTAINER)
+        Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        Prefix.objects.create(prefix=IPNetwork('10.0.1.0/30'))
+        IPAddress.objects.create(address=IPNetwork('10.0.1.1/30'))
+
+        # Both querysets and lists (e.g. of prefixes annotated with their depth) may be ordered by utilization.
+        for data in (Prefix.objects.all(), list(Prefix.objects.all())):
+            table = PrefixTable(data)
+            with self.assertNumQueries(1 if isinstance(data, list) else 2):
+                RequestConfig(RequestFactory().get('/', {'sort': '-utilization'}), paginate={'per_page': 2})\
+                    .configure(table)
+                rows = [(str(row.record.prefix), row.record.utilization) for row in table.page.object_list]
+            self.assertEqual(rows, [('10.0.1.0/30', 50), ('10.0.0.0/16', 0)])
+
+
+class IPAddressTableTestCase(TestCase):
+
+    def test_render_available(self):
+
+        table = IPAddressTable([IPAddress(pk=1, address=IPNetwork('10.1.0.1/16')), (1, IPNetwork('10.1.0.2/16'))])
+        rows = list(table.rows)
+
+        self.assertEqual(rows[0].get_cell('address'), u'<a href="{}">10.1.0.1/16</a>'.format(
+            reverse('ipam:ipaddress', args=[1])
+        ))
+        self.assertEqual(rows[1].get_cell('address'), u'1')
+        self.assertEqual(rows[1].get_cell('vrf'), u'Global')
@@ -0,0 +1,63 @@
+from netaddr import IPNetwork
+
+from django.test import TestCase
+
+from ipam.models import Aggregate, IPAddress, Prefix, PREFIX_STATUS_CONTAINER, RIR
+from ipam.utilization import (
+    annotate_aggregate_utilization, filter_prefixes_by_utilization, get_covered_size, get_prefix_utilization,
+)
+
+
+class AggregateUtilizationTestCase(TestCase):
+
+    def setUp(self):
+        rir = RIR.objects.create(name='RIR 1', slug='rir-1')
+        for prefix in ['10.0.0.0/8', '192.0.2.0/24', '2001:db8::/32']:
+            Aggregate.objects.create(prefix=IPNetwork(prefix), rir=rir)
+        for prefix in ['10.0.0.0/16', '10.0.0.0/24', '10.1.0.0/16', '192.0.2.0/25', '172.16.0.0/12', '2001:db8::/33']:
+            Prefix.objects.create(prefix=IPNetwork(prefix))
+
+    def test_covered_size(self):
+
+        self.assertEqual(get_covered_size([(0, 9), (2, 5), (5, 14), (20, 29)]), 25)
+
+    def test_annotate(self):
+
+        with self.assertNumQueries(2):
+            aggregates = annotate_aggregate_utilization(Aggregate.objects.all())
+
+        stats = {str(a.prefix): (a.child_count, a.utilization) for a in aggregates}
+        self.assertEqual(stats, {
+            '10.0.0.0/8': (3, 0),
+            '192.0.2.0/24': (1, 50),
+            '2001:db8::/32': (1, 50),
+        })
+        for aggregate in aggregates:
+            self.assertEqual(aggregate.utilization, aggregate.get_utilization())
+
+
+class PrefixUtilizationTestCase(TestCase):
+
+    def setUp(self):
+        self.container = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/16'), status=PREFIX_STATUS_CONTAINER)
+        self.leaf = Prefix.objects.create(prefix=IPNetwork('10.0.0.0/24'))
+        self.pool = Prefix.objects.create(prefix=IPNetwork('10.0.128.0/30'), is_pool=True)
+        Prefix.objects.create(prefix=IPNetwork('10.0.0.0/17'))
+        Prefix.objects.create(prefix=IPNetwork('10.0.128.0/18'))
+        for i in range(1, 128):
+            IPAddress.objects.create(address=IPNetwork('10.0.0.{}/24'.format(i)))
+        for i in range(2):
+            IPAddress.objects.create(address=IPNetwork('10.0.128.{}/30'.format(i)))
+
+    def test_utilization(self):
+
+        with self.assertNumQueries(1):
+            utilization = get_prefix_utilization([self.container.pk, self.leaf.pk, self.pool.pk])
+
+        self.assertEqual(utilization, {self.container.pk: 75, self.leaf.pk: 50, self.pool.pk: 50})
+
+    def test_filter(self):
+
+        queryset = filter_prefixes_by_utilization(Prefix.objects.all(), minimum=50, maximum=60)
+
+        self.assertEqual(sorted(queryset.values_list('pk', flat=True)), sorted([self.leaf.pk, self.pool.pk]))
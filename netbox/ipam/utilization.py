@@ -0,0 +1,132 @@
+from bisect import bisect_right
+
+from netaddr import IPNetwork
+
+from django.db import connection
+
+from .models import Prefix, PREFIX_STATUS_CONTAINER
+
+
+# Computes the utilization of a set of Prefixes (given by PK) in a single query. For each container prefix, its child
+# prefixes (within its VRF, or within any VRF for a global container) are aggregated into a list. For each other
+# prefix, the distinct host addresses of the IP addresses within it (and its VRF) are counted. Prefixes having no
+# children are omitted.
+PREFIX_UTILIZATION_SQL = """
+SELECT p.id, TEXT(p.prefix), p.is_pool, COUNT(DISTINCT HOST(ip.address)), NULL
+FROM ipam_prefix p
+INNER JOIN ipam_ipaddress ip ON INET(HOST(ip.address)) <<= p.prefix AND ip.vrf_id IS NOT DISTINCT FROM p.vrf_id
+WHERE p.id = ANY(%(pk_list)s) AND p.status != %(container)s
+GROUP BY p.id
+UNION ALL
+SELECT p.id, TEXT(p.prefix), p.is_pool, NULL, ARRAY_AGG(DISTINCT TEXT(c.prefix))
+FROM ipam_prefix p
+INNER JOIN ipam_prefix c ON c.prefix << p.prefix AND (p.vrf_id IS NULL OR c.vrf_id = p.vrf_id)
+WHERE p.id = ANY(%(pk_list)s) AND p.status = %(container)s
+GROUP BY p.id
+"""
+
+
+def get_covered_size(ranges):
+    """
+    Return the number of addresses covered by a list of (first, last) integer ranges, sorted by their first address.
+    Overlapping ranges (e.g. nested prefixes) are counted only once.
+    """
+    size = 0
+    end = -1
+    for first, last in ranges:
+        if first > end:
+            size += last - first + 1
+            end = last
+        elif last > end:
+            size += last - end
+            end = last
+    return size
+
+
+def annotate_aggregate_utilization(aggregates):
+    """
+    Annotate each of the given Aggregates with the number of prefixes it contains (`child_count`) and the percentage of
+    its space which they cover (`utilization`), as Aggregate.get_utilization() would. All child prefixes are retrieved
+    with a single query, then attributed to their (non-overlapping) aggregates by a single sweep over integer address
+    ranges sorted by their first address. Returns the list of Aggregates.
+    """
+    aggregates = list(aggregates)
+    if not aggregates:
+        return aggregates
+
+    # Index the aggregates of each family by their first address
+    bounds = {4: ([], []), 6: ([], [])}
+    for aggregate in sorted(aggregates, key=lambda a: (a.prefix.version, a.prefix.first)):
+        firsts, family_aggregates = bounds[aggregate.prefix.version]
+        firsts.append(aggregate.prefix.first)
+        family_aggregates.append(aggregate)
+
+    prefixes = Prefix.objects.extra(
+        where=['ipam_prefix.prefix <<= ANY(%s::cidr[])'], params=[[str(a.prefix) for a in aggregates]]
+    ).order_by().values_list('prefix', flat=True)
+    ranges = sorted((p.version, p.first, p.last) for p in prefixes)
+
+    children = {}
+    for version, first, last in ranges:
+        firsts, family_aggregates = bounds[version]
+        i = bisect_right(firsts, first) - 1
+        if i >= 0 and last <= family_aggregates[i].prefix.last:
+            children.setdefault(family_aggregates[i].pk, []).append((first, last))
+
+    for aggregate in aggregates:
+        child_ranges = children.get(aggregate.pk, [])
+        aggregate.child_count = len(child_ranges)
+        aggregate.utilization = int(float(get_covered_size(child_ranges)) / aggregate.prefix.size * 100)
+
+    return aggregates
+
+
+def get_prefix_utilization(pk_list):
+    """
+    Return a dictionary mapping the PK of each of the given Prefixes to its utilization, as a percentage. The
+    utilization of a container prefix is the share of its space covered by child prefixes. The utilization of any other
+    prefix is the share of its usable addresses occupied by IP addresses; the network and broadcast addresses of a
+    non-pool IPv4 prefix (larger than a /31) are not considered usable. All Prefixes are evaluated with a single query.
+    """
+    pk_list = list(pk_list)
+    utilization = {pk: 0 for pk in pk_list}
+    if not pk_list:
+        return utilization
+
+    cursor = connection.cursor()
+    cursor.execute(PREFIX_UTILIZATION_SQL, {'pk_list': pk_list, 'container': PREFIX_STATUS_CONTAINER})
+    for pk, prefix, is_pool, ip_count, children in cursor.fetchall():
+        prefix = IPNetwork(prefix)
+        if children is not None:
+            ranges = sorted((child.first, child.last) for child in map(IPNetwork, children))
+            utilization[pk] = int(float(get_covered_size(ranges)) / prefix.size * 100)
+        else:
+            size = prefix.size
+            if prefix.version == 4 and prefix.prefixlen < 31 and not is_pool:
+                size -= 2
+            utilization[pk] = min(int(float(ip_count) / size * 100), 100)
+
+    return utilization
+
+
+def annotate_prefix_utilization(prefixes):
+    """
+    Annotate each of the given Prefixes with its utilization (see get_prefix_utilization()). Prefixes which have not
+    been saved (e.g. available prefixes) are annotated with None. Returns the list of Prefixes.
+    """
+    prefixes = list(prefixes)
+    utilization = get_prefix_utilization(p.pk for p in prefixes if p.pk)
+    for prefix in prefixes:
+        prefix.utilization = utilization.get(prefix.pk)
+    return prefixes
+
+
+def filter_prefixes_by_utilization(queryset, minimum=None, maximum=None):
+    """
+    Filter a queryset of Prefixes by utilization (inclusive of the given minimum and/or maximum percentage).
+    """
+    utilization = get_prefix_utilization(queryset.order_by().values_list('pk', flat=True))
+    return queryset.filter(pk__in=[
+        pk for pk, value in utilization.items()
+        if (minimum is None or value >= minimum) and (maximum is None or value <= maximum)
+    ])
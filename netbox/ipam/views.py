@@ -16,10 +16,13 @@ from utilities.views import (
 )
 
 from . import filters, forms, tables
+from .allocation import VLANBitmap
+from .bulk import clean_ips, create_ips
 from .models import (
     Aggregate, IPAddress, PREFIX_STATUS_ACTIVE, PREFIX_STATUS_DEPRECATED, PREFIX_STATUS_RESERVED, Prefix, RIR, Role,
     Service, VLAN, VLANGroup, VRF,
 )
+from .utilization import annotate_aggregate_utilization
 
 
 def add_available_prefixes(parent, prefix_list):
@@ -136,6 +139,7 @@ class VRFBulkImportView(PermissionRequiredMixin, BulkImportView):
 class VRFBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'ipam.change_vrf'
     cls = VRF
+    filter = filters.VRFFilter
     form = forms.VRFBulkEditForm
     template_name = 'ipam/vrf_bulk_edit.html'
     default_redirect_url = 'ipam:vrf_list'
@@ -144,6 +148,7 @@ class VRFBulkEditView(PermissionRequiredMixin, BulkEditView):
 class VRFBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'ipam.delete_vrf'
     cls = VRF
+    filter = filters.VRFFilter
     default_redirect_url = 'ipam:vrf_list'
 
 
@@ -255,15 +260,17 @@ class RIRBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 #
 
 class AggregateListView(ObjectListView):
-    queryset = Aggregate.objects.select_related('rir').extra(select={
-        'child_count': 'SELECT COUNT(*) FROM ipam_prefix WHERE ipam_prefix.prefix <<= ipam_aggregate.prefix',
-    })
+    queryset = Aggregate.objects.select_related('rir')
     filter = filters.AggregateFilter
     filter_form = forms.AggregateFilterForm
     table = tables.AggregateTable
     edit_permissions = ['ipam.change_aggregate', 'ipam.delete_aggregate']
     template_name = 'ipam/aggregate_list.html'
 
+    def alter_queryset(self, request):
+        # Annotate child counts and utilization for all aggregates at once
+        return annotate_aggregate_utilization(self.queryset)
+
     def extra_context(self):
         ipv4_total = 0
         ipv6_total = 0
@@ -325,6 +332,7 @@ class AggregateBulkImportView(PermissionRequiredMixin, BulkImportView):
 class AggregateBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'ipam.change_aggregate'
     cls = Aggregate
+    filter = filters.AggregateFilter
     form = forms.AggregateBulkEditForm
     template_name = 'ipam/aggregate_bulk_edit.html'
     default_redirect_url = 'ipam:aggregate_list'
@@ -333,6 +341,7 @@ class AggregateBulkEditView(PermissionRequiredMixin, BulkEditView):
 class AggregateBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'ipam.delete_aggregate'
     cls = Aggregate
+    filter = filters.AggregateFilter
     default_redirect_url = 'ipam:aggregate_list'
 
 
@@ -366,7 +375,7 @@ class RoleBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
 #
 
 class PrefixListView(ObjectListView):
-    queryset = Prefix.objects.select_related('site', 'vrf__tenant', 'tenant', 'vlan', 'role')
+    queryset = Prefix.objects.select_related('site', 'vrf__tenant', 'tenant', 'vlan__group', 'role')
     filter = filters.PrefixFilter
     filter_form = forms.PrefixFilterForm
     table = tables.PrefixTable
@@ -376,6 +385,7 @@ class PrefixListView(ObjectListView):
     def alter_queryset(self, request):
         # Show only top-level prefixes by default (unless searching)
         limit = None if request.GET.get('expand') or request.GET.get('q') else 0
+        # PrefixTable annotates the utilization of the prefixes on each page
         return self.queryset.annotate_depth(limit=limit)
 
 
@@ -455,6 +465,7 @@ class PrefixBulkImportView(PermissionRequiredMixin, BulkImportView):
 class PrefixBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'ipam.change_prefix'
     cls = Prefix
+    filter = filters.PrefixFilter
     form = forms.PrefixBulkEditForm
     template_name = 'ipam/prefix_bulk_edit.html'
     default_redirect_url = 'ipam:prefix_list'
@@ -463,6 +474,7 @@ class PrefixBulkEditView(PermissionRequiredMixin, BulkEditView):
 class PrefixBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'ipam.delete_prefix'
     cls = Prefix
+    filter = filters.PrefixFilter
     default_redirect_url = 'ipam:prefix_list'
 
 
@@ -491,7 +503,8 @@ def prefix_ipaddresses(request, pk):
 #
 
 class IPAddressListView(ObjectListView):
-    queryset = IPAddress.objects.select_related('vrf__tenant', 'tenant', 'interface__device')
+    queryset = IPAddress.objects.select_related('vrf__tenant', 'tenant', 'interface__device', 'primary_ip4_for',
+                                                'primary_ip6_for')
     filter = filters.IPAddressFilter
     filter_form = forms.IPAddressFilterForm
     table = tables.IPAddressTable
@@ -614,6 +627,12 @@ class IPAddressBulkAddView(PermissionRequiredMixin, BulkAddView):
     template_name = 'ipam/ipaddress_bulk_add.html'
     redirect_url = 'ipam:ipaddress_list'
 
+    def save_objects(self, ips):
+        # The form has validated all attributes other than the address, so only addresses and unique IP space need be
+        # validated (with a single query for the entire range).
+        clean_ips(ips)
+        create_ips(ips)
+
 
 class IPAddressBulkImportView(PermissionRequiredMixin, BulkImportView):
     permission_required = 'ipam.add_ipaddress'
@@ -641,6 +660,7 @@ class IPAddressBulkImportView(PermissionRequiredMixin, BulkImportView):
 class IPAddressBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'ipam.change_ipaddress'
     cls = IPAddress
+    filter = filters.IPAddressFilter
     form = forms.IPAddressBulkEditForm
     template_name = 'ipam/ipaddress_bulk_edit.html'
     default_redirect_url = 'ipam:ipaddress_list'
@@ -649,6 +669,7 @@ class IPAddressBulkEditView(PermissionRequiredMixin, BulkEditView):
 class IPAddressBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'ipam.delete_ipaddress'
     cls = IPAddress
+    filter = filters.IPAddressFilter
     default_redirect_url = 'ipam:ipaddress_list'
 
 
@@ -665,6 +686,23 @@ class VLANGroupListView(ObjectListView):
     template_name = 'ipam/vlangroup_list.html'
 
 
+def vlangroup_available_vlans(request, pk):
+
+    vlan_group = get_object_or_404(VLANGroup.objects.select_related('site'), pk=pk)
+    vlan_count = VLAN.objects.filter(group=vlan_group).count()
+    free_ranges = [
+        {'first': first, 'last': last, 'count': last - first + 1}
+        for first, last in VLANBitmap.for_group(vlan_group).get_free_ranges()
+    ]
+
+    return render(request, 'ipam/vlangroup_available_vlans.html', {
+        'vlan_group': vlan_group,
+        'vlan_count': vlan_count,
+        'free_ranges': free_ranges,
+        'available_count': sum(r['count'] for r in free_ranges),
+    })
+
+
 class VLANGroupEditView(PermissionRequiredMixin, ObjectEditView):
     permission_required = 'ipam.change_vlangroup'
     model = VLANGroup
@@ -676,6 +714,7 @@ class VLANGroupEditView(PermissionRequiredMixin, ObjectEditView):
 class VLANGroupBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'ipam.delete_vlangroup'
     cls = VLANGroup
+    filter = filters.VLANGroupFilter
     default_redirect_url = 'ipam:vlangroup_list'
 
 
@@ -708,6 +747,7 @@ class VLANEditView(PermissionRequiredMixin, ObjectEditView):
     permission_required = 'ipam.change_vlan'
     model = VLAN
     form_class = forms.VLANForm
+    fields_initial = ['site', 'group', 'vid']
     template_name = 'ipam/vlan_edit.html'
     obj_list_url = 'ipam:vlan_list'
 
@@ -729,6 +769,7 @@ class VLANBulkImportView(PermissionRequiredMixin, BulkImportView):
 class VLANBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'ipam.change_vlan'
     cls = VLAN
+    filter = filters.VLANFilter
     form = forms.VLANBulkEditForm
     template_name = 'ipam/vlan_bulk_edit.html'
     default_redirect_url = 'ipam:vlan_list'
@@ -737,6 +778,7 @@ class VLANBulkEditView(PermissionRequiredMixin, BulkEditView):
 class VLANBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'ipam.delete_vlan'
     cls = VLAN
+    filter = filters.VLANFilter
     default_redirect_url = 'ipam:vlan_list'
 
 
@@ -0,0 +1,207 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from rest_framework import authentication, serializers
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.permissions import SAFE_METHODS
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+
+from users.models import Token, hash_token_key
+
+
+# The classes referenced by the REST_FRAMEWORK setting are defined here rather than in utilities.api, which imports
+# rest_framework.views (and thus those settings) when it is loaded.
+
+#
+# Authentication
+#
+
+class TokenCache(object):
+    """
+    A thread-safe, in-process LRU cache of recently authenticated Tokens (and their Users), keyed by key hash. Each
+    Token is cached for no more than `ttl` seconds, after which it is retrieved from the database again.
+    """
+    def __init__(self, size, ttl):
+        self.size = size
+        self.ttl = ttl
+        self._tokens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key_hash):
+        with self._lock:
+            entry = self._tokens.pop(key_hash, None)
+            if entry is None or time.time() - entry[1] > self.ttl:
+                return None
+            self._tokens[key_hash] = entry
+            return entry[0]
+
+    def set(self, key_hash, token):
+        with self._lock:
+            self._tokens.pop(key_hash, None)
+            self._tokens[key_hash] = (token, time.time())
+            while len(self._tokens) > self.size:
+                self._tokens.popitem(last=False)
+
+    def discard(self, key_hash):
+        with self._lock:
+            self._tokens.pop(key_hash, None)
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+
+
+token_cache = TokenCache(size=1000, ttl=settings.API_TOKEN_CACHE_TTL)
+
+
+class TokenAuthentication(authentication.BaseAuthentication):
+    """
+    Authenticate a request using an API token, passed in the Authorization header as "Token <key>". A token which is not
+    write-enabled is rejected for any unsafe request method, regardless of the permission classes of the view.
+    """
+    keyword = 'Token'
+
+    def authenticate(self, request):
+        auth = authentication.get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise AuthenticationFailed("Invalid token header.")
+        try:
+            key_hash = hash_token_key(auth[1].decode())
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header.")
+
+        token = token_cache.get(key_hash)
+        if token is None:
+            try:
+                token = Token.objects.select_related('user').get(key_hash=key_hash)
+            except Token.DoesNotExist:
+                raise AuthenticationFailed("Invalid token.")
+            token_cache.set(key_hash, token)
+
+        if token.is_expired:
+            raise AuthenticationFailed("Token expired.")
+        if not token.user.is_active:
+            raise AuthenticationFailed("User inactive.")
+        if not token.write_enabled and request.method not in SAFE_METHODS:
+            raise PermissionDenied("This token does not permit write operations.")
+
+        # Return copies of the cached objects, so that state attached to them during the request (such as the User's
+        # permissions cache) is not shared with other requests.
+        token = copy.copy(token)
+        token.user = copy.copy(token.user)
+
+        return token.user, token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+#
+# Serializer query planning
+#
+
+# Maximum depth of nested serializers to be followed when planning a queryset
+MAX_PLAN_DEPTH = 4
+
+_serializer_plans = {}
+
+
+def _plan_serializer(serializer, model, depth=0):
+    """
+    Walk the nested serializers of a serializer instance, returning a tuple of the select_related lookups and the
+    prefetches (as tuples of lookup, model, select_related, prefetches) required to serialize instances of `model`.
+    Forward foreign keys and one-to-one relations are joined; reverse and many-to-many relations are prefetched, with
+    their own nested relations planned recursively. Fields whose source is not a model relation are ignored.
+    """
+    select_related = []
+    prefetch_related = []
+    if depth >= MAX_PLAN_DEPTH:
+        return select_related, prefetch_related
+
+    for field in serializer.fields.values():
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not isinstance(nested, serializers.BaseSerializer) or len(field.source_attrs) != 1:
+            continue
+        name = field.source_attrs[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation or model_field.related_model is None:
+            continue
+
+        nested_select, nested_prefetch = _plan_serializer(nested, model_field.related_model, depth + 1)
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch_related.append((name, model_field.related_model, nested_select, nested_prefetch))
+        else:
+            select_related.append(name)
+            select_related += ['{}__{}'.format(name, lookup) for lookup in nested_select]
+            prefetch_related += [('{}__{}'.format(name, p[0]),) + p[1:] for p in nested_prefetch]
+
+    return select_related, prefetch_related
+
+
+def _build_prefetches(prefetch_plan):
+    prefetches = []
+    for lookup, model, select_related, prefetch_related in prefetch_plan:
+        queryset = model._default_manager.all()
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        if prefetch_related:
+            queryset = queryset.prefetch_related(*_build_prefetches(prefetch_related))
+        prefetches.append(Prefetch(lookup, queryset=queryset))
+    return prefetches
+
+
+def get_serializer_plan(serializer_class, model):
+    """
+    Return the select_related lookups and prefetch plan for serializing instances of `model` with `serializer_class`.
+    Plans are computed once per serializer class.
+    """
+    key = (serializer_class, model)
+    if key not in _serializer_plans:
+        _serializer_plans[key] = _plan_serializer(serializer_class(), model)
+    return _serializer_plans[key]
+
+
+def optimize_queryset(queryset, serializer_class):
+    """
+    Apply to a queryset the select_related() and prefetch_related() calls needed by the nested serializers of
+    `serializer_class`, so that serialization incurs a fixed number of queries regardless of the number of objects.
+    Relations already prefetched by the queryset are left as they are.
+    """
+    select_related, prefetch_plan = get_serializer_plan(serializer_class, queryset.model)
+
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+
+    existing = [
+        lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        for lookup in queryset._prefetch_related_lookups
+    ]
+    prefetches = [
+        p for p in _build_prefetches(prefetch_plan)
+        if not any(e == p.prefetch_to or e.startswith(p.prefetch_to + '__') for e in existing)
+    ]
+    if prefetches:
+        queryset = queryset.prefetch_related(*prefetches)
+
+    return queryset
+
+
+class SerializerQueryPlanBackend(BaseFilterBackend):
+    """
+    A filter backend which optimizes (rather than filters) the queryset of every generic API view for its serializer.
+    """
+    def filter_queryset(self, request, queryset, view):
+        if not isinstance(queryset, QuerySet) or getattr(view, 'serializer_class', None) is None:
+            return queryset
+        return optimize_queryset(queryset, view.get_serializer_class())
@@ -1,6 +1,7 @@
 import logging
 import os
 import socket
+import tempfile
 
 from django.contrib.messages import constants as messages
 from django.core.exceptions import ImproperlyConfigured
@@ -45,6 +46,19 @@ BANNER_TOP = getattr(configuration, 'BANNER_TOP', False)
 BANNER_BOTTOM = getattr(configuration, 'BANNER_BOTTOM', False)
 PREFER_IPV4 = getattr(configuration, 'PREFER_IPV4', False)
 ENFORCE_GLOBAL_UNIQUE = getattr(configuration, 'ENFORCE_GLOBAL_UNIQUE', False)
+GRAPH_PROXY = getattr(configuration, 'GRAPH_PROXY', False)
+GRAPH_PROXY_CACHE_DIR = getattr(configuration, 'GRAPH_PROXY_CACHE_DIR',
+                                os.path.join(tempfile.gettempdir(), 'netbox_graphs'))
+GRAPH_PROXY_CACHE_TIMEOUT = getattr(configuration, 'GRAPH_PROXY_CACHE_TIMEOUT', 300)
+USERACTION_RETENTION = getattr(configuration, 'USERACTION_RETENTION', 0)
+STATS_SUMMARY = getattr(configuration, 'STATS_SUMMARY', False)
+CACHES = getattr(configuration, 'CACHES', {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+})
+CACHED_SESSIONS = getattr(configuration, 'CACHED_SESSIONS', False)
+API_TOKEN_CACHE_TTL = getattr(configuration, 'API_TOKEN_CACHE_TTL', 60)
 CSRF_TRUSTED_ORIGINS = ALLOWED_HOSTS
 
 # Attempt to import LDAP configuration if it has been defined
@@ -55,15 +69,20 @@ try:
 except ImportError:
     LDAP_CONFIGURED = False
 
+# Authentication backends
+AUTHENTICATION_BACKENDS = [
+    'utilities.auth.CachedPermissionsBackend',
+]
+
 # LDAP configuration (optional)
 if LDAP_CONFIGURED:
     try:
         import ldap
         import django_auth_ldap
-        # Prepend LDAPBackend to the default ModelBackend
+        # Prepend LDAPBackend to the default backend
         AUTHENTICATION_BACKENDS = [
             'django_auth_ldap.backend.LDAPBackend',
-            'django.contrib.auth.backends.ModelBackend',
+            'utilities.auth.CachedPermissionsBackend',
         ]
         # Optionally disable strict certificate checking
         if LDAP_IGNORE_CERT_ERRORS:
@@ -128,6 +147,7 @@ MIDDLEWARE = (
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'utilities.middleware.LoginRequiredMiddleware',
+    'utilities.middleware.UserActionBufferMiddleware',
 )
 
 ROOT_URLCONF = 'netbox.urls'
@@ -176,15 +196,34 @@ MESSAGE_TAGS = {
     messages.ERROR: 'danger',
 }
 
+# Sessions
+if CACHED_SESSIONS:
+    # Sessions are read from the cache, falling back to the database. A cache shared by all NetBox processes is
+    # required, as a session modified by one process would otherwise remain stale in the caches of the others.
+    if CACHES['default']['BACKEND'] == 'django.core.cache.backends.locmem.LocMemCache':
+        raise ImproperlyConfigured("CACHED_SESSIONS requires a shared cache backend (e.g. memcached) to be defined in "
+                                   "CACHES.")
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
 # Authentication URLs
 LOGIN_URL = '/{}login/'.format(BASE_PATH)
 
 # Secrets
 SECRETS_MIN_PUBKEY_SIZE = 2048
+SECRETS_DECRYPTION_PROCESSES = getattr(configuration, 'SECRETS_DECRYPTION_PROCESSES', None)
+SECRETS_SESSION_KEY_TTL = getattr(configuration, 'SECRETS_SESSION_KEY_TTL', 3600)
+SECRETS_KEYPAIR_POOL_SIZE = getattr(configuration, 'SECRETS_KEYPAIR_POOL_SIZE', 5)
 
 # Django REST framework
 REST_FRAMEWORK = {
-    'DEFAULT_FILTER_BACKENDS': ('rest_framework.filters.DjangoFilterBackend',)
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'netbox.api.TokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ),
+    'DEFAULT_FILTER_BACKENDS': (
+        'rest_framework.filters.DjangoFilterBackend',
+        'netbox.api.SerializerQueryPlanBackend',
+    ),
 }
 if LOGIN_REQUIRED:
     REST_FRAMEWORK['DEFAULT_PERMISSION_CLASSES'] = ('rest_framework.permissions.IsAuthenticated',)
@@ -2,7 +2,8 @@ from django.conf import settings
 from django.conf.urls import include, url
 from django.contrib import admin
 
-from views import home, handle_500, trigger_500
+from extras.api.views import SearchView
+from views import home, handle_500, search, trigger_500
 from users.views import login, logout
 
 
@@ -13,6 +14,9 @@ _patterns = [
     # Default page
     url(r'^$', home, name='home'),
 
+    # Global search
+    url(r'^search/$', search, name='search'),
+
     # Login/logout
     url(r'^login/$', login, name='login'),
     url(r'^logout/$', logout, name='logout'),
@@ -28,9 +32,11 @@ _patterns = [
     # API
     url(r'^api/circuits/', include('circuits.api.urls', namespace='circuits-api')),
     url(r'^api/dcim/', include('dcim.api.urls', namespace='dcim-api')),
+    url(r'^api/extras/', include('extras.api.urls', namespace='extras-api')),
     url(r'^api/ipam/', include('ipam.api.urls', namespace='ipam-api')),
     url(r'^api/secrets/', include('secrets.api.urls', namespace='secrets-api')),
     url(r'^api/tenancy/', include('tenancy.api.urls', namespace='tenancy-api')),
+    url(r'^api/search/$', SearchView.as_view(), name='search-api'),
     url(r'^api/docs/', include('rest_framework_swagger.urls')),
     url(r'^api-auth/', include('rest_framework.urls', namespace='rest_framework')),
 
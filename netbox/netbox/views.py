@@ -5,6 +5,7 @@ from django.shortcuts import render
 from circuits.models import Provider, Circuit
 from dcim.models import Site, Rack, Device, ConsolePort, PowerPort, InterfaceConnection
 from extras.models import UserAction
+from extras.search import SEARCH_TYPES, search as search_objects
 from ipam.models import Aggregate, Prefix, IPAddress, VLAN, VRF
 from secrets.models import Secret
 from tenancy.models import Tenant
@@ -47,6 +48,27 @@ def home(request):
     })
 
 
+def search(request):
+
+    query = request.GET.get('q', '').strip()
+    obj_type = request.GET.get('obj_type')
+    results = []
+
+    if query:
+        obj_types = [obj_type] if obj_type in SEARCH_TYPES else None
+        for obj_type_results in search_objects(query, obj_types).values():
+            obj_type_results['verbose_name_plural'] = obj_type_results['model']._meta.verbose_name_plural
+            results.append(obj_type_results)
+
+    return render(request, 'search.html', {
+        'query': query,
+        'obj_type': obj_type,
+        'obj_types': [(name, search_type['queryset'].model._meta.verbose_name_plural.capitalize())
+                      for name, search_type in SEARCH_TYPES.items()],
+        'results': results,
+    })
+
+
 def handle_500(request):
     """
     Custom server error handler
@@ -10,14 +10,14 @@ $(document).ready(function() {
         }
     });
     // Uncheck the "toggle all" checkbox if an item is unchecked
-    $('input:checkbox[name=pk]').click(function (event) {
+    $(document).on('click', 'input:checkbox[name=pk]', function (event) {
         if (!$(this).attr('checked')) {
             $('#select_all, #toggle_all').prop('checked', false);
         }
     });
 
     // Simple "Toggle all" button (panel)
-    $('button.toggle').click(function (event) {
+    $(document).on('click', 'button.toggle', function (event) {
         var selected = $(this).attr('selected');
         $(this).closest('form').find('input:checkbox[name=pk]').prop('checked', !selected);
         $(this).attr('selected', !selected);
@@ -60,6 +60,7 @@ $(document).ready(function() {
     });
 
     // API select widget
+    var api_select_cache = {};
     $('select[filter-for]').change(function () {
 
         // Resolve child field by ID specified in parent
@@ -89,21 +90,29 @@ $(document).ready(function() {
 
             });
 
-            // If all URL variables have been replaced, make the API call
+            // If all URL variables have been replaced, make the API call (unless its response has been cached)
             if (api_url.search('{{') < 0) {
-                $.ajax({
-                    url: api_url,
-                    dataType: 'json',
-                    success: function (response, status) {
-                        $.each(response, function (index, choice) {
-                            var option = $("<option></option>").attr("value", choice.id).text(choice[display_field]);
-                            if (disabled_indicator && choice[disabled_indicator] && choice.id != initial_value) {
-                                option.attr("disabled", "disabled")
-                            }
-                            child_field.append(option);
-                        });
-                    }
-                });
+                var populate_choices = function (response) {
+                    $.each(response, function (index, choice) {
+                        var option = $("<option></option>").attr("value", choice.id).text(choice[display_field]);
+                        if (disabled_indicator && choice[disabled_indicator] && choice.id != initial_value) {
+                            option.attr("disabled", "disabled")
+                        }
+                        child_field.append(option);
+                    });
+                };
+                if (api_url in api_select_cache) {
+                    populate_choices(api_select_cache[api_url]);
+                } else {
+                    $.ajax({
+                        url: api_url,
+                        dataType: 'json',
+                        success: function (response, status) {
+                            api_select_cache[api_url] = response;
+                            populate_choices(response);
+                        }
+                    });
+                }
             }
 
         }
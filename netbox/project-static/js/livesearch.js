@@ -6,6 +6,7 @@ $(document).ready(function() {
     if (!label) {
         label = 'name';
     }
+    var cache = {};
 
     // Update livesearch text when real field changes
     if (real_field.val()) {
@@ -21,10 +22,15 @@ $(document).ready(function() {
 
     search_field.autocomplete({
         source: function(request, response) {
+            // Reuse the results of previous identical queries
+            if (request.term in cache) {
+                response(cache[request.term]);
+                return;
+            }
             $.ajax({
                 type: 'GET',
                 url: search_field.attr('data-source'),
-                data: search_key + '=' + request.term,
+                data: search_key + '=' + encodeURIComponent(request.term),
                 success: function(data) {
                     var choices = [];
                     $.each(data, function (index, choice) {
@@ -33,7 +39,11 @@ $(document).ready(function() {
                             label: choice[label]
                         });
                     });
+                    cache[request.term] = choices;
                     response(choices);
+                },
+                error: function() {
+                    response([]);
                 }
             });
         },
@@ -31,7 +31,8 @@ $(document).ready(function() {
         var private_key = sessionStorage.getItem('private_key');
         if (private_key) {
             private_key_field.val(private_key);
-        } else if ($('form .requires-private-key:first').val()) {
+            $('#id_session_key').val(sessionStorage.getItem('session_key') || '');
+        } else if ($('form .requires-private-key').filter(function() { return $(this).val(); }).length) {
             console.log("we need a key!");
             $('#privkey_modal').modal('show');
             return false;
@@ -42,6 +43,7 @@ $(document).ready(function() {
     $('#submit_privkey').click(function() {
         var private_key = $('#user_privkey').val();
         sessionStorage.setItem('private_key', private_key);
+        get_session_key(private_key);
     });
 
     // Generate a new public/private key pair via the API
@@ -71,9 +73,31 @@ $(document).ready(function() {
         }
     });
 
+    // Exchange the private key for a session key, which the server can use to unlock the master key more cheaply. The
+    // private key is still sent along with each request in case the session key has expired.
+    function get_session_key(private_key) {
+        var csrf_token = $('input[name=csrfmiddlewaretoken]').val();
+        sessionStorage.removeItem('session_key');
+        $.ajax({
+            url: '/api/secrets/get-session-key/',
+            type: 'POST',
+            data: {
+                private_key: private_key
+            },
+            dataType: 'json',
+            beforeSend: function(xhr, settings) {
+                xhr.setRequestHeader("X-CSRFToken", csrf_token);
+            },
+            success: function (response, status) {
+                sessionStorage.setItem('session_key', response.session_key);
+            }
+        });
+    }
+
     // Retrieve a secret via the API
     function unlock_secret(secret_id, private_key) {
         var csrf_token = $('input[name=csrfmiddlewaretoken]').val();
+        var session_key = sessionStorage.getItem('session_key');
         $.ajax({
             url: '/api/secrets/secrets/' + secret_id + '/',
             type: 'POST',
@@ -83,6 +107,9 @@ $(document).ready(function() {
             dataType: 'json',
             beforeSend: function(xhr, settings) {
                 xhr.setRequestHeader("X-CSRFToken", csrf_token);
+                if (session_key) {
+                    xhr.setRequestHeader("X-Session-Key", session_key);
+                }
             },
             success: function (response, status) {
                 $('#secret_' + secret_id).html(response.plaintext);
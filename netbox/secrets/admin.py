@@ -1,8 +1,9 @@
 from django.contrib import admin, messages
 from django.shortcuts import redirect, render
 
+from .bulk import UserKeyActivator
 from .forms import ActivateUserKeyForm
-from .models import UserKey, SecretRole, Secret
+from .models import UserKey, SecretRole, Secret, SessionKey
 
 
 @admin.register(UserKey)
@@ -40,13 +41,12 @@ class UserKeyAdmin(admin.ModelAdmin):
         if 'activate' in request.POST:
             form = ActivateUserKeyForm(request.POST)
             if form.is_valid():
-                try:
-                    master_key = my_userkey.get_master_key(form.cleaned_data['secret_key'])
-                    for uk in form.cleaned_data['_selected_action']:
-                        uk.activate(master_key)
+                master_key = my_userkey.get_master_key(form.cleaned_data['secret_key'])
+                if master_key is not None:
+                    activated = UserKeyActivator(master_key).activate(form.cleaned_data['_selected_action'])
+                    messages.success(request, u"Activated {} user keys.".format(len(activated)))
                     return redirect('/admin/secrets/userkey/')
-                except ValueError:
-                    messages.error(request, u"Invalid private key provided. Unable to retrieve master key.")
+                messages.error(request, u"Invalid private key provided. Unable to retrieve master key.")
         else:
             form = ActivateUserKeyForm(initial={'_selected_action': request.POST.getlist(admin.ACTION_CHECKBOX_NAME)})
 
@@ -56,6 +56,17 @@ class UserKeyAdmin(admin.ModelAdmin):
     activate_selected.short_description = "Activate selected user keys"
 
 
+@admin.register(SessionKey)
+class SessionKeyAdmin(admin.ModelAdmin):
+    list_display = ['userkey', 'created', 'expires', 'is_expired']
+    fields = ['userkey', 'created', 'expires']
+    readonly_fields = ['userkey', 'created', 'expires']
+
+    def has_add_permission(self, request):
+        # Session keys can only be created by unlocking a UserKey.
+        return False
+
+
 @admin.register(SecretRole)
 class SecretRoleAdmin(admin.ModelAdmin):
     list_display = ['name', 'slug']
@@ -14,6 +14,7 @@ urlpatterns = [
     url(r'^secret-roles/(?P<pk>\d+)/$', SecretRoleDetailView.as_view(), name='secretrole_detail'),
 
     # Miscellaneous
+    url(r'^get-session-key/$', SessionKeyView.as_view(), name='get_session_key'),
     url(r'^generate-keys/$', RSAKeyGeneratorView.as_view(), name='generate_keys'),
 
 ]
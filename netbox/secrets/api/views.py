@@ -1,5 +1,6 @@
-from Crypto.PublicKey import RSA
+from itertools import chain
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 
 from rest_framework import generics
@@ -11,7 +12,9 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from extras.api.renderers import FormlessBrowsableAPIRenderer, FreeRADIUSClientsRenderer
+from secrets.bulk import SecretDecryptionError, SecretDecryptor
 from secrets.filters import SecretFilter
+from secrets.keypairs import DEFAULT_KEY_SIZE, KEY_SIZES, get_keypair
 from secrets.models import Secret, SecretRole, UserKey
 
 from . import serializers
@@ -20,6 +23,14 @@ from . import serializers
 ERR_USERKEY_MISSING = "No UserKey found for the current user."
 ERR_USERKEY_INACTIVE = "UserKey has not been activated for decryption."
 ERR_PRIVKEY_INVALID = "Invalid private key."
+ERR_SESSIONKEY_INVALID = "Invalid or expired session key."
+
+
+def get_session_key(request):
+    """
+    Return the session key provided with a request, either as the X-Session-Key header or as a POST parameter.
+    """
+    return request.META.get('HTTP_X_SESSION_KEY') or request.POST.get('session_key')
 
 
 class SecretRoleListView(generics.ListAPIView):
@@ -42,20 +53,22 @@ class SecretRoleDetailView(generics.RetrieveAPIView):
 
 class SecretListView(generics.GenericAPIView):
     """
-    List secrets (filterable). If a private key is POSTed, attempt to decrypt each Secret.
+    List secrets (filterable). If a private key is POSTed, attempt to decrypt each Secret. Decrypted JSON and FreeRADIUS
+    output is streamed as each chunk of Secrets is decrypted.
     """
-    queryset = Secret.objects.select_related('device__primary_ip4', 'device__primary_ip6', 'role')\
-        .prefetch_related('role__users', 'role__groups')
+    queryset = Secret.objects.select_related('device__primary_ip4', 'device__primary_ip6', 'role')
     serializer_class = serializers.SecretSerializer
     filter_class = SecretFilter
     renderer_classes = [FormlessBrowsableAPIRenderer, JSONRenderer, FreeRADIUSClientsRenderer]
     permission_classes = [IsAuthenticated]
+    streaming_formats = ['json', 'freeradius']
 
     def get(self, request, private_key=None):
         queryset = self.filter_queryset(self.get_queryset())
+        session_key = get_session_key(request)
 
-        # Attempt to decrypt each Secret if a private key was provided.
-        if private_key:
+        # Attempt to decrypt each Secret if a private key or session key was provided.
+        if private_key or session_key:
             try:
                 uk = UserKey.objects.get(user=request.user)
             except UserKey.DoesNotExist:
@@ -68,16 +81,26 @@ class SecretListView(generics.GenericAPIView):
                     {'error': ERR_USERKEY_INACTIVE},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-            master_key = uk.get_master_key(private_key)
-            if master_key is not None:
-                for s in queryset:
-                    if s.decryptable_by(request.user):
-                        s.decrypt(master_key)
-            else:
+            master_key = uk.unlock(private_key=private_key, session_key=session_key)
+            if master_key is None:
                 return Response(
-                    {'error': ERR_PRIVKEY_INVALID},
+                    {'error': ERR_PRIVKEY_INVALID if private_key else ERR_SESSIONKEY_INVALID},
                     status=status.HTTP_400_BAD_REQUEST
                 )
+            decryptor = SecretDecryptor(request.user, master_key)
+            renderer = request.accepted_renderer
+            chunks = decryptor.decrypt_chunks(queryset)
+            try:
+                if renderer.format in self.streaming_formats:
+                    # Decrypt the first chunk before streaming begins, so that an error can still be returned
+                    chunks = chain([next(chunks, [])], chunks)
+                    content_type = renderer.media_type
+                    if renderer.charset:
+                        content_type = '{}; charset={}'.format(content_type, renderer.charset)
+                    return StreamingHttpResponse(self.stream(chunks, renderer), content_type=content_type)
+                queryset = [secret for chunk in chunks for secret in chunk]
+            except SecretDecryptionError as e:
+                return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
@@ -85,6 +108,29 @@ class SecretListView(generics.GenericAPIView):
     def post(self, request):
         return self.get(request, private_key=request.POST.get('private_key'))
 
+    def stream(self, chunks, renderer):
+        """
+        Render chunks of Secrets as they are decrypted. A SecretDecryptionError raised by a later chunk aborts the
+        response.
+        """
+        is_json = renderer.format == 'json'
+        first = True
+        if is_json:
+            yield b'['
+        for chunk in chunks:
+            data = self.get_serializer(chunk, many=True).data
+            if is_json:
+                for item in data:
+                    yield renderer.render(item) if first else b',' + renderer.render(item)
+                    first = False
+            else:
+                output = renderer.render(data)
+                if output:
+                    yield output if first else '\n' + output
+                    first = False
+        if is_json:
+            yield b']'
+
 
 class SecretDetailView(generics.GenericAPIView):
     """
@@ -98,9 +144,10 @@ class SecretDetailView(generics.GenericAPIView):
 
     def get(self, request, pk, private_key=None):
         secret = get_object_or_404(Secret, pk=pk)
+        session_key = get_session_key(request)
 
-        # Attempt to decrypt the Secret if a private key was provided.
-        if private_key:
+        # Attempt to decrypt the Secret if a private key or session key was provided.
+        if private_key or session_key:
             try:
                 uk = UserKey.objects.get(user=request.user)
             except UserKey.DoesNotExist:
@@ -115,10 +162,10 @@ class SecretDetailView(generics.GenericAPIView):
                 )
             if not secret.decryptable_by(request.user):
                 raise PermissionDenied(detail="You do not have permission to decrypt this secret.")
-            master_key = uk.get_master_key(private_key)
+            master_key = uk.unlock(private_key=private_key, session_key=session_key)
             if master_key is None:
                 return Response(
-                    {'error': ERR_PRIVKEY_INVALID},
+                    {'error': ERR_PRIVKEY_INVALID if private_key else ERR_SESSIONKEY_INVALID},
                     status=status.HTTP_400_BAD_REQUEST
                 )
             secret.decrypt(master_key)
@@ -130,23 +177,62 @@ class SecretDetailView(generics.GenericAPIView):
         return self.get(request, pk, private_key=request.POST.get('private_key'))
 
 
+class SessionKeyView(APIView):
+    """
+    Unlock the current user's UserKey with their private key (POSTed as `private_key`) and return a session key. Until
+    it expires, the session key may be presented in place of the private key (as the X-Session-Key header).
+    """
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [FormlessBrowsableAPIRenderer, JSONRenderer]
+
+    def post(self, request):
+
+        try:
+            uk = UserKey.objects.get(user=request.user)
+        except UserKey.DoesNotExist:
+            return Response(
+                {'error': ERR_USERKEY_MISSING},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not uk.is_active():
+            return Response(
+                {'error': ERR_USERKEY_INACTIVE},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        master_key = uk.get_master_key(request.POST.get('private_key', ''))
+        if master_key is None:
+            return Response(
+                {'error': ERR_PRIVKEY_INVALID},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        sk, session_key = uk.create_session_key(master_key)
+
+        return Response({
+            'session_key': session_key,
+            'expires': sk.expires,
+        })
+
+
 class RSAKeyGeneratorView(APIView):
     """
-    Generate a new RSA key pair for a user. Authenticated because it's a ripe avenue for DoS.
+    Generate a new RSA key pair for a user. Authenticated because it's a ripe avenue for DoS. Key pairs are taken from
+    the pre-generated pool where possible.
     """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
 
         # Determine what size key to generate
-        key_size = request.GET.get('key_size', 2048)
-        if key_size not in range(2048, 4097, 256):
-            key_size = 2048
-
-        # Export RSA private and public keys in PEM format
-        key = RSA.generate(key_size)
-        private_key = key.exportKey('PEM')
-        public_key = key.publickey().exportKey('PEM')
+        try:
+            key_size = int(request.GET.get('key_size', DEFAULT_KEY_SIZE))
+        except ValueError:
+            key_size = DEFAULT_KEY_SIZE
+        if key_size not in KEY_SIZES:
+            key_size = DEFAULT_KEY_SIZE
+
+        # Retrieve RSA private and public keys in PEM format
+        private_key, public_key = get_keypair(key_size)
 
         return Response({
             'private_key': private_key,
@@ -0,0 +1,285 @@
+import multiprocessing
+import os
+import threading
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import BinaryField, Case, Q, Value, When
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+
+from dcim.models import Device
+
+from .models import Secret, SecretRole, UserKey, encrypt_master_key
+
+
+# Below this number of Secrets, encryption/decryption is performed in-process: the cost of starting worker processes
+# would exceed the time saved.
+PARALLEL_THRESHOLD = 100
+
+# Number of Secrets to process (decrypt and serialize, or encrypt and insert) at a time
+CHUNK_SIZE = 500
+
+
+class SecretDecryptionError(ValueError):
+    """
+    Raised when Secrets cannot be decrypted with the master key (their ciphertext is corrupt or was not encrypted with
+    this master key).
+    """
+    def __init__(self, secrets):
+        self.secrets = secrets
+        super(SecretDecryptionError, self).__init__("Invalid key or ciphertext for secret(s): {}".format(
+            ', '.join(str(s.pk) for s in secrets)
+        ))
+
+
+def get_member_roles(user):
+    """
+    Return the set of PKs of all SecretRoles to which the given user belongs (either directly or by group), or None if
+    the user is a superuser and thus belongs to all roles. Membership is resolved with a single query.
+    """
+    if user.is_superuser:
+        return None
+    return set(SecretRole.objects.filter(
+        Q(users=user) | Q(groups__in=user.groups.all())
+    ).values_list('pk', flat=True))
+
+
+def _decrypt(args):
+    """
+    Decrypt and validate a single ciphertext, returning its plaintext (or None if validation fails, in which case the
+    caller raises SecretDecryptionError). Defined at the module level so that it can be dispatched to worker processes.
+    """
+    master_key, ciphertext, hash = args
+    secret = Secret(ciphertext=ciphertext, hash=hash)
+    try:
+        secret.decrypt(master_key)
+    except ValueError:
+        return None
+    return secret.plaintext
+
+
+def _encrypt(args):
+    """
+    Encrypt and hash a single plaintext, returning a tuple of (ciphertext, hash).
+    """
+    master_key, plaintext = args
+    secret = Secret(plaintext=plaintext)
+    secret.encrypt(master_key)
+    return secret.ciphertext, secret.hash
+
+
+def _encrypt_master_key(args):
+    """
+    Encrypt the master key with a single public RSA key.
+    """
+    master_key, public_key = args
+    return encrypt_master_key(master_key, public_key)
+
+
+# Worker pools shared by all SecretDecryptors in this process, keyed by the number of worker processes
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_pool(processes):
+    """
+    Return a pool of worker processes which persists for the lifetime of the current process, so that web requests do
+    not each start (and tear down) their own workers. A pool inherited from a parent process is replaced.
+    """
+    with _shared_pools_lock:
+        pool, pid = _shared_pools.get(processes, (None, None))
+        if pool is None or pid != os.getpid():
+            pool = multiprocessing.Pool(processes)
+            _shared_pools[processes] = (pool, os.getpid())
+        return pool
+
+
+class SecretProcessor(object):
+    """
+    Base class for the bulk processing of Secrets with the master key. Large batches are distributed across a pool of
+    worker processes (SECRETS_DECRYPTION_PROCESSES). Unless `shared_pool` is set, the pool is started on demand and
+    persists until close() is called; otherwise the process-wide pool returned by get_shared_pool() is used.
+    """
+    shared_pool = False
+
+    def __init__(self, master_key, processes=None):
+        self.master_key = master_key
+        self.processes = processes or settings.SECRETS_DECRYPTION_PROCESSES
+        self.pool = None
+
+    def map(self, func, args):
+        if len(args) >= PARALLEL_THRESHOLD and self.processes != 1:
+            if self.shared_pool:
+                return get_shared_pool(self.processes).map(func, args)
+            if self.pool is None:
+                self.pool = multiprocessing.Pool(self.processes)
+            return self.pool.map(func, args)
+        return [func(a) for a in args]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+
+class SecretDecryptor(SecretProcessor):
+    """
+    Decrypts Secrets in bulk on behalf of a user. The user's role membership is resolved once upon initialization.
+    Large batches are decrypted by the shared worker pool.
+    """
+    shared_pool = True
+
+    def __init__(self, user, master_key, processes=None):
+        super(SecretDecryptor, self).__init__(master_key, processes)
+        self.roles = get_member_roles(user)
+
+    def decryptable(self, secret):
+        """
+        Check whether the user has permission to decrypt the given Secret.
+        """
+        return self.roles is None or secret.role_id in self.roles
+
+    def decrypt(self, secrets):
+        """
+        Decrypt each of the given Secrets which the user is permitted to decrypt. Returns the list of Secrets. Raises
+        SecretDecryptionError if any of them fails validation.
+        """
+        secrets = list(secrets)
+        targets = [s for s in secrets if s.plaintext is None and self.decryptable(s)]
+        plaintexts = self.map(_decrypt, [(self.master_key, force_bytes(s.ciphertext), s.hash) for s in targets])
+
+        failed = [secret for secret, plaintext in zip(targets, plaintexts) if plaintext is None]
+        if failed:
+            raise SecretDecryptionError(failed)
+        for secret, plaintext in zip(targets, plaintexts):
+            secret.plaintext = plaintext
+
+        return secrets
+
+    def decrypt_chunks(self, queryset, chunk_size=CHUNK_SIZE):
+        """
+        Iterate over the Secrets in a queryset without caching them, yielding lists of (up to) `chunk_size` decrypted
+        Secrets.
+        """
+        secrets = queryset.iterator()
+        while True:
+            chunk = list(islice(secrets, chunk_size))
+            if not chunk:
+                break
+            yield self.decrypt(chunk)
+
+
+class SecretImporter(SecretProcessor):
+    """
+    Creates Secrets in bulk from imported records. An optional `progress` callable is called with the number of Secrets
+    created so far and the total after each chunk has been saved.
+    """
+
+    def __init__(self, master_key, processes=None, chunk_size=CHUNK_SIZE, progress=None):
+        super(SecretImporter, self).__init__(master_key, processes)
+        self.chunk_size = chunk_size
+        self.progress = progress
+
+    def prepare(self, records):
+        """
+        Validate a list of records (dictionaries of device and role names, name, and plaintext), returning a list of
+        unsaved Secrets. Devices, roles, and existing Secrets are each retrieved with a single query. Raises a
+        ValidationError listing every invalid record.
+        """
+        devices = {d.name: d for d in Device.objects.filter(name__in=set(r['device'] for r in records))}
+        roles = {r.name: r for r in SecretRole.objects.filter(name__in=set(r['role'] for r in records))}
+        existing = set(Secret.objects.filter(device__in=devices.values()).values_list('device', 'role', 'name'))
+        name_length = Secret._meta.get_field('name').max_length
+
+        secrets = []
+        errors = []
+        for i, record in enumerate(records, start=1):
+            device = devices.get(record['device'])
+            role = roles.get(record['role'])
+            name = record.get('name') or ''
+            if device is None:
+                errors.append("Record {} (device): Device not found.".format(i))
+            elif role is None:
+                errors.append("Record {} (role): Invalid secret role.".format(i))
+            elif len(name) > name_length:
+                errors.append("Record {} (name): Ensure this value has at most {} characters.".format(i, name_length))
+            elif not record.get('plaintext'):
+                errors.append("Record {} (plaintext): This field is required.".format(i))
+            elif (device.pk, role.pk, name) in existing:
+                errors.append("Record {}: Secret with this Device, Role and Name already exists.".format(i))
+            else:
+                existing.add((device.pk, role.pk, name))
+                secrets.append(Secret(device=device, role=role, name=name, plaintext=record['plaintext']))
+
+        if errors:
+            raise ValidationError(errors)
+
+        return secrets
+
+    def save(self, secrets):
+        """
+        Encrypt and save a list of Secrets in chunks of `chunk_size`, within a single transaction. Returns the list of
+        Secrets.
+        """
+        total = len(secrets)
+        try:
+            with transaction.atomic():
+                for i in range(0, total, self.chunk_size):
+                    chunk = secrets[i:i + self.chunk_size]
+                    results = self.map(_encrypt, [(self.master_key, s.plaintext) for s in chunk])
+                    for secret, (ciphertext, hash) in zip(chunk, results):
+                        secret.ciphertext = ciphertext
+                        secret.hash = hash
+                        secret.plaintext = None
+                    Secret.objects.bulk_create(chunk)
+                    if self.progress is not None:
+                        self.progress(i + len(chunk), total)
+        finally:
+            self.close()
+
+        return secrets
+
+
+class UserKeyActivator(SecretProcessor):
+    """
+    Activates UserKeys in bulk. The master key is encrypted with each public key (in parallel, for large batches) and
+    the encrypted copies are written with a single UPDATE per chunk of `chunk_size` UserKeys.
+    """
+
+    def __init__(self, master_key, processes=None, chunk_size=CHUNK_SIZE):
+        super(UserKeyActivator, self).__init__(master_key, processes)
+        self.chunk_size = chunk_size
+
+    def activate(self, userkeys):
+        """
+        Activate the given UserKeys, skipping any which have not been filled with a public key. Returns the list of
+        UserKeys activated.
+        """
+        userkeys = [uk for uk in userkeys if uk.is_filled()]
+        try:
+            ciphers = self.map(_encrypt_master_key, [(self.master_key, uk.public_key) for uk in userkeys])
+        finally:
+            self.close()
+
+        pairs = list(zip(userkeys, ciphers))
+        now = timezone.now()
+        with transaction.atomic():
+            for i in range(0, len(pairs), self.chunk_size):
+                chunk = pairs[i:i + self.chunk_size]
+                UserKey.objects.filter(pk__in=[uk.pk for uk, cipher in chunk]).update(
+                    master_key_cipher=Case(
+                        *[When(pk=uk.pk, then=Value(cipher, output_field=BinaryField())) for uk, cipher in chunk],
+                        output_field=BinaryField()
+                    ),
+                    last_updated=now
+                )
+
+        for uk, cipher in pairs:
+            uk.master_key_cipher = cipher
+            uk.last_updated = now
+
+        return userkeys
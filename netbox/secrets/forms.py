@@ -5,7 +5,7 @@ from django import forms
 from django.db.models import Count
 
 from dcim.models import Device
-from utilities.forms import BootstrapMixin, BulkEditForm, BulkImportForm, CSVDataField, FilterChoiceField, SlugField
+from utilities.forms import BootstrapMixin, BulkEditForm, CSVDataField, FilterChoiceField, SlugField
 
 from .models import Secret, SecretRole, UserKey
 
@@ -48,6 +48,7 @@ class SecretRoleForm(BootstrapMixin, forms.ModelForm):
 
 class SecretForm(BootstrapMixin, forms.ModelForm):
     private_key = forms.CharField(required=False, widget=forms.HiddenInput())
+    session_key = forms.CharField(required=False, widget=forms.HiddenInput())
     plaintext = forms.CharField(max_length=65535, required=False, label='Plaintext',
                                 widget=forms.PasswordInput(attrs={'class': 'requires-private-key'}))
     plaintext2 = forms.CharField(max_length=65535, required=False, label='Plaintext (verify)',
@@ -59,7 +60,7 @@ class SecretForm(BootstrapMixin, forms.ModelForm):
 
     def clean(self):
 
-        if self.cleaned_data['plaintext']:
+        if self.cleaned_data['plaintext'] and not self.cleaned_data['session_key']:
             validate_rsa_key(self.cleaned_data['private_key'])
 
         if self.cleaned_data['plaintext'] != self.cleaned_data['plaintext2']:
@@ -85,9 +86,28 @@ class SecretFromCSVForm(forms.ModelForm):
         return s
 
 
-class SecretImportForm(BootstrapMixin, BulkImportForm):
-    private_key = forms.CharField(widget=forms.HiddenInput())
-    csv = CSVDataField(csv_form=SecretFromCSVForm, widget=forms.Textarea(attrs={'class': 'requires-private-key'}))
+class SecretImportForm(BootstrapMixin, forms.Form):
+    private_key = forms.CharField(required=False, widget=forms.HiddenInput())
+    session_key = forms.CharField(required=False, widget=forms.HiddenInput())
+    csv = CSVDataField(csv_form=SecretFromCSVForm, required=False,
+                       widget=forms.Textarea(attrs={'class': 'requires-private-key'}))
+    csv_file = forms.FileField(required=False, label='CSV file', help_text="Alternatively, upload a CSV file.",
+                               widget=forms.ClearableFileInput(attrs={'class': 'requires-private-key'}))
+
+    def clean(self):
+
+        if not self.cleaned_data.get('session_key') and not self.cleaned_data.get('private_key'):
+            raise forms.ValidationError("Your private key is required to encrypt secret data.")
+
+        # Records are validated in bulk by the SecretImporter rather than individually by SecretFromCSVForm.
+        if self.cleaned_data.get('csv_file'):
+            try:
+                data = self.cleaned_data['csv_file'].read().decode('utf-8')
+            except UnicodeDecodeError:
+                raise forms.ValidationError({'csv_file': "The uploaded file must be UTF-8 encoded."})
+            self.cleaned_data['csv'] = self.fields['csv'].to_python(data)
+        elif not self.cleaned_data.get('csv'):
+            raise forms.ValidationError("Please enter CSV data or upload a CSV file.")
 
 
 class SecretBulkEditForm(BootstrapMixin, BulkEditForm):
@@ -0,0 +1,78 @@
+from Crypto.PublicKey import RSA
+
+from django.conf import settings
+from django.db import connection
+from django.utils.encoding import force_text
+
+from .models import KeyPair
+
+
+# RSA key sizes supported by the key generator API
+KEY_SIZES = list(range(2048, 4097, 256))
+DEFAULT_KEY_SIZE = 2048
+
+# Number of attempts to take a key pair from the pool when competing with concurrent requests
+TAKE_ATTEMPTS = 3
+
+
+def generate_keypair(key_size):
+    """
+    Generate a new RSA key pair, returning a tuple of the private and public keys in PEM format.
+    """
+    key = RSA.generate(key_size)
+    return force_text(key.exportKey('PEM')), force_text(key.publickey().exportKey('PEM'))
+
+
+def take_keypair(key_size):
+    """
+    Remove a key pair of the given size from the pool, returning a tuple of the private and public keys in PEM format
+    (or None if the pool is empty). Selecting and deleting the key pair is a single statement, so no key pair can be
+    issued twice.
+    """
+    sql = """
+        DELETE FROM {table} WHERE id = (
+            SELECT id FROM {table} WHERE key_size = %s ORDER BY id LIMIT 1 FOR UPDATE
+        ) RETURNING public_key, private_key_cipher
+    """.format(table=KeyPair._meta.db_table)
+
+    for i in range(TAKE_ATTEMPTS):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [key_size])
+            row = cursor.fetchone()
+        if row is not None:
+            keypair = KeyPair(key_size=key_size, public_key=row[0], private_key_cipher=row[1])
+            return keypair.get_private_key(), keypair.public_key
+        # A concurrent request may have taken the row we selected; try again only if the pool is not exhausted.
+        if not KeyPair.objects.filter(key_size=key_size).exists():
+            break
+
+    return None
+
+
+def get_keypair(key_size):
+    """
+    Return a new key pair of the given size, from the pool if one is available or else generated on demand.
+    """
+    return take_keypair(key_size) or generate_keypair(key_size)
+
+
+def fill_keypair_pool(pool_size=None, key_sizes=None, callback=None):
+    """
+    Generate key pairs until the pool holds `pool_size` (default: SECRETS_KEYPAIR_POOL_SIZE) key pairs of each size.
+    `callback` is called with the size of each key pair generated. Returns the number of key pairs generated.
+    """
+    if pool_size is None:
+        pool_size = settings.SECRETS_KEYPAIR_POOL_SIZE
+    generated = 0
+
+    for key_size in key_sizes or KEY_SIZES:
+        for i in range(pool_size - KeyPair.objects.filter(key_size=key_size).count()):
+            private_key, public_key = generate_keypair(key_size)
+            keypair = KeyPair(key_size=key_size, public_key=public_key)
+            keypair.set_private_key(private_key)
+            keypair.save()
+            generated += 1
+            if callback is not None:
+                callback(key_size)
+
+    return generated
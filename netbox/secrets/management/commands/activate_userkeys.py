@@ -0,0 +1,54 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from secrets.bulk import CHUNK_SIZE, UserKeyActivator
+from secrets.models import UserKey
+
+
+class Command(BaseCommand):
+    help = "Activate user keys in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*', metavar='username',
+                            help="Users whose keys are to be activated (default: all inactive user keys)")
+        parser.add_argument('-u', '--user', dest='username', required=True,
+                            help="User whose active user key is used to retrieve the master key")
+        parser.add_argument('-k', '--private-key', dest='private_key', required=True,
+                            help="File containing the user's private RSA key")
+        parser.add_argument('-b', '--batch-size', dest='batch_size', type=int, default=CHUNK_SIZE,
+                            help="Number of user keys to update at a time (default: {})".format(CHUNK_SIZE))
+        parser.add_argument('-p', '--processes', dest='processes', type=int,
+                            help="Number of worker processes (default: SECRETS_DECRYPTION_PROCESSES)")
+
+    def handle(self, *args, **options):
+
+        if options['batch_size'] < 1:
+            raise CommandError("Batch size must be a positive integer.")
+
+        try:
+            uk = UserKey.objects.get(user=User.objects.get(username=options['username']))
+        except (User.DoesNotExist, UserKey.DoesNotExist):
+            raise CommandError("No user key found for user {}.".format(options['username']))
+        if not uk.is_active():
+            raise CommandError("The user key for {} has not been activated.".format(options['username']))
+        with io.open(options['private_key'], encoding='utf-8') as f:
+            master_key = uk.get_master_key(f.read())
+        if master_key is None:
+            raise CommandError("Invalid private key.")
+
+        userkeys = UserKey.objects.filter(master_key_cipher__isnull=True).exclude(public_key='')
+        if options['usernames']:
+            userkeys = userkeys.filter(user__username__in=options['usernames'])
+        userkeys = list(userkeys.select_related('user'))
+        if not userkeys:
+            self.stdout.write("No inactive user keys found.")
+            return
+
+        self.stdout.write("Activating {} user keys...".format(len(userkeys)))
+        activator = UserKeyActivator(master_key, processes=options['processes'], chunk_size=options['batch_size'])
+        for userkey in activator.activate(userkeys):
+            self.stdout.write("Activated user key for {}".format(userkey.user))
+
+        self.stdout.write("Finished.")
@@ -0,0 +1,45 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from secrets.keypairs import KEY_SIZES, fill_keypair_pool
+
+
+class Command(BaseCommand):
+    help = "Generate RSA key pairs to refill the pool from which new user keys are issued"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--pool-size', dest='pool_size', type=int,
+                            default=getattr(settings, 'SECRETS_KEYPAIR_POOL_SIZE', 5),
+                            help="Number of key pairs of each size to keep available (default: "
+                                 "SECRETS_KEYPAIR_POOL_SIZE)")
+        parser.add_argument('-s', '--key-size', dest='key_sizes', type=int, action='append',
+                            help="Key size to generate (may be repeated; default: all supported sizes)")
+        parser.add_argument('-d', '--daemon', action='store_true', dest='daemon', default=False,
+                            help="Run continuously, checking the pool every --interval seconds")
+        parser.add_argument('-i', '--interval', dest='interval', type=int, default=10,
+                            help="Number of seconds between checks of the pool when running as a daemon (default: 10)")
+
+    def handle(self, *args, **options):
+
+        if options['pool_size'] < 1:
+            raise CommandError("Pool size must be a positive integer.")
+        for key_size in options['key_sizes'] or []:
+            if key_size not in KEY_SIZES:
+                raise CommandError("Unsupported key size: {}. Key sizes must be a multiple of 256 between {} and {}."
+                                   .format(key_size, KEY_SIZES[0], KEY_SIZES[-1]))
+
+        def callback(key_size):
+            if options['verbosity'] > 1:
+                self.stdout.write("Generated a {}-bit key pair".format(key_size))
+
+        while True:
+            generated = fill_keypair_pool(options['pool_size'], options['key_sizes'], callback)
+            if generated or not options['daemon']:
+                self.stdout.write("Generated {} key pairs.".format(generated))
+            if not options['daemon']:
+                break
+            connection.close()
+            time.sleep(options['interval'])
@@ -0,0 +1,61 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from secrets.bulk import CHUNK_SIZE, SecretImporter
+from secrets.forms import SecretFromCSVForm
+from secrets.models import UserKey
+from utilities.forms import CSVDataField
+
+
+class Command(BaseCommand):
+    help = "Import secrets in bulk from a CSV file (device,role,name,plaintext)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_file', help="CSV file containing one secret per line")
+        parser.add_argument('-u', '--user', dest='username', required=True,
+                            help="User whose user key is used to retrieve the master key")
+        parser.add_argument('-k', '--private-key', dest='private_key', required=True,
+                            help="File containing the user's private RSA key")
+        parser.add_argument('-b', '--batch-size', dest='batch_size', type=int, default=CHUNK_SIZE,
+                            help="Number of secrets to encrypt and insert at a time (default: {})".format(CHUNK_SIZE))
+        parser.add_argument('-p', '--processes', dest='processes', type=int,
+                            help="Number of worker processes (default: SECRETS_DECRYPTION_PROCESSES)")
+
+    def handle(self, *args, **options):
+
+        if options['batch_size'] < 1:
+            raise CommandError("Batch size must be a positive integer.")
+
+        try:
+            uk = UserKey.objects.get(user=User.objects.get(username=options['username']))
+        except (User.DoesNotExist, UserKey.DoesNotExist):
+            raise CommandError("No user key found for user {}.".format(options['username']))
+        if not uk.is_active():
+            raise CommandError("The user key for {} has not been activated.".format(options['username']))
+        with io.open(options['private_key'], encoding='utf-8') as f:
+            master_key = uk.get_master_key(f.read())
+        if master_key is None:
+            raise CommandError("Invalid private key.")
+
+        with io.open(options['csv_file'], encoding='utf-8') as f:
+            try:
+                records = CSVDataField(csv_form=SecretFromCSVForm).to_python(f.read())
+            except ValidationError as e:
+                raise CommandError('\n'.join(e.messages))
+
+        def progress(done, total):
+            self.stdout.write("Imported {}/{} secrets".format(done, total))
+
+        importer = SecretImporter(master_key, processes=options['processes'], chunk_size=options['batch_size'],
+                                  progress=progress)
+        try:
+            secrets = importer.prepare(records)
+        except ValidationError as e:
+            raise CommandError('\n'.join(e.messages))
+        self.stdout.write("Validated {} secrets; encrypting...".format(len(secrets)))
+        importer.save(secrets)
+
+        self.stdout.write("Finished.")
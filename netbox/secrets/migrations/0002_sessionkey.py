@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secrets', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionKey',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cipher', models.BinaryField(editable=False, max_length=48)),
+                ('hash', models.CharField(editable=False, max_length=64, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('expires', models.DateTimeField(db_index=True, editable=False)),
+                ('userkey', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='session_keys', to='secrets.UserKey')),
+            ],
+            options={
+                'ordering': ['userkey__user__username', '-created'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('secrets', '0002_sessionkey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KeyPair',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key_size', models.PositiveSmallIntegerField(db_index=True)),
+                ('public_key', models.TextField()),
+                ('private_key_cipher', models.BinaryField(editable=False, max_length=4096)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['key_size', 'pk'],
+            },
+        ),
+    ]
@@ -1,4 +1,7 @@
+import base64
+import hashlib
 import os
+from datetime import timedelta
 from Crypto.Cipher import AES, PKCS1_OAEP
 from Crypto.PublicKey import RSA
 
@@ -8,6 +11,8 @@ from django.contrib.auth.models import Group, User
 from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
 from django.db import models
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
 from django.utils.encoding import force_bytes
 
 from dcim.models import Device
@@ -41,6 +46,14 @@ def decrypt_master_key(master_key_cipher, private_key):
     return cipher.decrypt(master_key_cipher)
 
 
+def hash_session_key(session_key):
+    """
+    Return the SHA256 hash of a session key. (Session keys are random 256-bit values, so a single round of hashing is
+    sufficient.)
+    """
+    return hashlib.sha256(session_key).hexdigest()
+
+
 class UserKeyQuerySet(models.QuerySet):
 
     def active(self):
@@ -115,8 +128,10 @@ class UserKey(CreatedUpdatedModel):
     def save(self, *args, **kwargs):
 
         # Check whether public_key has been modified. If so, nullify the initial master_key_cipher.
+        revoke_session_keys = False
         if self.__initial_master_key_cipher and self.public_key != self.__initial_public_key:
             self.master_key_cipher = None
+            revoke_session_keys = True
 
         # If no other active UserKeys exist, generate a new master key and use it to activate this UserKey.
         if self.is_filled() and not self.is_active() and not UserKey.objects.active().count():
@@ -125,6 +140,10 @@ class UserKey(CreatedUpdatedModel):
 
         super(UserKey, self).save(*args, **kwargs)
 
+        # Session keys issued under the old public key must no longer grant access to the master key.
+        if revoke_session_keys:
+            self.session_keys.all().delete()
+
     def delete(self, *args, **kwargs):
 
         # If Secrets exist and this is the last active UserKey, prevent its deletion. Deleting the last UserKey will
@@ -169,6 +188,139 @@ class UserKey(CreatedUpdatedModel):
         self.master_key_cipher = encrypt_master_key(master_key, self.public_key)
         self.save()
 
+    def create_session_key(self, master_key):
+        """
+        Store a copy of the master key encrypted with a new random session key, which expires after
+        SECRETS_SESSION_KEY_TTL seconds. Returns the SessionKey and the base64-encoded session key needed to unlock it.
+        """
+        self.session_keys.expired().delete()
+        session_key = os.urandom(32)
+        sk = SessionKey(userkey=self, expires=timezone.now() + timedelta(seconds=settings.SECRETS_SESSION_KEY_TTL))
+        sk.encrypt(master_key, session_key)
+        sk.save()
+        return sk, base64.b64encode(session_key).decode()
+
+    def get_master_key_by_session_key(self, session_key):
+        """
+        Given a base64-encoded session key, return the master key. Returns None if the session key is invalid or has
+        expired.
+        """
+        try:
+            session_key = base64.b64decode(force_bytes(session_key))
+        except (TypeError, ValueError):
+            return None
+        try:
+            sk = self.session_keys.active().get(hash=hash_session_key(session_key))
+        except SessionKey.DoesNotExist:
+            return None
+        return sk.get_master_key(session_key)
+
+    def unlock(self, private_key=None, session_key=None):
+        """
+        Return the master key using either a session key or the User's private key. The session key is tried first, as
+        it requires only an AES operation rather than RSA decryption. Returns None if neither key is valid.
+        """
+        master_key = None
+        if session_key:
+            master_key = self.get_master_key_by_session_key(session_key)
+        if master_key is None and private_key:
+            master_key = self.get_master_key(private_key)
+        return master_key
+
+
+class SessionKeyQuerySet(models.QuerySet):
+
+    def active(self):
+        return self.filter(expires__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires__lte=timezone.now())
+
+
+class SessionKey(models.Model):
+    """
+    A SessionKey stores a copy of the master key encrypted with a random, short-lived session key. The session key is
+    returned to the user upon unlocking their UserKey, and may be presented in place of their private key until it
+    expires, avoiding an RSA decryption for every request. Only a hash of the session key itself is stored.
+    """
+    userkey = models.ForeignKey(UserKey, related_name='session_keys', on_delete=models.CASCADE, editable=False)
+    cipher = models.BinaryField(max_length=48, editable=False)
+    hash = models.CharField(max_length=64, unique=True, editable=False)
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(db_index=True, editable=False)
+
+    objects = SessionKeyQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['userkey__user__username', '-created']
+
+    def __unicode__(self):
+        return u'{} ({})'.format(self.userkey, self.created)
+
+    def is_expired(self):
+        return self.expires <= timezone.now()
+    is_expired.boolean = True
+
+    def encrypt(self, master_key, session_key):
+        """
+        Encrypt the master key with the session key and record the hash of the session key.
+        """
+        iv = os.urandom(16)
+        aes = AES.new(session_key, AES.MODE_CFB, iv)
+        self.cipher = iv + aes.encrypt(master_key)
+        self.hash = hash_session_key(session_key)
+
+    def get_master_key(self, session_key):
+        """
+        Given the session key, return the decrypted master key (or None if the session key does not match).
+        """
+        if not constant_time_compare(self.hash, hash_session_key(session_key)):
+            return None
+        cipher = force_bytes(self.cipher)
+        aes = AES.new(session_key, AES.MODE_CFB, cipher[0:16])
+        return aes.decrypt(cipher[16:])
+
+
+class KeyPair(models.Model):
+    """
+    A pre-generated RSA key pair, held in a pool from which the key generator API issues new key pairs without having
+    to generate them on demand. The private key is stored encrypted with a key derived from SECRET_KEY. Each KeyPair is
+    deleted as it is issued.
+    """
+    key_size = models.PositiveSmallIntegerField(db_index=True)
+    public_key = models.TextField()
+    private_key_cipher = models.BinaryField(max_length=4096, editable=False)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['key_size', 'pk']
+
+    def __unicode__(self):
+        return u'{}-bit key pair'.format(self.key_size)
+
+    def set_private_key(self, private_key):
+        """
+        Encrypt and store the private key.
+        """
+        iv = os.urandom(16)
+        aes = AES.new(get_keypair_encryption_key(), AES.MODE_CFB, iv)
+        self.private_key_cipher = iv + aes.encrypt(force_bytes(private_key))
+
+    def get_private_key(self):
+        """
+        Return the decrypted private key.
+        """
+        cipher = force_bytes(self.private_key_cipher)
+        aes = AES.new(get_keypair_encryption_key(), AES.MODE_CFB, cipher[0:16])
+        return aes.decrypt(cipher[16:]).decode('utf-8')
+
+
+def get_keypair_encryption_key():
+    """
+    Derive the 256-bit AES key with which pre-generated private keys are stored from SECRET_KEY.
+    """
+    return hashlib.sha256(force_bytes('keypair:' + settings.SECRET_KEY)).digest()
+
 
 class SecretRole(models.Model):
     """
@@ -0,0 +1,55 @@
+import json
+
+from Crypto.PublicKey import RSA
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+from secrets.models import Secret, SecretRole, UserKey, generate_master_key
+
+
+class SecretListDecryptionTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'admin')
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+        master_key = generate_master_key()
+        userkey = UserKey(user=user, public_key=RSA.generate(2048).publickey().exportKey('PEM'))
+        userkey.activate(master_key)
+        self.session_key = userkey.create_session_key(master_key)[1]
+
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        device = Device.objects.create(name='Device 1', rack=rack, device_type=device_type, device_role=device_role)
+        role = SecretRole.objects.create(name='Role 1', slug='role-1')
+        for i in range(2):
+            secret = Secret(device=device, role=role, name='Secret {}'.format(i), plaintext='Plaintext {}'.format(i))
+            secret.encrypt(master_key)
+            secret.save()
+        self.url = reverse('secrets-api:secret_list')
+
+    def test_decrypt(self):
+
+        response = self.client.get(self.url, {'format': 'json'}, HTTP_X_SESSION_KEY=self.session_key)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(b''.join(response.streaming_content).decode())
+        self.assertEqual([s['plaintext'] for s in data], ['Plaintext 0', 'Plaintext 1'])
+
+    def test_decrypt_invalid(self):
+
+        Secret.objects.filter(name='Secret 1').update(hash='invalid')
+
+        response = self.client.get(self.url, {'format': 'json'}, HTTP_X_SESSION_KEY=self.session_key)
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertIn(str(Secret.objects.get(name='Secret 1').pk), response.data['error'])
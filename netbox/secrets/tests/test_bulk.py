@@ -0,0 +1,155 @@
+from Crypto.PublicKey import RSA
+
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+from secrets.bulk import (
+    PARALLEL_THRESHOLD, SecretDecryptionError, SecretDecryptor, SecretImporter, UserKeyActivator, get_member_roles,
+    get_shared_pool,
+)
+from secrets.models import Secret, SecretRole, UserKey, generate_master_key
+
+
+class SecretDecryptorTestCase(TestCase):
+
+    def setUp(self):
+        self.master_key = generate_master_key()
+        self.user = User.objects.create_user(username='alice', password='alice')
+        group = Group.objects.create(name='Group 1')
+        self.user.groups.add(group)
+
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        self.device = Device.objects.create(name='Device 1', rack=rack, device_type=device_type,
+                                            device_role=device_role)
+
+        self.user_role = SecretRole.objects.create(name='Role 1', slug='role-1')
+        self.user_role.users.add(self.user)
+        self.group_role = SecretRole.objects.create(name='Role 2', slug='role-2')
+        self.group_role.groups.add(group)
+        self.other_role = SecretRole.objects.create(name='Role 3', slug='role-3')
+
+    def create_secrets(self, role, count):
+        for i in range(count):
+            secret = Secret(device=self.device, role=role, name='{} {}'.format(role.name, i),
+                            plaintext='Secret {}'.format(i))
+            secret.encrypt(self.master_key)
+            secret.save()
+
+    def test_member_roles(self):
+
+        self.assertEqual(get_member_roles(self.user), {self.user_role.pk, self.group_role.pk})
+        self.user.is_superuser = True
+        self.assertIsNone(get_member_roles(self.user))
+
+    def test_decrypt_chunks(self):
+
+        self.create_secrets(self.user_role, 2)
+        self.create_secrets(self.other_role, 2)
+
+        decryptor = SecretDecryptor(self.user, self.master_key)
+        secrets = [s for chunk in decryptor.decrypt_chunks(Secret.objects.order_by('pk'), chunk_size=3) for s in chunk]
+
+        self.assertEqual([s.plaintext for s in secrets], ['Secret 0', 'Secret 1', None, None])
+
+    def test_decrypt_parallel(self):
+
+        self.create_secrets(self.group_role, PARALLEL_THRESHOLD)
+
+        decryptor = SecretDecryptor(self.user, self.master_key, processes=2)
+        secrets = decryptor.decrypt(Secret.objects.order_by('pk'))
+        decryptor.close()
+
+        self.assertEqual([s.plaintext for s in secrets], ['Secret {}'.format(i) for i in range(PARALLEL_THRESHOLD)])
+        self.assertIs(get_shared_pool(2), get_shared_pool(2))
+
+    def test_decrypt_invalid(self):
+
+        self.create_secrets(self.user_role, 2)
+        Secret.objects.filter(name='Role 1 1').update(hash='invalid')
+
+        decryptor = SecretDecryptor(self.user, self.master_key)
+        with self.assertRaises(SecretDecryptionError) as cm:
+            decryptor.decrypt(Secret.objects.order_by('pk'))
+
+        self.assertEqual([s.name for s in cm.exception.secrets], ['Role 1 1'])
+
+
+class SecretImporterTestCase(TestCase):
+
+    def setUp(self):
+        self.master_key = generate_master_key()
+
+        site = Site.objects.create(name='Site 1', slug='site-1')
+        rack = Rack.objects.create(name='Rack 1', site=site)
+        manufacturer = Manufacturer.objects.create(name='Manufacturer 1', slug='manufacturer-1')
+        device_type = DeviceType.objects.create(manufacturer=manufacturer, model='Device Type 1', slug='device-type-1')
+        device_role = DeviceRole.objects.create(name='Device Role 1', slug='device-role-1')
+        Device.objects.create(name='Device 1', rack=rack, device_type=device_type, device_role=device_role)
+        SecretRole.objects.create(name='Role 1', slug='role-1')
+
+    def test_import(self):
+
+        progress = []
+        importer = SecretImporter(self.master_key, chunk_size=2, progress=lambda done, total: progress.append(done))
+        records = [
+            {'device': 'Device 1', 'role': 'Role 1', 'name': 'user{}'.format(i), 'plaintext': 'Secret {}'.format(i)}
+            for i in range(3)
+        ]
+        importer.save(importer.prepare(records))
+
+        self.assertEqual(progress, [2, 3])
+        secrets = Secret.objects.order_by('name')
+        self.assertEqual([s.name for s in secrets], ['user0', 'user1', 'user2'])
+        secret = secrets[0]
+        secret.decrypt(self.master_key)
+        self.assertEqual(secret.plaintext, 'Secret 0')
+
+    def test_invalid_records(self):
+
+        importer = SecretImporter(self.master_key)
+        records = [
+            {'device': 'Device 1', 'role': 'Role 1', 'name': 'root', 'plaintext': 'Secret'},
+            {'device': 'Device 2', 'role': 'Role 1', 'name': 'root', 'plaintext': 'Secret'},
+            {'device': 'Device 1', 'role': 'Role 2', 'name': 'root', 'plaintext': 'Secret'},
+            {'device': 'Device 1', 'role': 'Role 1', 'name': 'root', 'plaintext': 'Secret'},
+        ]
+        with self.assertRaises(ValidationError) as cm:
+            importer.prepare(records)
+
+        self.assertEqual([m.split(' ')[1] for m in cm.exception.messages], ['2', '3', '4:'])
+
+
+class UserKeyActivatorTestCase(TestCase):
+
+    def setUp(self):
+        key_size = getattr(settings, 'SECRETS_MIN_PUBKEY_SIZE', 2048)
+        self.private_keys = {}
+        for username in ['alice', 'bob', 'carol']:
+            key = RSA.generate(key_size)
+            self.private_keys[username] = key.exportKey('PEM')
+            UserKey.objects.create(user=User.objects.create_user(username=username, password=username),
+                                   public_key=key.publickey().exportKey('PEM'))
+        UserKey.objects.create(user=User.objects.create_user(username='dave', password='dave'))
+
+    def test_activate(self):
+
+        # The first UserKey created is activated with a new master key.
+        master_key = UserKey.objects.get(user__username='alice').get_master_key(self.private_keys['alice'])
+        self.assertIsNotNone(master_key)
+
+        activated = UserKeyActivator(master_key, chunk_size=1).activate(
+            UserKey.objects.filter(master_key_cipher__isnull=True).order_by('user__username')
+        )
+
+        self.assertEqual([uk.user.username for uk in activated], ['bob', 'carol'])
+        for username in ['bob', 'carol']:
+            uk = UserKey.objects.get(user__username=username)
+            self.assertEqual(uk.get_master_key(self.private_keys[username]), master_key)
+        self.assertFalse(UserKey.objects.get(user__username='dave').is_active())
@@ -1,11 +1,14 @@
+import base64
 from Crypto.PublicKey import RSA
 
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.test import TestCase
+from django.utils import timezone
 
-from secrets.models import UserKey, Secret, generate_master_key, encrypt_master_key, decrypt_master_key
+from secrets.keypairs import fill_keypair_pool, take_keypair
+from secrets.models import KeyPair, UserKey, Secret, generate_master_key, encrypt_master_key, decrypt_master_key
 from secrets.hashers import SecretValidationHasher
 
 
@@ -80,6 +83,23 @@ class UserKeyTestCase(TestCase):
         except ValueError:
             pass
 
+    def test_06_session_key(self):
+        """
+        Test the retrieval of a master key using a session key, and the rejection of invalid or expired session keys.
+        """
+        master_key = generate_master_key()
+        alice_uk = UserKey(user=User.objects.get(username='alice'), public_key=self.TEST_KEYS['alice_public'])
+        alice_uk.activate(master_key)
+        sk, session_key = alice_uk.create_session_key(master_key)
+        self.assertEqual(master_key, alice_uk.get_master_key_by_session_key(session_key),
+                         "Master key retrieval failed with correct session key")
+        self.assertIsNone(alice_uk.get_master_key_by_session_key(base64.b64encode(generate_master_key())),
+                          "Master key retrieved with an invalid session key")
+        sk.expires = timezone.now()
+        sk.save()
+        self.assertIsNone(alice_uk.get_master_key_by_session_key(session_key),
+                          "Master key retrieved with an expired session key")
+
 
 class SecretTestCase(TestCase):
 
@@ -130,3 +150,22 @@ class SecretTestCase(TestCase):
         self.assertEqual(duplicate_ivs, [], "One or more duplicate IVs found!")
         duplicate_ciphertexts = [i for i, x in enumerate(ciphertexts) if ciphertexts.count(x) > 1]
         self.assertEqual(duplicate_ciphertexts, [], "One or more duplicate ciphertexts (first blocks) found!")
+
+
+class KeyPairTestCase(TestCase):
+
+    def test_01_pool(self):
+        """
+        Test the filling of the key pair pool and the issuance of each key pair exactly once.
+        """
+        self.assertEqual(fill_keypair_pool(pool_size=2, key_sizes=[2048]), 2)
+        self.assertEqual(fill_keypair_pool(pool_size=2, key_sizes=[2048]), 0)
+        private_key_cipher = bytes(KeyPair.objects.first().private_key_cipher)
+        self.assertNotIn(b'PRIVATE', private_key_cipher, "Private key stored as plaintext")
+
+        keypairs = [take_keypair(2048), take_keypair(2048)]
+        self.assertIsNone(take_keypair(2048), "Key pair issued from an empty pool")
+        self.assertNotEqual(keypairs[0][1], keypairs[1][1], "Key pair issued more than once")
+        for private_key, public_key in keypairs:
+            key = RSA.importKey(private_key)
+            self.assertEqual(key.publickey().exportKey('PEM'), public_key.encode())
@@ -1,8 +1,9 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import permission_required, login_required
 from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.core.exceptions import ValidationError
 from django.core.urlresolvers import reverse
-from django.db import transaction, IntegrityError
+from django.db import IntegrityError
 from django.db.models import Count
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.decorators import method_decorator
@@ -11,6 +12,7 @@ from dcim.models import Device
 from utilities.views import BulkDeleteView, BulkEditView, ObjectDeleteView, ObjectEditView, ObjectListView
 
 from . import filters, forms, tables
+from .bulk import SecretImporter
 from .decorators import userkey_required
 from .models import SecretRole, Secret, UserKey
 
@@ -79,9 +81,9 @@ def secret_add(request, pk):
         if form.is_valid():
 
             # Retrieve the master key from the current user's UserKey
-            master_key = uk.get_master_key(form.cleaned_data['private_key'])
+            master_key = uk.unlock(form.cleaned_data['private_key'], form.cleaned_data['session_key'])
             if master_key is None:
-                form.add_error(None, "Invalid private key! Unable to encrypt secret data.")
+                form.add_error(None, "Invalid private key or session key! Unable to encrypt secret data.")
 
             # Create and encrypt the new Secret
             else:
@@ -121,9 +123,9 @@ def secret_edit(request, pk):
             if form.cleaned_data['plaintext']:
 
                 # Retrieve the master key from the current user's UserKey
-                master_key = uk.get_master_key(form.cleaned_data['private_key'])
+                master_key = uk.unlock(form.cleaned_data['private_key'], form.cleaned_data['session_key'])
                 if master_key is None:
-                    form.add_error(None, "Invalid private key! Unable to encrypt secret data.")
+                    form.add_error(None, "Invalid private key or session key! Unable to encrypt secret data.")
 
                 # Create and encrypt the new Secret
                 else:
@@ -161,23 +163,18 @@ def secret_import(request):
     uk = UserKey.objects.get(user=request.user)
 
     if request.method == 'POST':
-        form = forms.SecretImportForm(request.POST)
+        form = forms.SecretImportForm(request.POST, request.FILES)
         if form.is_valid():
 
-            new_secrets = []
-
             # Retrieve the master key from the current user's UserKey
-            master_key = uk.get_master_key(form.cleaned_data['private_key'])
+            master_key = uk.unlock(form.cleaned_data['private_key'], form.cleaned_data['session_key'])
             if master_key is None:
-                form.add_error(None, "Invalid private key! Unable to encrypt secret data.")
+                form.add_error(None, "Invalid private key or session key! Unable to encrypt secret data.")
 
             else:
+                importer = SecretImporter(master_key)
                 try:
-                    with transaction.atomic():
-                        for secret in form.cleaned_data['csv']:
-                            secret.encrypt(master_key)
-                            secret.save()
-                            new_secrets.append(secret)
+                    new_secrets = importer.save(importer.prepare(form.cleaned_data['csv']))
 
                     table = tables.SecretTable(new_secrets)
                     messages.success(request, u"Imported {} new secrets.".format(len(new_secrets)))
@@ -186,8 +183,10 @@ def secret_import(request):
                         'table': table,
                     })
 
+                except ValidationError as e:
+                    form.add_error('csv', e)
                 except IntegrityError as e:
-                    form.add_error('csv', "Record {}: {}".format(len(new_secrets) + 1, e.__cause__))
+                    form.add_error('csv', "Import failed: {}".format(e.__cause__))
 
     else:
         form = forms.SecretImportForm()
@@ -201,6 +200,7 @@ def secret_import(request):
 class SecretBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'secrets.change_secret'
     cls = Secret
+    filter = filters.SecretFilter
     form = forms.SecretBulkEditForm
     template_name = 'secrets/secret_bulk_edit.html'
     default_redirect_url = 'secrets:secret_list'
@@ -209,4 +209,5 @@ class SecretBulkEditView(PermissionRequiredMixin, BulkEditView):
 class SecretBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'secrets.delete_secret'
     cls = Secret
+    filter = filters.SecretFilter
     default_redirect_url = 'secrets:secret_list'
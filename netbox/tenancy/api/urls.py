@@ -12,5 +12,6 @@ urlpatterns = [
     # Tenants
     url(r'^tenants/$', TenantListView.as_view(), name='tenant_list'),
     url(r'^tenants/(?P<pk>\d+)/$', TenantDetailView.as_view(), name='tenant_detail'),
+    url(r'^tenants/(?P<pk>\d+)/stats/$', TenantStatsView.as_view(), name='tenant_stats'),
 
 ]
@@ -1,9 +1,14 @@
 from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from django.shortcuts import get_object_or_404
 
 from tenancy.models import Tenant, TenantGroup
 from tenancy.filters import TenantFilter
 
 from extras.api.views import CustomFieldModelAPIView
+from extras.stats import get_stats
 from . import serializers
 
 
@@ -38,3 +43,15 @@ class TenantDetailView(CustomFieldModelAPIView, generics.RetrieveAPIView):
     """
     queryset = Tenant.objects.select_related('group').prefetch_related('custom_field_values__field')
     serializer_class = serializers.TenantSerializer
+
+
+class TenantStatsView(APIView):
+    """
+    Retrieve the number of objects of each type assigned to a tenant
+    """
+
+    def get(self, request, pk):
+
+        tenant = get_object_or_404(Tenant, pk=pk)
+
+        return Response(get_stats(tenant))
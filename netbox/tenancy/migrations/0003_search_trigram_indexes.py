@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from utilities.sql import create_trigram_indexes
+
+
+TRIGRAM_INDEXES = (
+    ('tenancy_tenant', 'name'),
+    ('tenancy_tenant', 'description'),
+    ('tenancy_tenant', 'comments'),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0006_install_pg_trgm'),
+        ('tenancy', '0002_tenant_group_optional'),
+    ]
+
+    operations = create_trigram_indexes(TRIGRAM_INDEXES)
@@ -1,10 +1,8 @@
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.shortcuts import get_object_or_404, render
 
-from circuits.models import Circuit
-from dcim.models import Site, Rack, Device
-from ipam.models import IPAddress, Prefix, VLAN, VRF
+from extras.stats import get_stats
 from utilities.views import (
     BulkDeleteView, BulkEditView, BulkImportView, ObjectDeleteView, ObjectEditView, ObjectListView,
 )
@@ -54,22 +52,7 @@ class TenantListView(ObjectListView):
 def tenant(request, slug):
 
     tenant = get_object_or_404(Tenant, slug=slug)
-    stats = {
-        'site_count': Site.objects.filter(tenant=tenant).count(),
-        'rack_count': Rack.objects.filter(tenant=tenant).count(),
-        'device_count': Device.objects.filter(tenant=tenant).count(),
-        'vrf_count': VRF.objects.filter(tenant=tenant).count(),
-        'prefix_count': Prefix.objects.filter(
-            Q(tenant=tenant) |
-            Q(tenant__isnull=True, vrf__tenant=tenant)
-        ).count(),
-        'ipaddress_count': IPAddress.objects.filter(
-            Q(tenant=tenant) |
-            Q(tenant__isnull=True, vrf__tenant=tenant)
-        ).count(),
-        'vlan_count': VLAN.objects.filter(tenant=tenant).count(),
-        'circuit_count': Circuit.objects.filter(tenant=tenant).count(),
-    }
+    stats = get_stats(tenant)
 
     return render(request, 'tenancy/tenant.html', {
         'tenant': tenant,
@@ -103,6 +86,7 @@ class TenantBulkImportView(PermissionRequiredMixin, BulkImportView):
 class TenantBulkEditView(PermissionRequiredMixin, BulkEditView):
     permission_required = 'tenancy.change_tenant'
     cls = Tenant
+    filter = filters.TenantFilter
     form = forms.TenantBulkEditForm
     template_name = 'tenancy/tenant_bulk_edit.html'
     default_redirect_url = 'tenancy:tenant_list'
@@ -111,4 +95,5 @@ class TenantBulkEditView(PermissionRequiredMixin, BulkEditView):
 class TenantBulkDeleteView(PermissionRequiredMixin, BulkDeleteView):
     permission_required = 'tenancy.delete_tenant'
     cls = Tenant
+    filter = filters.TenantFilter
     default_redirect_url = 'tenancy:tenant_list'
@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from .models import Token
+
+
+@admin.register(Token)
+class TokenAdmin(admin.ModelAdmin):
+    list_display = ['user', 'key_prefix', 'description', 'write_enabled', 'created', 'expires']
+    fields = ['user', 'key_prefix', 'description', 'write_enabled', 'expires', 'created']
+    readonly_fields = ['key_prefix', 'created']
+
+    def has_add_permission(self, request):
+        # Tokens are created by their users, so that the key can be displayed to them.
+        return False
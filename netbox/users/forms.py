@@ -1,7 +1,10 @@
+from django import forms
 from django.contrib.auth.forms import AuthenticationForm, PasswordChangeForm as DjangoPasswordChangeForm
 
 from utilities.forms import BootstrapMixin
 
+from .models import Token
+
 
 class LoginForm(BootstrapMixin, AuthenticationForm):
 
@@ -14,3 +17,13 @@ class LoginForm(BootstrapMixin, AuthenticationForm):
 
 class PasswordChangeForm(BootstrapMixin, DjangoPasswordChangeForm):
     pass
+
+
+class TokenForm(BootstrapMixin, forms.ModelForm):
+
+    class Meta:
+        model = Token
+        fields = ['description', 'write_enabled', 'expires']
+        help_texts = {
+            'expires': "Format: YYYY-MM-DD HH:MM:SS (leave blank for a token which does not expire)",
+        }
@@ -0,0 +1,55 @@
+import binascii
+import hashlib
+import os
+
+from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+def generate_token_key():
+    """
+    Generate a new random 160-bit API token key, represented as 40 hexadecimal characters.
+    """
+    return binascii.hexlify(os.urandom(20)).decode()
+
+
+def hash_token_key(key):
+    """
+    Return the SHA256 hash of a token key. (Keys are random, so a single round of hashing is sufficient.)
+    """
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class Token(models.Model):
+    """
+    An API token authenticates REST API requests on behalf of a User. Only a hash of the token's key is stored: the key
+    itself is displayed only once, upon creation. Tokens which are not write-enabled permit only read operations.
+    """
+    user = models.ForeignKey(User, related_name='tokens', on_delete=models.CASCADE)
+    created = models.DateTimeField(auto_now_add=True)
+    expires = models.DateTimeField(blank=True, null=True, help_text="Leave blank for a token which does not expire")
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    key_prefix = models.CharField(max_length=8, editable=False)
+    write_enabled = models.BooleanField(default=True, verbose_name='Write enabled',
+                                        help_text="Permit create, update, and delete operations using this token")
+    description = models.CharField(max_length=100, blank=True)
+
+    class Meta:
+        ordering = ['user__username', '-created']
+
+    def __unicode__(self):
+        return u'{}...'.format(self.key_prefix)
+
+    def set_key(self):
+        """
+        Assign a new random key to the Token, returning the key.
+        """
+        key = generate_token_key()
+        self.key_hash = hash_token_key(key)
+        self.key_prefix = key[:8]
+        return key
+
+    @property
+    def is_expired(self):
+        return self.expires is not None and self.expires <= timezone.now()
@@ -0,0 +1,80 @@
+from datetime import timedelta
+
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
+from rest_framework.test import APIClient, APIRequestFactory
+
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.test import TestCase
+from django.utils import timezone
+
+from netbox.api import TokenAuthentication, token_cache
+from users.models import Token
+
+
+class TokenAuthenticationTestCase(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username='alice', password='alice')
+        self.token = Token(user=self.user, write_enabled=False)
+        self.key = self.token.set_key()
+        self.token.save()
+
+    def authenticate(self, key, method='get'):
+        request = getattr(self.factory, method)('/api/', HTTP_AUTHORIZATION='Token {}'.format(key))
+        return TokenAuthentication().authenticate(request)
+
+    def test_authenticate(self):
+
+        user, token = self.authenticate(self.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.pk, self.token.pk)
+
+        # The second request is authenticated from the cache.
+        with self.assertNumQueries(0):
+            user, token = self.authenticate(self.key)
+        self.assertEqual(user, self.user)
+
+    def test_invalid_token(self):
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate('0' * 40)
+
+    def test_expired_token(self):
+
+        Token.objects.filter(pk=self.token.pk).update(expires=timezone.now() - timedelta(minutes=1))
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(self.key)
+
+    def test_read_only_token(self):
+
+        for method in ('get', 'head', 'options'):
+            user, token = self.authenticate(self.key, method)
+            self.assertEqual(user, self.user)
+        for method in ('post', 'put', 'patch', 'delete'):
+            with self.assertRaises(PermissionDenied):
+                self.authenticate(self.key, method)
+
+        Token.objects.filter(pk=self.token.pk).update(write_enabled=True)
+        token_cache.clear()
+        user, token = self.authenticate(self.key, 'post')
+        self.assertEqual(user, self.user)
+
+    def test_read_only_token_view_permissions(self):
+
+        # Views which set their own permission_classes must not let a read-only token write either.
+        User.objects.filter(pk=self.user.pk).update(is_superuser=True)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token {}'.format(self.key))
+        url = reverse('secrets-api:get_session_key')
+
+        response = client.post(url, {'private_key': ''})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        Token.objects.filter(pk=self.token.pk).update(write_enabled=True)
+        token_cache.clear()
+        response = client.post(url, {'private_key': ''})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -11,5 +11,8 @@ urlpatterns = [
     url(r'^profile/user-key/$', views.userkey, name='userkey'),
     url(r'^profile/user-key/edit/$', views.userkey_edit, name='userkey_edit'),
     url(r'^profile/recent-activity/$', views.recent_activity, name='recent_activity'),
+    url(r'^profile/bulk-deletions/$', views.bulk_deletions, name='bulk_deletions'),
+    url(r'^profile/api-tokens/$', views.api_tokens, name='api_tokens'),
+    url(r'^profile/api-tokens/(?P<pk>\d+)/delete/$', views.token_delete, name='token_delete'),
 
 ]
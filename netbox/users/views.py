@@ -3,13 +3,17 @@ from django.contrib.auth import login as auth_login, logout as auth_logout, upda
 from django.contrib.auth.decorators import login_required
 from django.core.urlresolvers import reverse
 from django.http import HttpResponseRedirect
-from django.shortcuts import redirect, render
+from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.http import is_safe_url
+from django.views.decorators.http import require_POST
 
+from extras.models import BulkDeletion
+from netbox.api import token_cache
 from secrets.forms import UserKeyForm
 from secrets.models import UserKey
 
-from .forms import LoginForm, PasswordChangeForm
+from .forms import LoginForm, PasswordChangeForm, TokenForm
+from .models import Token
 
 
 #
@@ -128,3 +132,54 @@ def recent_activity(request):
         'recent_activity': request.user.actions.all()[:50],
         'active_tab': 'recent_activity',
     })
+
+
+@login_required()
+def bulk_deletions(request):
+
+    bulk_deletions = BulkDeletion.objects.filter(user=request.user).select_related('obj_type')[:20]
+
+    return render(request, 'users/bulk_deletions.html', {
+        'bulk_deletions': bulk_deletions,
+        'in_progress': any(bd.in_progress for bd in bulk_deletions),
+        'active_tab': 'bulk_deletions',
+    })
+
+
+@login_required()
+def api_tokens(request):
+
+    new_key = None
+
+    if request.method == 'POST':
+        form = TokenForm(data=request.POST)
+        if form.is_valid():
+            token = form.save(commit=False)
+            token.user = request.user
+            # The key is displayed only this once; only its hash is stored.
+            new_key = token.set_key()
+            token.save()
+            messages.success(request, u"A new API token has been created.")
+            form = TokenForm()
+
+    else:
+        form = TokenForm()
+
+    return render(request, 'users/api_tokens.html', {
+        'tokens': request.user.tokens.all(),
+        'new_key': new_key,
+        'form': form,
+        'active_tab': 'api_tokens',
+    })
+
+
+@login_required()
+@require_POST
+def token_delete(request, pk):
+
+    token = get_object_or_404(Token, pk=pk, user=request.user)
+    token.delete()
+    token_cache.discard(token.key_hash)
+    messages.success(request, u"API token {} has been deleted.".format(token))
+
+    return redirect('users:api_tokens')
@@ -1,6 +1,447 @@
+from collections import OrderedDict
+from functools import reduce
+from operator import or_
+
+from rest_framework import serializers, status
 from rest_framework.exceptions import APIException
+from rest_framework.permissions import DjangoModelPermissionsOrAnonReadOnly
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
+from rest_framework.views import APIView
+
+from django.conf import settings
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, ProtectedError, Q, Value, When
+from django.utils import timezone
+from django.utils.encoding import force_text
+
+from extras.stats import invalidate_stats
+from netbox.api import optimize_queryset
 
 
 class ServiceUnavailable(APIException):
     status_code = 503
     default_detail = "Service temporarily unavailable, please try again later."
+
+
+class Conflict(APIException):
+    status_code = 409
+    default_detail = "This request conflicts with the current state of the target resource."
+
+
+#
+# Bulk write operations
+#
+
+# Maximum number of objects which may be created, updated, or deleted by a single request
+BULK_MAX_OBJECTS = 1000
+
+# Number of objects written by each INSERT or UPDATE query
+BULK_CHUNK_SIZE = 500
+
+
+def _error_dict(error):
+    """
+    Convert a Django ValidationError to a dictionary of error messages keyed by field name.
+    """
+    if hasattr(error, 'error_dict'):
+        return {
+            api_settings.NON_FIELD_ERRORS_KEY if field == NON_FIELD_ERRORS else field: messages
+            for field, messages in error.message_dict.items()
+        }
+    return {api_settings.NON_FIELD_ERRORS_KEY: error.messages}
+
+
+def _get_pk(item):
+    """
+    Return the ID given for an object (either alone or as its `id` attribute) as an integer, or None if it is invalid.
+    """
+    if isinstance(item, dict):
+        item = item.get('id')
+    try:
+        return int(item)
+    except (TypeError, ValueError):
+        return None
+
+
+def _add_errors(errors, i, error_dict):
+    for field, messages in error_dict.items():
+        errors[i].setdefault(field, []).extend(messages)
+
+
+def find_unique_conflicts(model, objects):
+    """
+    Validate a batch of new or modified objects against each of the model's unique constraints, using a single query
+    per constraint. Objects are checked both against the database (excluding the objects being modified) and against
+    one another. Returns a dictionary mapping the index of each conflicting object to its errors.
+    """
+    opts = model._meta
+    constraints = [(f.name,) for f in opts.local_fields if f.unique and not f.primary_key]
+    constraints += [tuple(unique_together) for unique_together in opts.unique_together]
+    exclude_pks = [obj.pk for obj in objects if obj.pk]
+    errors = {}
+
+    for constraint in constraints:
+        fields = [opts.get_field(name) for name in constraint]
+        attnames = [f.attname for f in fields]
+        error_key = constraint[0] if len(constraint) == 1 else api_settings.NON_FIELD_ERRORS_KEY
+
+        # Map each set of values to the objects having it. (NULL values never conflict.)
+        keys = OrderedDict()
+        for i, obj in enumerate(objects):
+            key = tuple(f.get_prep_value(getattr(obj, f.attname)) for f in fields)
+            if None not in key:
+                keys.setdefault(key, []).append(i)
+        if not keys:
+            continue
+
+        if len(fields) == 1:
+            query = Q(**{'{}__in'.format(attnames[0]): [key[0] for key in keys]})
+        else:
+            query = reduce(or_, [Q(**dict(zip(attnames, key))) for key in keys])
+        existing = set(
+            tuple(f.get_prep_value(v) for f, v in zip(fields, values))
+            for values in model._default_manager.filter(query).exclude(pk__in=exclude_pks).order_by()
+            .values_list(*attnames)
+        )
+
+        for key, indices in keys.items():
+            conflicting = indices if key in existing else indices[1:]
+            for i in conflicting:
+                message = objects[i].unique_error_message(model, constraint).messages
+                errors.setdefault(i, {}).setdefault(error_key, []).extend(message)
+
+    return errors
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    A PrimaryKeyRelatedField which resolves related objects from the cache populated by its BulkListSerializer (with a
+    single query per field for the entire batch) rather than querying for each object.
+    """
+    def to_internal_value(self, data):
+        cache = getattr(self.root, 'related_cache', {}).get(self.field_name)
+        if cache is not None:
+            try:
+                return cache[int(data)]
+            except (KeyError, TypeError, ValueError):
+                pass
+        return super(BulkPrimaryKeyRelatedField, self).to_internal_value(data)
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    Validates and saves a batch of objects. Related objects are retrieved with one query per field and uniqueness is
+    validated with one query per unique constraint, then objects are written with bulk INSERT or UPDATE queries. Errors
+    are reported for each object, in the order in which the objects were given.
+
+    To update objects, pass a queryset as the instance: each object given must then include its `id`.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            return super(BulkListSerializer, self).to_internal_value(data)
+        if len(data) > BULK_MAX_OBJECTS:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ["No more than {} objects may be written at once.".format(
+                    BULK_MAX_OBJECTS
+                )]
+            })
+
+        # Retrieve the objects being updated
+        instances = None
+        if self.instance is not None:
+            pks = [_get_pk(item) if isinstance(item, dict) else None for item in data]
+            instances = self.instance.in_bulk([pk for pk in pks if pk is not None])
+            errors = [{} if pk in instances else {'id': ["Object not found."]} for pk in pks]
+            # Each object may be updated only once, since every copy of it would otherwise be written in turn
+            seen = set()
+            for i, pk in enumerate(pks):
+                if pk in seen and not errors[i]:
+                    errors[i] = {'id': ["Object {} is given more than once.".format(pk)]}
+                seen.add(pk)
+            if any(errors):
+                raise serializers.ValidationError(errors)
+
+        # Retrieve all related objects and validate the fields of each object
+        self.related_cache = self.get_related_objects(data)
+        validated_data = super(BulkListSerializer, self).to_internal_value(data)
+
+        # Build the objects to be written, and validate them individually and as a batch
+        self.objects = []
+        errors = [{} for item in data]
+        for i, attrs in enumerate(validated_data):
+            if instances is None:
+                obj = self.child.Meta.model(**attrs)
+            else:
+                obj = instances[pks[i]]
+                for name, value in attrs.items():
+                    setattr(obj, name, value)
+            self.child.prepare_object(obj)
+            try:
+                self.child.clean_object(obj)
+            except DjangoValidationError as e:
+                _add_errors(errors, i, _error_dict(e))
+            self.objects.append(obj)
+        for i, error_dict in find_unique_conflicts(self.child.Meta.model, self.objects).items():
+            _add_errors(errors, i, error_dict)
+        for i, error_dict in self.child.validate_batch(self.objects).items():
+            _add_errors(errors, i, error_dict)
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return validated_data
+
+    def get_related_objects(self, data):
+        """
+        Retrieve all objects referenced by each related field in a single query per field. Returns a dictionary mapping
+        each field name to a dictionary of objects keyed by primary key.
+        """
+        cache = {}
+        for field in self.child.fields.values():
+            if not isinstance(field, BulkPrimaryKeyRelatedField) or field.read_only:
+                continue
+            pks = set()
+            for item in data:
+                try:
+                    pks.add(int(item[field.field_name]))
+                except (KeyError, TypeError, ValueError):
+                    pass
+            if pks:
+                cache[field.field_name] = field.get_queryset().in_bulk(pks)
+        return cache
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        for i in range(0, len(self.objects), BULK_CHUNK_SIZE):
+            model.objects.bulk_create(self.objects[i:i + BULK_CHUNK_SIZE])
+        self.child.post_create(self.objects)
+        return self.objects
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        opts = model._meta
+        now = timezone.now()
+
+        # Update each chunk of objects with a single query, in which each modified field is set by a CASE expression.
+        # (Fields which were not given for an object retain their current value.) Fields set by prepare_object() are
+        # written for every object.
+        prepared_fields = set(self.child.prepared_fields)
+        objects = list(zip(self.objects, validated_data))
+        for i in range(0, len(objects), BULK_CHUNK_SIZE):
+            chunk = objects[i:i + BULK_CHUNK_SIZE]
+            updates = {}
+            for name in set(name for obj, attrs in chunk for name in attrs) | prepared_fields:
+                field = opts.get_field(name)
+                updates[name] = Case(
+                    *[When(pk=obj.pk, then=Value(getattr(obj, field.attname), output_field=field))
+                      for obj, attrs in chunk if name in attrs or name in prepared_fields],
+                    default=F(name),
+                    output_field=field
+                )
+            if not updates:
+                continue
+            if any(f.name == 'last_updated' for f in opts.fields):
+                updates['last_updated'] = now
+            model.objects.filter(pk__in=[obj.pk for obj, attrs in chunk]).update(**updates)
+
+        self.child.post_update(self.objects)
+        return self.objects
+
+
+class WritableSerializer(serializers.ModelSerializer):
+    """
+    Base class for serializers which create and update objects in bulk (see BulkListSerializer). Related objects are
+    referenced by primary key. Uniqueness is validated for each batch as a whole, so the per-object unique validators
+    which ModelSerializer would otherwise add are omitted.
+
+    Objects are written without calling their save() methods, so any logic therein must be replicated by
+    prepare_object(), post_create(), and/or post_update().
+
+    prepared_fields: The fields set by prepare_object() (beyond those given), which are written on every update
+    """
+    serializer_related_field = BulkPrimaryKeyRelatedField
+    prepared_fields = ()
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+    def build_standard_field(self, field_name, model_field):
+        field_class, field_kwargs = super(WritableSerializer, self).build_standard_field(field_name, model_field)
+        return field_class, self._omit_unique_validators(field_kwargs)
+
+    def build_relational_field(self, field_name, relation_info):
+        field_class, field_kwargs = super(WritableSerializer, self).build_relational_field(field_name, relation_info)
+        return field_class, self._omit_unique_validators(field_kwargs)
+
+    def _omit_unique_validators(self, field_kwargs):
+        if 'validators' in field_kwargs:
+            field_kwargs['validators'] = [v for v in field_kwargs['validators'] if not isinstance(v, UniqueValidator)]
+        return field_kwargs
+
+    def get_validators(self):
+        return []
+
+    def prepare_object(self, obj):
+        """
+        Prepare a new or modified object to be written.
+        """
+        pass
+
+    def clean_object(self, obj):
+        """
+        Validate a single object. Raises a Django ValidationError if the object is invalid.
+        """
+        obj.clean()
+
+    def validate_batch(self, objects):
+        """
+        Validate a batch of objects as a whole (beyond the uniqueness constraints of the model). Returns a dictionary
+        mapping the index of each invalid object to its errors.
+        """
+        return {}
+
+    def post_create(self, objects):
+        pass
+
+    def post_update(self, objects):
+        pass
+
+
+class BulkWriteMixin(object):
+    """
+    Adds bulk create (POST), update (PATCH), and delete (DELETE) operations to a list view. The body of each request is
+    a list of objects (or, for deletion, of object IDs). Every object is validated before any is written, and all are
+    written within a single transaction. The response lists either the resulting objects or the errors for each object,
+    in the order given.
+
+    write_serializer_class: The WritableSerializer used to validate objects
+    """
+    write_serializer_class = None
+
+    def get_permissions(self):
+        return super(BulkWriteMixin, self).get_permissions() + [DjangoModelPermissionsOrAnonReadOnly()]
+
+    def get_bulk_response(self, objects, status):
+        """
+        Serialize the given objects (retrieved anew with all related objects) with the view's serializer.
+        """
+        queryset = optimize_queryset(self.get_queryset(), self.get_serializer_class())
+        objects_by_pk = queryset.in_bulk([obj.pk for obj in objects])
+        serializer = self.get_serializer([objects_by_pk[obj.pk] for obj in objects], many=True)
+        return Response(serializer.data, status=status)
+
+    def write(self, serializer):
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            objects = serializer.save()
+        if settings.STATS_SUMMARY:
+            invalidate_stats(self.get_queryset().model)
+        return objects
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.write_serializer_class(data=request.data, many=True, context=self.get_serializer_context())
+        objects = self.write(serializer)
+        return self.get_bulk_response(objects, status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.write_serializer_class(self.get_queryset(), data=request.data, many=True, partial=True,
+                                                 context=self.get_serializer_context())
+        objects = self.write(serializer)
+        return self.get_bulk_response(objects, status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            raise serializers.ValidationError("Expected a list of object IDs.")
+        if len(request.data) > BULK_MAX_OBJECTS:
+            raise serializers.ValidationError("No more than {} objects may be deleted at once.".format(
+                BULK_MAX_OBJECTS
+            ))
+
+        pks = [_get_pk(item) for item in request.data]
+        queryset = self.get_queryset().filter(pk__in=[pk for pk in pks if pk is not None])
+        found = set(queryset.values_list('pk', flat=True))
+        errors = [{} if pk in found else {'id': ["Object not found."]} for pk in pks]
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        try:
+            with transaction.atomic():
+                queryset.delete()
+        except ProtectedError as e:
+            raise Conflict("Unable to delete: {} dependent objects exist (for example, {}).".format(
+                len(e.protected_objects), e.protected_objects[0]
+            ))
+        if settings.STATS_SUMMARY:
+            invalidate_stats(self.get_queryset().model)
+
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class TypeaheadView(APIView):
+    """
+    Return a lightweight list of objects for use by autocompletion widgets. Only the fields named in `fields` are
+    returned for each object. The query (`q`) is matched using `lookup`; objects matching `prefix_lookup` (if defined)
+    are listed first. No more than `max_results` objects are returned unless a different `limit` (of up to `max_limit`)
+    is specified.
+
+    queryset: The base queryset
+    filter_class: A FilterSet applied to all other query parameters (e.g. `?rack_id=1`)
+    lookup: The lookup used to match the query (e.g. `name__icontains`)
+    prefix_lookup: (Optional) A lookup identifying objects which begin with the query (e.g. `name__istartswith`)
+    ordering: The ordering of objects having equal precedence
+    fields: The object attributes to include for each result
+    """
+    queryset = None
+    filter_class = None
+    lookup = 'name__icontains'
+    prefix_lookup = None
+    ordering = ('name',)
+    fields = ('id', 'name')
+    max_results = 20
+    max_limit = 1000
+
+    def get_queryset(self, request):
+        queryset = self.queryset.all()
+        if self.filter_class:
+            params = request.GET.copy()
+            params.pop('q', None)
+            params.pop('limit', None)
+            queryset = self.filter_class(params, queryset).qs
+        return queryset
+
+    def clean_query(self, query):
+        return query
+
+    def get(self, request):
+
+        queryset = self.get_queryset(request)
+        query = self.clean_query(request.GET.get('q', '').strip())
+        ordering = self.ordering
+
+        if query:
+            queryset = queryset.filter(**{self.lookup: query})
+            if self.prefix_lookup:
+                queryset = queryset.annotate(_prefix_match=Case(
+                    When(then=Value(0), **{self.prefix_lookup: query}),
+                    default=Value(1),
+                    output_field=IntegerField(),
+                ))
+                ordering = ('_prefix_match',) + tuple(ordering)
+        try:
+            limit = min(max(int(request.GET['limit']), 1), self.max_limit)
+        except (KeyError, ValueError):
+            limit = self.max_results
+
+        queryset = queryset.order_by(*ordering)[:limit]
+
+        return Response([
+            {field: self.serialize_value(getattr(obj, field)) for field in self.fields} for obj in queryset
+        ])
+
+    def serialize_value(self, value):
+        if value is None or isinstance(value, (int, bool)):
+            return value
+        return force_text(value)
@@ -0,0 +1,22 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission
+from django.db.models import Q
+
+
+class CachedPermissionsBackend(ModelBackend):
+    """
+    A ModelBackend which retrieves all of a user's permissions (both those assigned directly and those inherited from
+    groups) with a single query. The permissions are cached on the User instance, and thus shared for the duration of a
+    request by views, templates, and REST API permission classes.
+    """
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            if user_obj.is_superuser:
+                perms = Permission.objects.all()
+            else:
+                perms = Permission.objects.filter(Q(user=user_obj) | Q(group__user=user_obj))
+            perms = perms.order_by().distinct().values_list('content_type__app_label', 'codename')
+            user_obj._perm_cache = set('{}.{}'.format(app_label, codename) for app_label, codename in perms)
+        return user_obj._perm_cache
@@ -0,0 +1,292 @@
+import threading
+from datetime import timedelta
+
+from django.contrib.contenttypes.fields import GenericRelation
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection, transaction
+from django.db.models import CASCADE, DO_NOTHING, PROTECT, SET_DEFAULT, SET_NULL, Count, Max, ProtectedError, QuerySet
+from django.db.models.deletion import get_candidate_relations_to_delete
+from django.db.models.signals import post_delete, pre_delete
+from django.utils import timezone
+
+from extras.models import (
+    BulkDeletion, BULK_DELETION_COMPLETED, BULK_DELETION_FAILED, BULK_DELETION_PENDING, BULK_DELETION_RUNNING,
+    UserAction,
+)
+
+
+# Number of objects (together with all objects which cascade from them) deleted by each chunk of a DeletionPlan
+DELETION_CHUNK_SIZE = 100
+
+# Maximum number of protected objects reported when a deletion is prevented
+MAX_PROTECTED_OBJECTS = 10
+
+# Number of seconds after which a background deletion whose progress has not been updated is considered stale
+BULK_DELETION_TIMEOUT = 600
+
+
+def has_delete_signals(model):
+    return pre_delete.has_listeners(model) or post_delete.has_listeners(model)
+
+
+class DeletionNode(object):
+    """
+    A model whose objects are deleted by a DeletionPlan: either the model being deleted, or a model which cascades
+    from it.
+
+    model: The model
+    field: The foreign key relating the model to that of the parent node (None for the root node)
+    children: Nodes for the models which cascade from this one
+    nullify: Tuples of (field, value) for each foreign key to this model which is set to NULL or its default value
+    protected: Foreign keys to this model which prevent its objects from being deleted
+    generic_relations: Generic relations (e.g. custom field values) whose objects are deleted with this model's objects
+    use_collector: Objects are deleted by Django's collector (with signals) rather than by a raw DELETE query
+    """
+
+    def __init__(self, model, field=None):
+        self.model = model
+        self.field = field
+        self.children = []
+        self.nullify = []
+        self.protected = []
+        self.generic_relations = []
+        self.use_collector = has_delete_signals(model)
+
+    def get_queryset(self, parent_queryset):
+        """
+        Return the objects related to those in the parent node's queryset, selected by subquery.
+        """
+        return self.model._base_manager.filter(**{
+            '{}__in'.format(self.field.name): parent_queryset.order_by().values(self.field.target_field.attname)
+        })
+
+
+class DeletionPlan(object):
+    """
+    The cascade of deletions resulting from the deletion of a model's objects, computed once from the model's relations.
+    Objects are deleted in chunks of the model being deleted. Within each chunk, cascaded objects are deleted bottom-up,
+    each model with a single `DELETE ... WHERE fk IN (subquery)`, so that no cascaded object is loaded into memory.
+
+    Django's collector is used instead to delete the objects of any model which has delete signal receivers or which
+    is related to itself (directly or indirectly), and to apply any on_delete behavior other than CASCADE, PROTECT,
+    SET_NULL, SET_DEFAULT, and DO_NOTHING. Because cascaded objects have already been deleted, the collector need only
+    load the objects of that model.
+    """
+    _plans = {}
+
+    def __init__(self, model):
+        self.model = model
+        self.root = self._build_node(model, None, (model,))
+
+    @classmethod
+    def for_model(cls, model):
+        if model not in cls._plans:
+            cls._plans[model] = cls(model)
+        return cls._plans[model]
+
+    def _build_node(self, model, field, path):
+        node = DeletionNode(model, field)
+
+        for relation in get_candidate_relations_to_delete(model._meta):
+            related_field = relation.field
+            on_delete = related_field.remote_field.on_delete
+            if on_delete is DO_NOTHING:
+                continue
+            elif on_delete is PROTECT:
+                node.protected.append(related_field)
+            elif on_delete is SET_NULL:
+                node.nullify.append((related_field, None))
+            elif on_delete is SET_DEFAULT:
+                node.nullify.append((related_field, related_field.get_default()))
+            elif on_delete is CASCADE and relation.related_model not in path:
+                node.children.append(
+                    self._build_node(relation.related_model, related_field, path + (relation.related_model,))
+                )
+            else:
+                node.use_collector = True
+
+        for private_field in model._meta.private_fields:
+            if isinstance(private_field, GenericRelation):
+                node.generic_relations.append(private_field)
+
+        return node
+
+    def _iter_nodes(self, node, queryset):
+        yield node, queryset
+        for child in node.children:
+            for descendant in self._iter_nodes(child, child.get_queryset(queryset)):
+                yield descendant
+
+    def find_protected(self, queryset):
+        """
+        Return (up to MAX_PROTECTED_OBJECTS of) the objects which would prevent the deletion of those in the given
+        queryset. Each protecting relation is checked with a single query.
+        """
+        protected = []
+        for node, node_queryset in self._iter_nodes(self.root, queryset):
+            for field in node.protected:
+                if len(protected) >= MAX_PROTECTED_OBJECTS:
+                    return protected
+                protected.extend(field.model._base_manager.filter(**{
+                    '{}__in'.format(field.name): node_queryset.order_by().values(field.target_field.attname)
+                })[:MAX_PROTECTED_OBJECTS - len(protected)])
+        return protected
+
+    def check_protected(self, queryset):
+        """
+        Raise a ProtectedError if the deletion of any object in the given queryset is prevented by a protected
+        relation.
+        """
+        protected = self.find_protected(queryset)
+        if protected:
+            raise ProtectedError(
+                "Cannot delete some instances of model '{}' because they are referenced through a protected foreign "
+                "key".format(self.model.__name__), protected
+            )
+
+    def _delete_node(self, node, queryset, counts):
+        for field, value in node.nullify:
+            field.model._base_manager.filter(**{
+                '{}__in'.format(field.name): queryset.order_by().values(field.target_field.attname)
+            }).update(**{field.name: value})
+
+        for child in node.children:
+            self._delete_node(child, child.get_queryset(queryset), counts)
+
+        for relation in node.generic_relations:
+            related_model = relation.related_model
+            deleted = related_model._base_manager.filter(**{
+                relation.content_type_field_name: ContentType.objects.get_for_model(node.model),
+                '{}__in'.format(relation.object_id_field_name): queryset.order_by().values('pk'),
+            })._raw_delete(queryset.db)
+            counts[related_model._meta.label] = counts.get(related_model._meta.label, 0) + deleted
+
+        if node.use_collector:
+            deleted = queryset.delete()[1]
+        else:
+            deleted = {node.model._meta.label: queryset._raw_delete(queryset.db)}
+        for label, count in deleted.items():
+            counts[label] = counts.get(label, 0) + count
+
+    def delete(self, objects, chunk_size=DELETION_CHUNK_SIZE, progress=None):
+        """
+        Delete the given objects (a queryset or a list of PKs), together with all objects which cascade from them. Each
+        chunk of `chunk_size` objects is deleted within its own transaction; the chunks of a queryset are identified by
+        keyset queries, so its PKs are never all held in memory. An optional `progress` callable is called with the
+        number of objects processed so far after each chunk. Returns a dictionary mapping the label of each model to the
+        number of its objects deleted.
+        """
+        counts = {}
+        processed = 0
+        for chunk in self._iter_chunks(objects, chunk_size):
+            with transaction.atomic():
+                self._delete_node(self.root, self.model._base_manager.filter(pk__in=chunk), counts)
+            processed += len(chunk)
+            if progress is not None:
+                progress(processed)
+        return counts
+
+    def _iter_chunks(self, objects, chunk_size):
+        if not isinstance(objects, QuerySet):
+            for i in range(0, len(objects), chunk_size):
+                yield objects[i:i + chunk_size]
+            return
+        queryset = objects.order_by('pk')
+        last_pk = None
+        while True:
+            chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            chunk = list(chunk_queryset.values_list('pk', flat=True)[:chunk_size])
+            if not chunk:
+                break
+            yield chunk
+            last_pk = chunk[-1]
+
+
+#
+# Background deletion
+#
+
+def start_bulk_deletion(user, model, pk_list=None, filter=None, filter_query=None):
+    """
+    Delete the objects selected either by a FilterSet and its querystring or by a list of PKs in a background thread,
+    returning the BulkDeletion by which its progress is tracked. Deletion begins once the current transaction has been
+    committed. Objects created later which match the filter are not deleted.
+    """
+    job = BulkDeletion(user=user, obj_type=ContentType.objects.get_for_model(model))
+    if filter is not None:
+        job.filter_class = '{}.{}'.format(filter.__module__, filter.__name__)
+        job.filter_query = filter_query
+    else:
+        job.pk_list = ','.join(str(pk) for pk in pk_list)
+    selection = job.get_selected_objects().aggregate(total=Count('pk'), max_pk=Max('pk'))
+    job.total = selection['total']
+    job.max_pk = selection['max_pk']
+    job.save()
+
+    def start():
+        thread = threading.Thread(target=_run_bulk_deletion_thread, args=(job.pk,),
+                                  name='bulk_deletion_{}'.format(job.pk))
+        thread.daemon = True
+        thread.start()
+    transaction.on_commit(start)
+
+    return job
+
+
+def get_stale_bulk_deletions(timeout=BULK_DELETION_TIMEOUT):
+    """
+    Return the bulk deletions which are pending or running, but whose progress has not been updated within `timeout`
+    seconds (most likely because the process running them has exited).
+    """
+    return BulkDeletion.objects.filter(
+        status__in=(BULK_DELETION_PENDING, BULK_DELETION_RUNNING),
+        updated__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+
+
+def run_bulk_deletion(job):
+    """
+    Delete the objects which remain to be deleted by a BulkDeletion. The job is first claimed by updating its status,
+    provided that it has not changed since it was retrieved; returns False if another process has claimed it.
+    """
+    if not BulkDeletion.objects.filter(pk=job.pk, status=job.status, updated=job.updated).update(
+        status=BULK_DELETION_RUNNING, updated=timezone.now()
+    ):
+        return False
+    model = job.obj_type.model_class()
+    processed = job.processed
+
+    def progress(count):
+        BulkDeletion.objects.filter(pk=job.pk).update(processed=processed + count, updated=timezone.now())
+
+    try:
+        counts = DeletionPlan.for_model(model).delete(job.get_queryset(), progress=progress)
+        deleted_count = processed + counts.get(model._meta.label, 0)
+        message = u'Deleted {} {}'.format(deleted_count, model._meta.verbose_name_plural)
+        BulkDeletion.objects.filter(pk=job.pk).update(
+            status=BULK_DELETION_COMPLETED, processed=deleted_count, updated=timezone.now(), completed=timezone.now(),
+            message=message
+        )
+        if job.user is not None:
+            UserAction.objects.log_bulk_delete(job.user, job.obj_type, message)
+    except Exception as e:
+        BulkDeletion.objects.filter(pk=job.pk).update(
+            status=BULK_DELETION_FAILED, updated=timezone.now(), completed=timezone.now(), message=u'{}'.format(e)
+        )
+    return True
+
+
+def fail_bulk_deletion(job, message):
+    """
+    Mark a BulkDeletion as failed, provided that it has not changed since it was retrieved.
+    """
+    return bool(BulkDeletion.objects.filter(pk=job.pk, status=job.status, updated=job.updated).update(
+        status=BULK_DELETION_FAILED, updated=timezone.now(), completed=timezone.now(), message=message
+    ))
+
+
+def _run_bulk_deletion_thread(job_pk):
+    try:
+        run_bulk_deletion(BulkDeletion.objects.select_related('user', 'obj_type').get(pk=job_pk))
+    finally:
+        connection.close()
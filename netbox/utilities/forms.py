@@ -58,6 +58,16 @@ def expand_numeric_pattern(string):
             yield "{}{}{}".format(lead, i, remnant)
 
 
+def expand_name_string(value, limit=None):
+    """
+    Expand a string which may include a numeric pattern (see expand_numeric_pattern()) into a list of strings. If
+    `limit` is given, no more than that many strings are returned.
+    """
+    if re.search(NUMERIC_EXPANSION_PATTERN, value):
+        return list(itertools.islice(expand_numeric_pattern(value), limit))
+    return [value]
+
+
 def expand_ipaddress_pattern(string, family):
     """
     Expand an IP address pattern into a list of strings. Examples:
@@ -82,6 +92,19 @@ def expand_ipaddress_pattern(string, family):
             yield ''.join([lead, format(i, 'x' if family == 6 else 'd'), remnant])
 
 
+def expand_ipaddress_string(value, limit=None):
+    """
+    Expand a string which may include an IPv4 or IPv6 address pattern (see expand_ipaddress_pattern()) into a list of
+    strings. If `limit` is given, no more than that many strings are returned.
+    """
+    # Hackish address family detection but it's all we have to work with
+    if '.' in value and re.search(IP4_EXPANSION_PATTERN, value):
+        return list(itertools.islice(expand_ipaddress_pattern(value, 4), limit))
+    elif ':' in value and re.search(IP6_EXPANSION_PATTERN, value):
+        return list(itertools.islice(expand_ipaddress_pattern(value, 6), limit))
+    return [value]
+
+
 def add_blank_choice(choices):
     """
     Add a blank choice to the beginning of a choices list.
@@ -251,9 +274,7 @@ class ExpandableNameField(forms.CharField):
                              'Example: <code>ge-0/0/[0-47]</code>'
 
     def to_python(self, value):
-        if re.search(NUMERIC_EXPANSION_PATTERN, value):
-            return list(expand_numeric_pattern(value))
-        return [value]
+        return expand_name_string(value)
 
 
 class ExpandableIPAddressField(forms.CharField):
@@ -268,12 +289,7 @@ class ExpandableIPAddressField(forms.CharField):
                              'Example: <code>192.0.2.[1-254]/24</code>'
 
     def to_python(self, value):
-        # Hackish address family detection but it's all we have to work with
-        if '.' in value and re.search(IP4_EXPANSION_PATTERN, value):
-            return list(expand_ipaddress_pattern(value, 4))
-        elif ':' in value and re.search(IP6_EXPANSION_PATTERN, value):
-            return list(expand_ipaddress_pattern(value, 6))
-        return [value]
+        return expand_ipaddress_string(value)
 
 
 class CommentField(forms.CharField):
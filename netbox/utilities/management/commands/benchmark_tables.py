@@ -0,0 +1,300 @@
+from timeit import default_timer
+
+import django_tables2 as tables
+from django_tables2.utils import Accessor
+from netaddr import IPNetwork
+
+from django.core.management.base import BaseCommand, CommandError
+
+from dcim.models import (
+    Device, DeviceRole, DeviceType, Interface, InterfaceConnection, Manufacturer, Rack, RackRole, Site,
+)
+from dcim.tables import DeviceTable, InterfaceConnectionTable, RackTable
+from ipam.models import IPAddress, Prefix, Role, VRF
+from ipam.tables import IPAddressTable, PrefixTable
+from tenancy.models import Tenant
+
+
+#
+# The template columns replaced by format columns, against which they are compared
+#
+
+STATUS_LABEL = """
+{% if record.pk %}
+    <span class="label label-{{ record.get_status_class }}">{{ record.get_status_display }}</span>
+{% else %}
+    <span class="label label-success">Available</span>
+{% endif %}
+"""
+
+PREFIX_LINK = """
+{% if record.has_children %}
+    <span style="padding-left: {{ record.depth }}0px "><i class="fa fa-caret-right"></i></a>
+{% else %}
+    <span style="padding-left: {{ record.depth }}9px">
+{% endif %}
+    <a href="{% if record.pk %}{% url 'ipam:prefix' pk=record.pk %}{% else %}{% url 'ipam:prefix_add' %}?prefix={{ record }}{% if parent.vrf %}&vrf={{ parent.vrf.pk }}{% endif %}{% if parent.site %}&site={{ parent.site.pk }}{% endif %}{% endif %}">{{ record.prefix }}</a>
+</span>
+"""
+
+PREFIX_ROLE_LINK = """
+{% if record.role %}
+    <a href="{% url 'ipam:prefix_list' %}?role={{ record.role.slug }}">{{ record.role }}</a>
+{% else %}
+    &mdash;
+{% endif %}
+"""
+
+PREFIX_UTILIZATION = """
+{% load helpers %}
+{% if value is not None %}{% utilization_graph value %}{% else %}&mdash;{% endif %}
+"""
+
+IPADDRESS_LINK = """
+{% if record.pk %}
+    <a href="{{ record.get_absolute_url }}">{{ record.address }}</a>
+{% elif perms.ipam.add_ipaddress %}
+    <a href="{% url 'ipam:ipaddress_add' %}?address={{ record.1 }}{% if prefix.vrf %}&vrf={{ prefix.vrf.pk }}{% endif %}" class="btn btn-xs btn-success">{% if record.0 <= 65536 %}{{ record.0 }}{% else %}Lots of{% endif %} free IP{{ record.0|pluralize }}</a>
+{% else %}
+    {{ record.0 }}
+{% endif %}
+"""
+
+VRF_LINK = """
+{% if record.vrf %}
+    <a href="{{ record.vrf.get_absolute_url }}">{{ record.vrf }}</a>
+{% elif prefix.vrf %}
+    {{ prefix.vrf }}
+{% else %}
+    Global
+{% endif %}
+"""
+
+TENANT_LINK = """
+{% if record.tenant %}
+    <a href="{% url 'tenancy:tenant' slug=record.tenant.slug %}">{{ record.tenant }}</a>
+{% elif record.vrf.tenant %}
+    <a href="{% url 'tenancy:tenant' slug=record.vrf.tenant.slug %}">{{ record.vrf.tenant }}</a>*
+{% else %}
+    &mdash;
+{% endif %}
+"""
+
+DEVICE_LINK = """
+<a href="{% url 'dcim:device' pk=record.pk %}">
+    {{ record.name|default:'<span class="label label-info">Unnamed device</span>' }}
+</a>
+"""
+
+DEVICE_ROLE = """
+<label class="label" style="background-color: #{{ record.device_role.color }}">{{ value }}</label>
+"""
+
+STATUS_ICON = """
+{% if record.status %}
+    <span class="glyphicon glyphicon-ok-sign text-success" title="Active" aria-hidden="true"></span>
+{% else %}
+    <span class="glyphicon glyphicon-minus-sign text-danger" title="Offline" aria-hidden="true"></span>
+{% endif %}
+"""
+
+RACK_ROLE = """
+{% if record.role %}
+    <label class="label" style="background-color: #{{ record.role.color }}">{{ value }}</label>
+{% else %}
+    &mdash;
+{% endif %}
+"""
+
+UTILIZATION_GRAPH = """
+{% load helpers %}
+{% utilization_graph value %}
+"""
+
+
+class TemplatePrefixTable(PrefixTable):
+    status = tables.TemplateColumn(STATUS_LABEL)
+    prefix = tables.TemplateColumn(PREFIX_LINK)
+    vrf = tables.TemplateColumn(VRF_LINK)
+    tenant = tables.TemplateColumn(TENANT_LINK)
+    site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')])
+    vlan = tables.LinkColumn('ipam:vlan', args=[Accessor('vlan.pk')])
+    role = tables.TemplateColumn(PREFIX_ROLE_LINK)
+    utilization = tables.TemplateColumn(PREFIX_UTILIZATION)
+
+    class Meta(PrefixTable.Meta):
+        pass
+
+
+class TemplateIPAddressTable(IPAddressTable):
+    address = tables.TemplateColumn(IPADDRESS_LINK)
+    status = tables.TemplateColumn(STATUS_LABEL)
+    vrf = tables.TemplateColumn(VRF_LINK)
+    tenant = tables.TemplateColumn(TENANT_LINK)
+    device = tables.LinkColumn('dcim:device', args=[Accessor('interface.device.pk')], orderable=False)
+
+    class Meta(IPAddressTable.Meta):
+        pass
+
+
+class TemplateDeviceTable(DeviceTable):
+    status = tables.TemplateColumn(STATUS_ICON)
+    name = tables.TemplateColumn(DEVICE_LINK)
+    tenant = tables.LinkColumn('tenancy:tenant', args=[Accessor('tenant.slug')])
+    rack = tables.LinkColumn('dcim:rack', args=[Accessor('rack.pk')])
+    device_role = tables.TemplateColumn(DEVICE_ROLE)
+    device_type = tables.LinkColumn('dcim:devicetype', args=[Accessor('device_type.pk')],
+                                    text=lambda record: record.device_type.full_name)
+    primary_ip = tables.TemplateColumn("{{ record.primary_ip.address.ip }}", orderable=False)
+
+    class Meta(DeviceTable.Meta):
+        pass
+
+
+class TemplateRackTable(RackTable):
+    name = tables.LinkColumn('dcim:rack', args=[Accessor('pk')])
+    site = tables.LinkColumn('dcim:site', args=[Accessor('site.slug')])
+    tenant = tables.LinkColumn('tenancy:tenant', args=[Accessor('tenant.slug')])
+    role = tables.TemplateColumn(RACK_ROLE)
+    u_height = tables.TemplateColumn("{{ record.u_height }}U")
+    get_utilization = tables.TemplateColumn(UTILIZATION_GRAPH, orderable=False)
+
+    class Meta(RackTable.Meta):
+        pass
+
+
+class TemplateInterfaceConnectionTable(InterfaceConnectionTable):
+    device_a = tables.LinkColumn('dcim:device', accessor=Accessor('interface_a.device'),
+                                 args=[Accessor('interface_a.device.pk')])
+    device_b = tables.LinkColumn('dcim:device', accessor=Accessor('interface_b.device'),
+                                 args=[Accessor('interface_b.device.pk')])
+
+    class Meta(InterfaceConnectionTable.Meta):
+        pass
+
+
+#
+# Records (unsaved, so that no queries are made while rendering)
+#
+
+SITE = Site(pk=1, name='Site 1', slug='site-1')
+TENANT = Tenant(pk=1, name='Tenant 1', slug='tenant-1')
+VRF_1 = VRF(pk=1, name='VRF 1', rd='65000:1', tenant=TENANT)
+MANUFACTURER = Manufacturer(pk=1, name='Manufacturer 1', slug='manufacturer-1')
+DEVICE_TYPE = DeviceType(pk=1, manufacturer=MANUFACTURER, model='Device Type 1', slug='device-type-1')
+DEVICE_ROLE_1 = DeviceRole(pk=1, name='Device Role 1', slug='device-role-1', color='aa1409')
+RACK_ROLE_1 = RackRole(pk=1, name='Rack Role 1', slug='rack-role-1', color='2196f3')
+RACK_1 = Rack(pk=1, name='Rack 1', site=SITE)
+PREFIX_ROLE = Role(pk=1, name='Role 1', slug='role-1')
+
+
+def get_prefixes(count):
+    prefixes = []
+    for i in range(count):
+        prefix = Prefix(pk=i + 1, prefix=IPNetwork('10.{}.{}.0/24'.format(i // 256 % 256, i % 256)), site=SITE,
+                        vrf=VRF_1 if i % 2 else None, tenant=TENANT if i % 3 else None,
+                        role=PREFIX_ROLE if i % 4 else None)
+        prefix.depth = i % 3
+        prefix.utilization = i % 101
+        prefixes.append(prefix)
+    return prefixes
+
+
+def get_ipaddresses(count):
+    ipaddresses = []
+    for i in range(count):
+        address = IPNetwork('10.{}.{}.{}/16'.format(i // 65536 % 256, i // 256 % 256, i % 256))
+        if i % 10:
+            ipaddresses.append(IPAddress(pk=i + 1, address=address, vrf=VRF_1 if i % 2 else None,
+                                         tenant=TENANT if i % 3 else None))
+        else:
+            # An available range
+            ipaddresses.append((i % 300 + 1, address))
+    return ipaddresses
+
+
+def get_devices(count):
+    devices = []
+    for i in range(count):
+        primary_ip = IPAddress(pk=i + 1, address=IPNetwork('10.0.{}.{}/16'.format(i // 256 % 256, i % 256)))
+        devices.append(Device(pk=i + 1, name='Device {}'.format(i) if i % 10 else '', status=bool(i % 5),
+                              tenant=TENANT if i % 3 else None, device_type=DEVICE_TYPE, device_role=DEVICE_ROLE_1,
+                              rack=RACK_1, primary_ip4=primary_ip if i % 2 else None))
+    return devices
+
+
+def get_racks(count):
+    racks = []
+    for i in range(count):
+        rack = Rack(pk=i + 1, name='Rack {}'.format(i), site=SITE, tenant=TENANT if i % 3 else None,
+                    role=RACK_ROLE_1 if i % 2 else None, u_height=42)
+        rack.device_count = i % 42
+        # Rack.get_utilization() queries the database; substitute a fixed value.
+        rack.get_utilization = lambda utilization=i % 101: utilization
+        racks.append(rack)
+    return racks
+
+
+def get_interface_connections(count):
+    devices = get_devices(2)
+    return [
+        InterfaceConnection(
+            pk=i + 1,
+            interface_a=Interface(pk=2 * i + 1, device=devices[0], name='xe-0/0/{}'.format(i)),
+            interface_b=Interface(pk=2 * i + 2, device=devices[1], name='xe-0/0/{}'.format(i))
+        ) for i in range(count)
+    ]
+
+
+BENCHMARKS = (
+    ('Prefixes', TemplatePrefixTable, PrefixTable, get_prefixes),
+    ('IP addresses', TemplateIPAddressTable, IPAddressTable, get_ipaddresses),
+    ('Devices', TemplateDeviceTable, DeviceTable, get_devices),
+    ('Racks', TemplateRackTable, RackTable, get_racks),
+    ('Interface connections', TemplateInterfaceConnectionTable, InterfaceConnectionTable, get_interface_connections),
+)
+
+
+def time_rendering(table_class, records, repeat):
+    """
+    Return the shortest time (in seconds) taken to render every cell of a table of the given records.
+    """
+    times = []
+    for _ in range(repeat):
+        table = table_class(records)
+        start = default_timer()
+        for row in table.rows:
+            for cell in row:
+                pass
+        times.append(default_timer() - start)
+    return min(times)
+
+
+class Command(BaseCommand):
+    help = "Compare the time taken to render list tables using template columns and using format columns"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-r', '--rows', dest='rows', type=int, default=1000,
+                            help="Number of rows in each table (default: 1000)")
+        parser.add_argument('-n', '--repeat', dest='repeat', type=int, default=5,
+                            help="Number of times to render each table; the fastest is reported (default: 5)")
+
+    def handle(self, *args, **options):
+
+        if options['rows'] < 1 or options['repeat'] < 1:
+            raise CommandError("The number of rows and of repetitions must be positive integers.")
+
+        self.stdout.write("Render time per 1,000 rows ({} rows, best of {}):".format(
+            options['rows'], options['repeat']
+        ))
+        self.stdout.write("{:<24}{:>12}{:>12}{:>10}".format('Table', 'Template', 'Format', 'Speedup'))
+        for name, template_table, format_table, get_records in BENCHMARKS:
+            records = get_records(options['rows'])
+            template_time = time_rendering(template_table, records, options['repeat'])
+            format_time = time_rendering(format_table, records, options['repeat'])
+            self.stdout.write("{:<24}{:>10.1f}ms{:>10.1f}ms{:>9.1f}x".format(
+                name,
+                template_time * 1000000 / options['rows'],
+                format_time * 1000000 / options['rows'],
+                template_time / format_time
+            ))
@@ -0,0 +1,294 @@
+from datetime import date
+
+from netaddr import IPNetwork
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from circuits.models import Circuit, CircuitTermination, CircuitType, Provider
+from dcim.models import (
+    ConsolePort, ConsolePortTemplate, ConsoleServerPort, ConsoleServerPortTemplate, Device, DeviceRole, DeviceType,
+    Interface, InterfaceConnection, InterfaceTemplate, Manufacturer, Platform, PowerOutlet, PowerOutletTemplate,
+    PowerPort, PowerPortTemplate, Rack, RackGroup, RackRole, Site, create_device_components,
+)
+from extras.models import CF_TYPE_INTEGER, CF_TYPE_TEXT, CustomField, CustomFieldValue
+from extras.stats import STATS_MODELS, invalidate_stats
+from ipam.models import (
+    Aggregate, IPAddress, Prefix, PREFIX_STATUS_ACTIVE, PREFIX_STATUS_CONTAINER, PREFIX_STATUS_RESERVED, RIR, Role,
+    VLAN, VLANGroup, VRF,
+)
+from tenancy.models import Tenant
+
+
+# Each site is allocated 10.<index>.0.0/16 and 2001:db8:<index>::/48, and each of its racks a /24 and a /64 within them
+MAX_SITES = 256
+MAX_RACKS = 256
+
+# Each rack holds a PDU and a console server, followed by switches, one per U
+MAX_DEVICES = 42
+
+# Each rack's IP addresses are allocated from its /24: switch management addresses first, then unassigned addresses
+MAX_IPS = 150
+
+TENANT_COUNT = 5
+
+# Component templates of each generated device type
+SWITCH_INTERFACES = ['xe-0/0/{}'.format(i) for i in range(48)]
+CONSOLE_SERVER_PORTS = ['Port {}'.format(i) for i in range(1, 49)]
+PDU_OUTLETS = ['Outlet {}'.format(i) for i in range(1, 25)]
+
+# Circuits are terminated on the last interfaces of a site's first switch (its first two connect it to its neighbors)
+MAX_CIRCUITS = len(SWITCH_INTERFACES) - 2
+
+
+class Command(BaseCommand):
+    help = "Generate a synthetic dataset of sites, racks, devices and their components and connections, IP space, " \
+           "VLANs, circuits and custom field values, for performance testing"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--sites', dest='sites', type=int, default=10,
+                            help="Number of sites to create (default: 10)")
+        parser.add_argument('-r', '--racks', dest='racks', type=int, default=10,
+                            help="Number of racks per site (default: 10)")
+        parser.add_argument('-d', '--devices', dest='devices', type=int, default=10,
+                            help="Number of devices per rack, including a PDU and a console server (default: 10)")
+        parser.add_argument('-i', '--ips', dest='ips', type=int, default=20,
+                            help="Number of unassigned IP addresses per rack (default: 20)")
+        parser.add_argument('-c', '--circuits', dest='circuits', type=int, default=2,
+                            help="Number of circuits per site (default: 2)")
+
+    def handle(self, *args, **options):
+
+        first_site = Site.objects.count()
+        if options['sites'] < 1 or first_site + options['sites'] > MAX_SITES:
+            raise CommandError("Between 1 and {} sites may be created ({} exist).".format(
+                MAX_SITES - first_site, first_site
+            ))
+        if not 1 <= options['racks'] <= MAX_RACKS:
+            raise CommandError("Between 1 and {} racks per site may be created.".format(MAX_RACKS))
+        if not 2 <= options['devices'] <= MAX_DEVICES:
+            raise CommandError("Between 2 and {} devices per rack may be created.".format(MAX_DEVICES))
+        if not 0 <= options['ips'] <= MAX_IPS:
+            raise CommandError("Up to {} unassigned IP addresses per rack may be created.".format(MAX_IPS))
+        if not 0 <= options['circuits'] <= MAX_CIRCUITS:
+            raise CommandError("Up to {} circuits per site may be created.".format(MAX_CIRCUITS))
+
+        with transaction.atomic():
+            self.create_shared_objects()
+            for index in range(first_site, first_site + options['sites']):
+                self.create_site(index, options)
+                if options['verbosity'] >= 2:
+                    self.stdout.write("Created site {}".format(index))
+
+        # QuerySet.bulk_create() sends no signals, so invalidate any statistics affected by the changes here.
+        if settings.STATS_SUMMARY:
+            for model in STATS_MODELS:
+                invalidate_stats(model)
+
+        if options['verbosity'] >= 1:
+            self.stdout.write("Created {} sites, each with {} racks of {} devices and {} circuits.".format(
+                options['sites'], options['racks'], options['devices'], options['circuits']
+            ))
+
+    def create_shared_objects(self):
+        """
+        Retrieve or create the objects shared by all sites.
+        """
+        self.tenants = [
+            Tenant.objects.get_or_create(slug='benchmark-{}'.format(i), defaults={'name': 'Benchmark {}'.format(i)})[0]
+            for i in range(1, TENANT_COUNT + 1)
+        ]
+
+        # Devices
+        manufacturer = Manufacturer.objects.get_or_create(slug='benchmark', defaults={'name': 'Benchmark'})[0]
+        self.pdu_type = self.get_device_type(manufacturer, 'PDU', is_pdu=True, is_network_device=False)
+        self.console_server_type = self.get_device_type(manufacturer, 'Console server', is_console_server=True,
+                                                        is_network_device=False)
+        self.switch_type = self.get_device_type(manufacturer, 'Switch')
+        self.pdu_role = self.get_slugged(DeviceRole, 'PDU', color='ffeb3b')
+        self.console_server_role = self.get_slugged(DeviceRole, 'Console server', color='9e9e9e')
+        self.switch_role = self.get_slugged(DeviceRole, 'Switch', color='2196f3')
+        self.platform = self.get_slugged(Platform, 'Benchmark OS')
+        self.rack_role = self.get_slugged(RackRole, 'Benchmark', color='4caf50')
+
+        # IPAM
+        rir = self.get_slugged(RIR, 'Benchmark RIR', is_private=True)
+        for prefix in (IPNetwork('10.0.0.0/8'), IPNetwork('2001:db8::/32')):
+            # An IPNetwork is iterable, so it cannot be passed to get_or_create() as a lookup value
+            if not Aggregate.objects.filter(prefix=str(prefix)).exists():
+                Aggregate.objects.create(prefix=prefix, family=prefix.version, rir=rir, date_added=date.today())
+        self.role = self.get_slugged(Role, 'Benchmark')
+        VRF.objects.get_or_create(rd='65000:1', defaults={'name': 'Benchmark', 'tenant': self.tenants[0]})
+
+        # Circuits
+        self.provider = self.get_slugged(Provider, 'Benchmark provider')
+        self.circuit_type = self.get_slugged(CircuitType, 'Benchmark')
+
+        # Custom fields
+        self.text_field = CustomField.objects.get_or_create(name='benchmark_text', defaults={'type': CF_TYPE_TEXT})[0]
+        self.integer_field = CustomField.objects.get_or_create(name='benchmark_integer',
+                                                               defaults={'type': CF_TYPE_INTEGER})[0]
+        self.text_field.obj_type.add(*[ContentType.objects.get_for_model(m) for m in (Site, Device, Prefix, Circuit)])
+        self.integer_field.obj_type.add(*[ContentType.objects.get_for_model(m) for m in (Device, Prefix)])
+
+    def get_slugged(self, model, name, **attrs):
+        return model.objects.get_or_create(slug=name.lower().replace(' ', '-'), defaults=dict(name=name, **attrs))[0]
+
+    def get_device_type(self, manufacturer, name, **attrs):
+        """
+        Retrieve or create a device type, along with its component templates.
+        """
+        device_type, created = DeviceType.objects.get_or_create(
+            manufacturer=manufacturer, slug=name.lower().replace(' ', '-'), defaults=dict(model=name, **attrs)
+        )
+        if created:
+            PowerPortTemplate.objects.create(device_type=device_type, name='PSU0')
+            if device_type.is_pdu:
+                PowerOutletTemplate.objects.bulk_create([
+                    PowerOutletTemplate(device_type=device_type, name=n) for n in PDU_OUTLETS
+                ])
+            elif device_type.is_console_server:
+                ConsoleServerPortTemplate.objects.bulk_create([
+                    ConsoleServerPortTemplate(device_type=device_type, name=n) for n in CONSOLE_SERVER_PORTS
+                ])
+            else:
+                PowerPortTemplate.objects.create(device_type=device_type, name='PSU1')
+                ConsolePortTemplate.objects.create(device_type=device_type, name='Console')
+                InterfaceTemplate.objects.bulk_create([
+                    InterfaceTemplate(device_type=device_type, name=n) for n in SWITCH_INTERFACES
+                ] + [InterfaceTemplate(device_type=device_type, name='em0', mgmt_only=True)])
+        return device_type
+
+    def create_site(self, index, options):
+        """
+        Create a site with its racks, devices, IP space, VLANs and circuits. Objects are created in bulk, and each
+        set of connections is made with a single query per connection.
+        """
+        tenant = self.tenants[index % TENANT_COUNT]
+        site = Site.objects.create(name='Benchmark {}'.format(index), slug='benchmark-{}'.format(index),
+                                   tenant=tenant, facility='Facility {}'.format(index))
+        rack_group = RackGroup.objects.create(site=site, name='Row 1', slug='row-1')
+        vlan_group = VLANGroup.objects.create(site=site, name='Benchmark', slug='benchmark')
+
+        racks = Rack.objects.bulk_create([
+            Rack(site=site, group=rack_group, name='Rack {}'.format(r), tenant=tenant, role=self.rack_role)
+            for r in range(options['racks'])
+        ])
+        vlans = VLAN.objects.bulk_create([
+            VLAN(site=site, group=vlan_group, vid=100 + r, name='Rack {}'.format(r), tenant=tenant, role=self.role)
+            for r in range(options['racks'])
+        ])
+
+        # Nested prefixes: the site's container, a prefix for each rack, and a reserved block within it
+        container_v4 = IPNetwork('10.{}.0.0/16'.format(index))
+        container_v6 = IPNetwork('2001:db8:{:x}::/48'.format(index))
+        prefixes = [
+            Prefix(prefix=container_v4, site=site, status=PREFIX_STATUS_CONTAINER, role=self.role),
+            Prefix(prefix=container_v6, site=site, status=PREFIX_STATUS_CONTAINER, role=self.role),
+        ]
+        for r, vlan in enumerate(vlans):
+            prefixes += [
+                Prefix(prefix=IPNetwork('10.{}.{}.0/24'.format(index, r)), site=site, vlan=vlan, tenant=tenant,
+                       status=PREFIX_STATUS_ACTIVE, role=self.role),
+                Prefix(prefix=IPNetwork('10.{}.{}.192/26'.format(index, r)), site=site, tenant=tenant,
+                       status=PREFIX_STATUS_RESERVED, role=self.role),
+                Prefix(prefix=IPNetwork('2001:db8:{:x}:{:x}::/64'.format(index, r)), site=site, vlan=vlan,
+                       tenant=tenant, status=PREFIX_STATUS_ACTIVE, role=self.role),
+            ]
+        for prefix in prefixes:
+            prefix.family = prefix.prefix.version
+        Prefix.objects.bulk_create(prefixes)
+
+        # Devices (a PDU, then a console server, then switches) and their components
+        device_types = [
+            (self.pdu_type, self.pdu_role, 'pdu'),
+            (self.console_server_type, self.console_server_role, 'cs'),
+        ] + [(self.switch_type, self.switch_role, 'sw')] * (options['devices'] - 2)
+        devices = Device.objects.bulk_create([
+            Device(name='b{}-r{}-{}{}'.format(index, r, label, u), device_type=device_type, device_role=device_role,
+                   platform=self.platform if device_type == self.switch_type else None, tenant=tenant, rack=rack,
+                   position=u, face=0)
+            for r, rack in enumerate(racks) for u, (device_type, device_role, label) in enumerate(device_types, start=1)
+        ])
+        create_device_components(devices)
+        self.connect_devices(site)
+
+        # Management IP addresses (assigned to each switch as its primary IP), then unassigned IP addresses
+        interfaces = Interface.objects.filter(device__rack__site=site, mgmt_only=True).select_related('device__rack')
+        rack_index = {rack.pk: r for r, rack in enumerate(racks)}
+        ips = [
+            IPAddress(address=IPNetwork('10.{}.{}.{}/24'.format(
+                index, rack_index[interface.device.rack_id], interface.device.position
+            )), tenant=tenant, interface=interface)
+            for interface in interfaces
+        ]
+        ips += [
+            IPAddress(address=IPNetwork('10.{}.{}.{}/24'.format(index, r, 100 + n)), tenant=tenant)
+            for r in range(options['racks']) for n in range(options['ips'])
+        ]
+        for ip in ips:
+            ip.family = 4
+        IPAddress.objects.bulk_create(ips)
+        for ip in ips:
+            if ip.interface is not None:
+                Device.objects.filter(pk=ip.interface.device_id).update(primary_ip4=ip)
+
+        # Circuits, terminated on the interfaces of the site's first switch (if any)
+        circuits = Circuit.objects.bulk_create([
+            Circuit(cid='B{}-{}'.format(index, c), provider=self.provider, type=self.circuit_type, tenant=tenant,
+                    install_date=date.today(), commit_rate=10000)
+            for c in range(options['circuits'])
+        ])
+        switch = next((d for d in devices if d.device_type == self.switch_type), None)
+        uplinks = list(Interface.objects.filter(device=switch, name__in=SWITCH_INTERFACES[-len(circuits):])) \
+            if switch and circuits else []
+        CircuitTermination.objects.bulk_create([
+            CircuitTermination(circuit=circuit, term_side='A', site=site, port_speed=10000000,
+                               interface=uplinks[c] if c < len(uplinks) else None)
+            for c, circuit in enumerate(circuits)
+        ])
+
+        # Custom field values
+        values = [(self.text_field, site)]
+        values += [(field, obj) for obj in devices + prefixes for field in (self.text_field, self.integer_field)]
+        values += [(self.text_field, circuit) for circuit in circuits]
+        CustomFieldValue.objects.bulk_create([
+            CustomFieldValue(field=field, obj_type=ContentType.objects.get_for_model(obj), obj_id=obj.pk,
+                             serialized_value=str(obj.pk) if field.type == CF_TYPE_INTEGER else 'Benchmark')
+            for field, obj in values
+        ])
+
+    def connect_devices(self, site):
+        """
+        Within each rack of the site, connect the console port and first power port of each switch to the console
+        server and to the PDU respectively, and connect each switch to the next by their first two interfaces.
+        """
+        def get_components(model):
+            components = {}
+            for c in model.objects.filter(device__rack__site=site).select_related('device').order_by('device', 'pk'):
+                components.setdefault(c.device.rack_id, []).append(c)
+            return components
+
+        cs_ports = get_components(ConsoleServerPort)
+        outlets = get_components(PowerOutlet)
+        for rack_id, console_ports in get_components(ConsolePort).items():
+            for console_port, cs_port in zip(console_ports, cs_ports.get(rack_id, [])):
+                ConsolePort.objects.filter(pk=console_port.pk).update(cs_port=cs_port)
+        for rack_id, power_ports in get_components(PowerPort).items():
+            switch_power_ports = [p for p in power_ports if p.device.device_type_id == self.switch_type.pk and
+                                  p.name == 'PSU0']
+            for power_port, outlet in zip(switch_power_ports, outlets.get(rack_id, [])):
+                PowerPort.objects.filter(pk=power_port.pk).update(power_outlet=outlet)
+
+        connections = []
+        for rack_id, interfaces in get_components(Interface).items():
+            by_device = {}
+            for interface in interfaces:
+                by_device.setdefault(interface.device_id, {})[interface.name] = interface
+            switches = sorted(by_device.values(), key=lambda i: i[SWITCH_INTERFACES[0]].device.position)
+            for a, b in zip(switches, switches[1:]):
+                connections.append(InterfaceConnection(interface_a=a[SWITCH_INTERFACES[1]],
+                                                       interface_b=b[SWITCH_INTERFACES[0]]))
+        InterfaceConnection.objects.bulk_create(connections)
@@ -0,0 +1,283 @@
+import json
+import platform
+from timeit import default_timer
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.urlresolvers import reverse
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from circuits.models import Circuit
+from dcim.models import Device, Interface, InterfaceConnection, Rack, Site
+from ipam.models import IPAddress, Prefix, PREFIX_STATUS_ACTIVE, PREFIX_STATUS_CONTAINER, VLAN
+
+
+# Numbers of sites in the dataset generated for each scale (see the generate_benchmark_data command)
+DEFAULT_SCALES = '1,4,16'
+
+# Number of records submitted to each import view
+IMPORT_SIZE = 50
+
+
+def get_pk(model, **filters):
+    """
+    Return a function which returns the URL arguments of the first matching object.
+    """
+    return lambda: {'pk': model.objects.filter(**filters).order_by('pk').values_list('pk', flat=True)[0]}
+
+
+# UI views: name, URL name, function returning the URL arguments (if any), and query budget. The number of queries made
+# by a view must not depend on the size of the dataset, only on the (paginated) number of objects it displays.
+VIEWS = (
+    ('Home', 'home', None, 30),
+    ('Site list', 'dcim:site_list', None, 30),
+    ('Site', 'dcim:site', lambda: {'slug': Site.objects.order_by('pk')[0].slug}, 40),
+    ('Rack list', 'dcim:rack_list', None, 30),
+    ('Rack', 'dcim:rack', get_pk(Rack), 40),
+    ('Device list', 'dcim:device_list', None, 30),
+    ('Device', 'dcim:device', get_pk(Device, device_role__slug='switch'), 50),
+    ('Interface connection list', 'dcim:interface_connections_list', None, 30),
+    ('Aggregate list', 'ipam:aggregate_list', None, 30),
+    ('Prefix list', 'ipam:prefix_list', None, 30),
+    ('Prefix', 'ipam:prefix', get_pk(Prefix, status=PREFIX_STATUS_CONTAINER), 40),
+    ('Prefix IP addresses', 'ipam:prefix_ipaddresses', get_pk(Prefix, status=PREFIX_STATUS_ACTIVE, family=4), 40),
+    ('IP address list', 'ipam:ipaddress_list', None, 30),
+    ('VLAN list', 'ipam:vlan_list', None, 30),
+    ('Circuit list', 'circuits:circuit_list', None, 30),
+)
+
+# API endpoints (which list all objects): name, URL name, query parameters (if any), and query budget
+API_ENDPOINTS = (
+    ('Sites', 'dcim-api:site_list', None, 20),
+    ('Racks', 'dcim-api:rack_list', None, 20),
+    ('Devices', 'dcim-api:device_list', None, 20),
+    ('Interface connections', 'dcim-api:interfaceconnection_list', None, 20),
+    ('Prefixes', 'ipam-api:prefix_list', None, 20),
+    ('Prefixes with utilization', 'ipam-api:prefix_list', {'utilization': 1}, 20),
+    ('IP addresses', 'ipam-api:ipaddress_list', None, 20),
+    ('VLANs', 'ipam-api:vlan_list', None, 20),
+    ('Circuits', 'circuits-api:circuit_list', None, 20),
+)
+
+# CSV exports (of all objects): name, URL name of the list view, and query budget
+EXPORTS = (
+    ('Sites', 'dcim:site_list', 20),
+    ('Racks', 'dcim:rack_list', 20),
+    ('Devices', 'dcim:device_list', 20),
+    ('Interface connections', 'dcim:interface_connections_list', 20),
+    ('Prefixes', 'ipam:prefix_list', 20),
+    ('IP addresses', 'ipam:ipaddress_list', 20),
+    ('VLANs', 'ipam:vlan_list', 20),
+    ('Circuits', 'circuits:circuit_list', 20),
+)
+
+
+def get_device_csv(count):
+    site = Site.objects.order_by('pk')[0]
+    rack = Rack.objects.filter(site=site).order_by('pk')[0]
+    return u'\n'.join(
+        u'imported-{},Switch,Benchmark 1,Benchmark,Switch,Benchmark OS,,,{},{},,'.format(n, site.name, rack.name)
+        for n in range(count)
+    )
+
+
+def get_prefix_csv(count):
+    site = Site.objects.order_by('pk')[0]
+    return u'\n'.join(
+        u'172.{}.{}.0/24,,Benchmark 1,{},,,Active,Benchmark,,Imported'.format(16 + n // 256, n % 256, site.name)
+        for n in range(count)
+    )
+
+
+# CSV imports: name, URL name, model, function returning CSV data for the given number of records, and query budget
+# per record
+IMPORTS = (
+    ('Devices', 'dcim:device_import', Device, get_device_csv, 25),
+    ('Prefixes', 'ipam:prefix_import', Prefix, get_prefix_csv, 15),
+)
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Time key views, API endpoints, CSV exports and imports against generated datasets of increasing size, " \
+           "and check the number of queries made by each against its budget"
+
+    def add_arguments(self, parser):
+        parser.add_argument('-s', '--scales', dest='scales', default=DEFAULT_SCALES,
+                            help="Comma-separated numbers of sites to generate (default: {})".format(DEFAULT_SCALES))
+        parser.add_argument('-r', '--racks', dest='racks', type=int, help="Number of racks per site")
+        parser.add_argument('-d', '--devices', dest='devices', type=int, help="Number of devices per rack")
+        parser.add_argument('-i', '--ips', dest='ips', type=int, help="Number of unassigned IP addresses per rack")
+        parser.add_argument('-c', '--circuits', dest='circuits', type=int, help="Number of circuits per site")
+        parser.add_argument('-n', '--repeat', dest='repeat', type=int, default=3,
+                            help="Number of times to run each benchmark; the fastest is reported (default: 3)")
+        parser.add_argument('-o', '--output', dest='output',
+                            help="Write the results (as JSON) to this file, rather than to standard output")
+        parser.add_argument('--keepdb', action='store_true', dest='keepdb', default=False,
+                            help="Preserve the test database between runs")
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive', default=True,
+                            help="Do not prompt before destroying an existing test database")
+
+    def handle(self, *args, **options):
+
+        try:
+            scales = [int(s) for s in options['scales'].split(',')]
+        except ValueError:
+            raise CommandError("Scales must be given as comma-separated integers (e.g. {}).".format(DEFAULT_SCALES))
+        if options['repeat'] < 1:
+            raise CommandError("Each benchmark must be run at least once.")
+        dataset_options = {
+            k: options[k] for k in ('racks', 'devices', 'ips', 'circuits') if options[k] is not None
+        }
+
+        # Benchmarks are run against a test database (created like that of the test runner), so that the dataset
+        # generated for each scale replaces only its own predecessor.
+        setup_test_environment()
+        settings.DEBUG = False
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=options['verbosity'], autoclobber=not options['interactive'],
+                                           serialize=False, keepdb=options['keepdb'])
+        try:
+            results = {
+                'version': settings.VERSION,
+                'python': platform.python_version(),
+                'database': connection.pg_version,
+                'time': timezone.now().isoformat(),
+                'repeat': options['repeat'],
+                'dataset': dataset_options,
+                'scales': [self.run_scale(sites, dataset_options, options['repeat']) for sites in scales],
+            }
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=options['verbosity'], keepdb=options['keepdb'])
+            teardown_test_environment()
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(results, output, indent=2)
+            for scale in results['scales']:
+                for result in scale['results']:
+                    self.stdout.write(u"{:>4} sites  {:<10}{:<28}{:>10}{:>12}  {}".format(
+                        scale['sites'], result['category'], result['name'],
+                        '{:.1f}ms'.format(result['best'] * 1000) if result['best'] is not None else '-',
+                        '{}/{}'.format(result['queries'], result['budget']),
+                        'OK' if result['passed'] else result['error'] or 'Over budget'
+                    ))
+        else:
+            self.stdout.write(json.dumps(results, indent=2))
+
+        failures = [
+            u"{} ({} sites)".format(r['name'], s['sites']) for s in results['scales'] for r in s['results']
+            if not r['passed']
+        ]
+        if failures:
+            raise CommandError(u"{} benchmarks failed: {}".format(len(failures), ', '.join(failures)))
+
+    def run_scale(self, sites, dataset_options, repeat):
+        """
+        Generate a dataset of the given number of sites (replacing any existing data) and run each benchmark against
+        it. Returns a dictionary of the dataset's size and the benchmarks' results.
+        """
+        call_command('flush', interactive=False, verbosity=0)
+        ContentType.objects.clear_cache()
+        call_command('generate_benchmark_data', sites=sites, verbosity=0, **dataset_options)
+
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark'))
+
+        results = []
+        for name, url_name, get_kwargs, budget in VIEWS:
+            url = reverse(url_name, kwargs=get_kwargs() if get_kwargs else None)
+            results.append(self.run_benchmark('view', name, budget, repeat, lambda: self.get(url)))
+        for name, url_name, params, budget in API_ENDPOINTS:
+            url = reverse(url_name)
+            results.append(self.run_benchmark('api', name, budget, repeat,
+                                              lambda: self.get(url, params, HTTP_ACCEPT='application/json')))
+        for name, url_name, budget in EXPORTS:
+            url = u'{}?export'.format(reverse(url_name))
+            results.append(self.run_benchmark('export', name, budget, repeat, lambda: self.get(url)))
+        results.append(self.run_benchmark('queryset', 'annotate_depth', 1, repeat,
+                                          lambda: list(Prefix.objects.annotate_depth())))
+        for name, url_name, model, get_csv, budget in IMPORTS:
+            url, csv = reverse(url_name), get_csv(IMPORT_SIZE)
+            expected_count = model.objects.count() + IMPORT_SIZE
+            results.append(self.run_benchmark(
+                'import', name, budget * IMPORT_SIZE, repeat, lambda: self.client.post(url, {'csv': csv}),
+                check=lambda: self.check_count(model, expected_count), rollback=True
+            ))
+
+        return {
+            'sites': sites,
+            'counts': {
+                model._meta.model_name: model.objects.count()
+                for model in (Site, Rack, Device, Interface, InterfaceConnection, Prefix, IPAddress, VLAN, Circuit)
+            },
+            'results': results,
+        }
+
+    def run_benchmark(self, category, name, budget, repeat, operation, check=None, rollback=False):
+        """
+        Run an operation the given number of times, timing each run and counting the queries it makes. If `check` is
+        given, it is called after each run to verify the operation's outcome. If `rollback` is True, each run is made
+        within a transaction which is then rolled back, so that every run starts from the same dataset.
+        """
+        times = []
+        queries = None
+        error = None
+        try:
+            for _ in range(repeat):
+                if rollback:
+                    with transaction.atomic():
+                        elapsed, queries = self.run_once(operation, check)
+                        transaction.set_rollback(True)
+                else:
+                    elapsed, queries = self.run_once(operation, check)
+                # The query count of the last run is reported, as the first may populate caches
+                times.append(elapsed)
+        except BenchmarkError as e:
+            error = str(e)
+
+        times.sort()
+        return {
+            'category': category,
+            'name': name,
+            'best': times[0] if times else None,
+            'median': times[len(times) // 2] if times else None,
+            'queries': queries,
+            'budget': budget,
+            'passed': error is None and queries <= budget,
+            'error': error,
+        }
+
+    def run_once(self, operation, check=None):
+        """
+        Return the time taken to run an operation, and the number of queries it made.
+        """
+        with CaptureQueriesContext(connection) as context:
+            start = default_timer()
+            operation()
+            elapsed = default_timer() - start
+        if check is not None:
+            check()
+        return elapsed, len(context.captured_queries)
+
+    def get(self, url, data=None, **extra):
+        response = self.client.get(url, data, **extra)
+        if response.status_code != 200:
+            raise BenchmarkError("GET {} returned status {}".format(url, response.status_code))
+        if response.streaming:
+            b''.join(response.streaming_content)
+
+    def check_count(self, model, count):
+        if model.objects.count() != count:
+            raise BenchmarkError("Expected {} {}; found {}".format(
+                count, model._meta.verbose_name_plural, model.objects.count()
+            ))
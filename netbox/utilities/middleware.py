@@ -1,6 +1,8 @@
 from django.http import HttpResponseRedirect
 from django.conf import settings
 
+from extras.models import UserAction
+
 
 BASE_PATH = getattr(settings, 'BASE_PATH', False)
 LOGIN_REQUIRED = getattr(settings, 'LOGIN_REQUIRED', False)
@@ -21,3 +23,19 @@ class LoginRequiredMiddleware(object):
             if not request.path_info.startswith(api_path) and request.path_info != settings.LOGIN_URL:
                 return HttpResponseRedirect('{}?next={}'.format(settings.LOGIN_URL, request.path_info))
         return self.get_response(request)
+
+
+class UserActionBufferMiddleware(object):
+    """
+    Buffer all UserActions logged while processing a request and write them in a single query once the response has
+    been generated.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        UserAction.objects.start_buffering()
+        try:
+            return self.get_response(request)
+        finally:
+            UserAction.objects.flush()
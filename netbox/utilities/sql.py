@@ -1,4 +1,4 @@
-from django.db import connections, models
+from django.db import connections, migrations, models
 from django.db.models.sql.compiler import SQLCompiler
 
 
@@ -30,3 +30,17 @@ class NullsFirstQuerySet(models.QuerySet):
     def __init__(self, model=None, query=None, using=None, hints=None):
         super(NullsFirstQuerySet, self).__init__(model, query, using, hints)
         self.query = query or NullsFirstQuery(self.model)
+
+
+def create_trigram_indexes(indexes):
+    """
+    Return the migration operations which create a GIN trigram index (requiring the pg_trgm extension) on each of the
+    given (table, column) pairs. These support case-insensitive substring searches (e.g. `name__icontains`), so each
+    index is built on the same UPPER(<column>::text) expression which Django generates for icontains lookups.
+    """
+    return [
+        migrations.RunSQL(
+            sql='CREATE INDEX {0}_{1}_trgm ON {0} USING gin (UPPER({1}::text) gin_trgm_ops)'.format(table, column),
+            reverse_sql='DROP INDEX {0}_{1}_trgm'.format(table, column),
+        ) for table, column in indexes
+    ]
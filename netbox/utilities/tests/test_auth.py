@@ -0,0 +1,102 @@
+import os
+import sys
+import types
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission, User
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase
+
+from utilities.auth import CachedPermissionsBackend
+
+
+class CachedPermissionsBackendTestCase(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', password='alice')
+        group = Group.objects.create(name='Group 1')
+        self.user.groups.add(group)
+        add_site = Permission.objects.get(codename='add_site')
+        self.user.user_permissions.add(add_site)
+        group.permissions.add(add_site, Permission.objects.get(codename='change_site'))
+
+    def get_user(self):
+        # A fresh instance, without cached permissions
+        return User.objects.get(pk=self.user.pk)
+
+    def test_permissions(self):
+
+        user = self.get_user()
+        with self.assertNumQueries(1):
+            perms = CachedPermissionsBackend().get_all_permissions(user)
+        with self.assertNumQueries(0):
+            self.assertTrue(CachedPermissionsBackend().has_perm(user, 'dcim.change_site'))
+
+        self.assertEqual(perms, {'dcim.add_site', 'dcim.change_site'})
+        self.assertEqual(perms, ModelBackend().get_all_permissions(self.get_user()))
+
+    def test_superuser(self):
+
+        self.user.is_superuser = True
+        self.user.save()
+
+        self.assertEqual(CachedPermissionsBackend().get_all_permissions(self.get_user()),
+                         ModelBackend().get_all_permissions(self.get_user()))
+
+    def test_inactive_user(self):
+
+        self.user.is_active = False
+        self.user.save()
+
+        user = self.get_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(CachedPermissionsBackend().get_all_permissions(user), set())
+
+
+class CachedSessionsSettingsTestCase(SimpleTestCase):
+
+    def load_settings(self, **config):
+        """
+        Evaluate settings.py with a configuration module consisting of the mandatory settings and those given.
+        """
+        configuration = types.ModuleType('configuration')
+        configuration.ALLOWED_HOSTS = ['*']
+        configuration.DATABASE = {'NAME': 'netbox'}
+        configuration.SECRET_KEY = settings.SECRET_KEY
+        for name, value in config.items():
+            setattr(configuration, name, value)
+
+        path = os.path.join(settings.BASE_DIR, 'netbox', 'settings.py')
+        namespace = {'__name__': 'netbox_test_settings', '__file__': path}
+        original = sys.modules.get('configuration')
+        sys.modules['configuration'] = configuration
+        try:
+            with open(path) as f:
+                exec(compile(f.read(), path, 'exec'), namespace)
+        finally:
+            if original is None:
+                del sys.modules['configuration']
+            else:
+                sys.modules['configuration'] = original
+        return namespace
+
+    def test_default(self):
+
+        self.assertEqual(self.load_settings().get('SESSION_ENGINE'), None)
+
+    def test_shared_cache(self):
+
+        namespace = self.load_settings(CACHED_SESSIONS=True, CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+                'LOCATION': '127.0.0.1:11211',
+            },
+        })
+
+        self.assertEqual(namespace['SESSION_ENGINE'], 'django.contrib.sessions.backends.cached_db')
+
+    def test_local_memory_cache(self):
+
+        with self.assertRaises(ImproperlyConfigured):
+            self.load_settings(CACHED_SESSIONS=True)
@@ -0,0 +1,32 @@
+from django.core.management import call_command
+from django.test import TestCase
+
+from circuits.models import Circuit
+from dcim.models import Device, InterfaceConnection, Rack, Site
+from extras.models import CustomFieldValue
+from ipam.models import Aggregate, IPAddress, Prefix, VLAN
+
+
+class GenerateBenchmarkDataTestCase(TestCase):
+
+    def test_generate(self):
+
+        call_command('generate_benchmark_data', sites=1, racks=2, devices=4, ips=5, circuits=1, verbosity=0)
+
+        self.assertEqual(Site.objects.count(), 1)
+        self.assertEqual(Rack.objects.count(), 2)
+        self.assertEqual(Device.objects.count(), 8)
+        self.assertEqual(VLAN.objects.count(), 2)
+        self.assertEqual(Aggregate.objects.count(), 2)
+        self.assertEqual(Circuit.objects.count(), 1)
+        self.assertTrue(InterfaceConnection.objects.exists())
+        self.assertTrue(CustomFieldValue.objects.exists())
+        self.assertEqual(Prefix.objects.filter(family=6).count(), 3)
+        # Five unassigned IPs per rack, and a management IP for each switch
+        self.assertEqual(IPAddress.objects.filter(address__net_contained='10.0.0.0/16').count(), 2 * 5 + 4)
+
+        # A second run adds another site, reusing the shared objects
+        call_command('generate_benchmark_data', sites=1, racks=2, devices=4, ips=5, circuits=1, verbosity=0)
+
+        self.assertEqual(Site.objects.count(), 2)
+        self.assertEqual(Aggregate.objects.count(), 2)
@@ -0,0 +1,143 @@
+from netaddr import IPNetwork
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.urlresolvers import reverse
+from django.test import Client, RequestFactory, TestCase
+
+from extras.models import BulkDeletion
+from ipam.filters import PrefixFilter
+from ipam.models import Prefix, PREFIX_STATUS_ACTIVE, PREFIX_STATUS_DEPRECATED, PREFIX_STATUS_RESERVED
+from utilities.deletion import DELETION_CHUNK_SIZE
+from utilities.views import BULK_CHUNK_SIZE, get_bulk_selection, iter_pk_chunks
+
+
+def create_prefixes(count, status, offset=0):
+    return Prefix.objects.bulk_create([
+        Prefix(family=4, prefix=IPNetwork('10.{}.{}.0/24'.format((offset + i) // 256, (offset + i) % 256)),
+               status=status)
+        for i in range(count)
+    ])
+
+
+class BulkSelectionTestCase(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        create_prefixes(3, PREFIX_STATUS_ACTIVE)
+        create_prefixes(2, PREFIX_STATUS_RESERVED, offset=3)
+
+    def test_filter(self):
+
+        request = self.factory.post('/', {'_all': 'on', '_filter': 'status=1', 'pk_all': ''})
+        queryset, pk_list, filter_query = get_bulk_selection(request, Prefix, PrefixFilter)
+
+        self.assertEqual(queryset.count(), 3)
+        self.assertIsNone(pk_list)
+        self.assertEqual(filter_query, 'status=1')
+
+        with self.assertRaises(ImproperlyConfigured):
+            get_bulk_selection(request, Prefix)
+
+    def test_pk_all(self):
+
+        pks = sorted(Prefix.objects.values_list('pk', flat=True))[:2]
+        request = self.factory.post('/', {'_all': 'on', 'pk_all': ','.join(str(pk) for pk in pks)})
+        queryset, pk_list, filter_query = get_bulk_selection(request, Prefix, PrefixFilter)
+
+        self.assertEqual(pk_list, pks)
+        self.assertEqual(sorted(queryset.values_list('pk', flat=True)), pks)
+        self.assertIsNone(filter_query)
+
+    def test_pk(self):
+
+        pk = Prefix.objects.first().pk
+        request = self.factory.post('/', {'pk': [pk]})
+        queryset, pk_list, filter_query = get_bulk_selection(request, Prefix, PrefixFilter)
+
+        self.assertEqual(pk_list, [pk])
+        self.assertIsNone(filter_query)
+
+    def test_iter_pk_chunks(self):
+
+        queryset = Prefix.objects.filter(status=PREFIX_STATUS_ACTIVE)
+        chunks = []
+        for chunk in iter_pk_chunks(queryset, chunk_size=2):
+            chunks.append(chunk)
+            # Objects which no longer match the queryset once updated do not cause others to be skipped.
+            Prefix.objects.filter(pk__in=chunk).update(status=PREFIX_STATUS_DEPRECATED)
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertFalse(queryset.exists())
+
+
+class BulkViewFilterTestCase(TestCase):
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+    def test_bulk_edit_filter(self):
+
+        # More than one chunk of objects matches the filter, and each stops matching it once updated.
+        create_prefixes(BULK_CHUNK_SIZE + 10, PREFIX_STATUS_ACTIVE)
+        create_prefixes(5, PREFIX_STATUS_RESERVED, offset=BULK_CHUNK_SIZE + 10)
+
+        response = self.client.post(reverse('ipam:prefix_bulk_edit'), {
+            '_all': 'on',
+            '_filter': 'status={}'.format(PREFIX_STATUS_ACTIVE),
+            '_apply': '',
+            'status': PREFIX_STATUS_DEPRECATED,
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Prefix.objects.filter(status=PREFIX_STATUS_ACTIVE).exists())
+        self.assertEqual(Prefix.objects.filter(status=PREFIX_STATUS_DEPRECATED).count(), BULK_CHUNK_SIZE + 10)
+        self.assertEqual(Prefix.objects.filter(status=PREFIX_STATUS_RESERVED).count(), 5)
+
+    def test_bulk_edit_filter_confirmation(self):
+
+        create_prefixes(3, PREFIX_STATUS_ACTIVE)
+
+        response = self.client.post(reverse('ipam:prefix_bulk_edit'), {
+            '_all': 'on',
+            '_filter': 'status={}'.format(PREFIX_STATUS_ACTIVE),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['selected_count'], 3)
+        self.assertIsNone(response.context['selected_objects'])
+
+    def test_bulk_delete_filter(self):
+
+        create_prefixes(3, PREFIX_STATUS_ACTIVE)
+        create_prefixes(2, PREFIX_STATUS_RESERVED, offset=3)
+
+        response = self.client.post(reverse('ipam:prefix_bulk_delete'), {
+            '_all': 'on',
+            '_filter': 'status={}'.format(PREFIX_STATUS_ACTIVE),
+            '_confirm': '',
+            'confirm': 'on',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(Prefix.objects.values_list('status', flat=True)), [PREFIX_STATUS_RESERVED] * 2)
+
+    def test_bulk_delete_filter_background(self):
+
+        create_prefixes(DELETION_CHUNK_SIZE + 1, PREFIX_STATUS_ACTIVE)
+
+        response = self.client.post(reverse('ipam:prefix_bulk_delete'), {
+            '_all': 'on',
+            '_filter': 'status={}'.format(PREFIX_STATUS_ACTIVE),
+            '_confirm': '',
+            'confirm': 'on',
+        })
+
+        # The deletion is recorded by its filter, to be performed once the request has been committed.
+        self.assertRedirects(response, reverse('users:bulk_deletions'))
+        job = BulkDeletion.objects.get()
+        self.assertEqual(job.filter_class, 'ipam.filters.PrefixFilter')
+        self.assertEqual(job.filter_query, 'status={}'.format(PREFIX_STATUS_ACTIVE))
+        self.assertEqual(job.total, DELETION_CHUNK_SIZE + 1)
+        self.assertEqual(job.get_queryset().count(), DELETION_CHUNK_SIZE + 1)
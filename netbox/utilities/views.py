@@ -1,14 +1,16 @@
 from collections import OrderedDict
 from django_tables2 import RequestConfig
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured, ValidationError
 from django.core.urlresolvers import reverse
 from django.db import transaction, IntegrityError
 from django.db.models import ProtectedError
+from django.db.models.query import QuerySet
 from django.forms import CharField, ModelMultipleChoiceField, MultipleHiddenInput, TypedChoiceField
-from django.http import HttpResponse, HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect, QueryDict
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template import TemplateSyntaxError
 from django.utils.http import is_safe_url
@@ -16,12 +18,62 @@ from django.views.generic import View
 
 from extras.forms import CustomFieldForm
 from extras.models import CustomField, CustomFieldValue, ExportTemplate, UserAction
+from extras.stats import invalidate_stats
 
 from .error_handlers import handle_protectederror
+from .deletion import DELETION_CHUNK_SIZE, DeletionPlan, start_bulk_deletion
 from .forms import ConfirmationForm
 from .paginator import EnhancedPaginator
 
 
+# Number of objects updated or deleted by each query when operating on all objects matching a filter
+BULK_CHUNK_SIZE = 1000
+
+# Query parameters of a list view which do not affect the selection of objects
+NON_FILTER_PARAMS = ('page', 'per_page', 'sort', 'export')
+
+
+def get_bulk_selection(request, model, filter=None):
+    """
+    Identify the objects selected for a bulk operation. Returns a tuple of (queryset, pk_list, filter_query).
+
+    If all objects matching a list view's filter were selected, the filter querystring (`_filter`) is re-evaluated and
+    pk_list is None. Otherwise, the PKs of the selected objects are given either individually (`pk`) or, for all
+    objects in a table, as a comma-separated list (`pk_all`), and filter_query is None.
+    """
+    if request.POST.get('_all') and '_filter' in request.POST:
+        if filter is None:
+            raise ImproperlyConfigured('No filter has been provided for the selection of all {}.'.format(
+                model._meta.verbose_name_plural
+            ))
+        filter_query = request.POST['_filter']
+        return filter(QueryDict(filter_query), model.objects.all()).qs, None, filter_query
+
+    if request.POST.get('_all'):
+        pk_list = [int(pk) for pk in request.POST.get('pk_all').split(',') if pk]
+    else:
+        pk_list = [int(pk) for pk in request.POST.getlist('pk')]
+    return model.objects.filter(pk__in=pk_list), pk_list, None
+
+
+def iter_pk_chunks(queryset, chunk_size=BULK_CHUNK_SIZE):
+    """
+    Iterate over the PKs of the objects in a queryset in ascending order, yielding lists of (up to) `chunk_size` PKs.
+    Each chunk is retrieved by a keyset query (`pk > last ORDER BY pk LIMIT n`), so the entire list of PKs is never held
+    in memory. Because the queryset is re-evaluated for each chunk, objects already processed (which may no longer
+    match it) do not cause any others to be skipped.
+    """
+    queryset = queryset.order_by('pk')
+    last_pk = None
+    while True:
+        chunk_queryset = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pk_list = list(chunk_queryset.values_list('pk', flat=True)[:chunk_size])
+        if not pk_list:
+            break
+        yield pk_list
+        last_pk = pk_list[-1]
+
+
 class CustomFieldQueryset:
     """
     Annotate custom fields on objects within a QuerySet.
@@ -95,6 +147,16 @@ class ObjectListView(View):
         # Provide a hook to tweak the queryset based on the request immediately prior to rendering the object list
         self.queryset = self.alter_queryset(request)
 
+        # If the table lists exactly the objects matching the filter, a bulk operation on all of them can re-evaluate
+        # the filter rather than posting the PK of every object.
+        if self.filter and isinstance(self.queryset, QuerySet):
+            filter_params = request.GET.copy()
+            for param in NON_FILTER_PARAMS:
+                filter_params.pop(param, None)
+            filter_query = filter_params.urlencode()
+        else:
+            filter_query = None
+
         # Construct the table based on the user's permissions
         table = self.table(self.queryset)
         if 'pk' in table.base_columns and any([request.user.has_perm(perm) for perm in self.edit_permissions]):
@@ -105,6 +167,7 @@ class ObjectListView(View):
             'table': table,
             'filter_form': self.filter_form(request.GET, label_suffix='') if self.filter_form else None,
             'export_templates': ExportTemplate.objects.filter(content_type=object_ct),
+            'filter_query': filter_query,
         }
         context.update(self.extra_context())
 
@@ -313,14 +376,13 @@ class BulkAddView(View):
             kwargs = {k: form.cleaned_data[k] for k in form.fields.keys()[1:]}
 
             new_objs = []
+            for value in pattern:
+                obj = self.model(**kwargs)
+                setattr(obj, pattern_field, value)
+                new_objs.append(obj)
             try:
                 with transaction.atomic():
-                    for value in pattern:
-                        obj = self.model(**kwargs)
-                        setattr(obj, pattern_field, value)
-                        obj.full_clean()
-                        obj.save()
-                        new_objs.append(obj)
+                    self.save_objects(new_objs)
             except ValidationError as e:
                 form.add_error(None, e)
 
@@ -334,6 +396,15 @@ class BulkAddView(View):
             'cancel_url': reverse(self.redirect_url),
         })
 
+    def save_objects(self, objs):
+        """
+        Validate and save the new objects, raising a ValidationError if any is invalid. Override this to validate and
+        save the objects as a batch.
+        """
+        for obj in objs:
+            obj.full_clean()
+            obj.save()
+
 
 class BulkImportView(View):
     """
@@ -396,12 +467,14 @@ class BulkEditView(View):
     cls: The model of the objects being edited
     parent_cls: The model of the parent object (if any)
     form: The form class used to edit objects in bulk
+    filter: The django-filter FilterSet of the list view (required to edit all objects matching a filter)
     template_name: The name of the template
     default_redirect_url: Name of the URL to which the user is redirected after editing the objects
     """
     cls = None
     parent_cls = None
     form = None
+    filter = None
     template_name = None
     default_redirect_url = None
 
@@ -427,14 +500,13 @@ class BulkEditView(View):
         else:
             raise ImproperlyConfigured('No redirect URL has been provided.')
 
-        # Are we editing *all* objects in the queryset or just a selected subset?
-        if request.POST.get('_all'):
-            pk_list = [int(pk) for pk in request.POST.get('pk_all').split(',') if pk]
-        else:
-            pk_list = [int(pk) for pk in request.POST.getlist('pk')]
+        # Are we editing *all* objects matching the filter, all objects in the table, or just a selected subset?
+        queryset, pk_list, filter_query = get_bulk_selection(request, self.cls, self.filter)
 
         if '_apply' in request.POST:
             form = self.form(self.cls, request.POST)
+            if filter_query is not None:
+                form.fields['pk'].required = False
             if form.is_valid():
 
                 custom_fields = form.custom_fields if hasattr(form, 'custom_fields') else []
@@ -451,13 +523,24 @@ class BulkEditView(View):
                             fields_to_update[field] = None
                     elif form.cleaned_data[field]:
                         fields_to_update[field] = form.cleaned_data[field]
-                updated_count = self.cls.objects.filter(pk__in=pk_list).update(**fields_to_update)
 
-                # Update custom fields for objects
-                if custom_fields:
-                    objs_updated = self.update_custom_fields(pk_list, form, custom_fields, nullified_fields)
-                    if objs_updated and not updated_count:
-                        updated_count = objs_updated
+                # Objects selected by filter are updated in chunks, each of which is identified by a keyset query.
+                updated_count = 0
+                objs_updated = 0
+                with transaction.atomic():
+                    for chunk in (iter_pk_chunks(queryset) if pk_list is None else [pk_list]):
+                        if fields_to_update:
+                            updated_count += self.cls.objects.filter(pk__in=chunk).update(**fields_to_update)
+                        # Update custom fields for objects
+                        if custom_fields:
+                            objs_updated += self.update_custom_fields(chunk, form, custom_fields, nullified_fields)
+
+                # QuerySet.update() sends no signals, so invalidate any statistics affected by the change here.
+                if settings.STATS_SUMMARY and updated_count:
+                    invalidate_stats(self.cls)
+
+                if objs_updated and not updated_count:
+                    updated_count = objs_updated
 
                 if updated_count:
                     msg = u'Updated {} {}'.format(updated_count, self.cls._meta.verbose_name_plural)
@@ -468,14 +551,23 @@ class BulkEditView(View):
         else:
             form = self.form(self.cls, initial={'pk': pk_list})
 
-        selected_objects = self.cls.objects.filter(pk__in=pk_list)
-        if not selected_objects:
+        # Objects selected by filter are only counted for confirmation, rather than listed
+        if filter_query is not None:
+            selected_objects = None
+            selected_count = queryset.count()
+        else:
+            selected_objects = queryset
+            selected_count = len(selected_objects)
+        if not selected_count:
             messages.warning(request, u"No {} were selected.".format(self.cls._meta.verbose_name_plural))
             return redirect(redirect_url)
 
         return render(request, self.template_name, {
             'form': form,
+            'obj_type_plural': self.cls._meta.verbose_name_plural,
             'selected_objects': selected_objects,
+            'selected_count': selected_count,
+            'filter_query': filter_query,
             'cancel_url': redirect_url,
         })
 
@@ -534,12 +626,14 @@ class BulkDeleteView(View):
     cls: The model of the objects being deleted
     parent_cls: The model of the parent object (if any)
     form: The form class used to delete objects in bulk
+    filter: The django-filter FilterSet of the list view (required to delete all objects matching a filter)
     template_name: The name of the template
     default_redirect_url: Name of the URL to which the user is redirected after deleting the objects
     """
     cls = None
     parent_cls = None
     form = None
+    filter = None
     template_name = 'utilities/confirm_bulk_delete.html'
     default_redirect_url = None
 
@@ -562,24 +656,40 @@ class BulkDeleteView(View):
         else:
             raise ImproperlyConfigured('No redirect URL has been provided.')
 
-        # Are we deleting *all* objects in the queryset or just a selected subset?
-        if request.POST.get('_all'):
-            pk_list = [int(pk) for pk in request.POST.get('pk_all').split(',') if pk]
-        else:
-            pk_list = [int(pk) for pk in request.POST.getlist('pk')]
+        # Are we deleting *all* objects matching the filter, all objects in the table, or just a selected subset?
+        queryset, pk_list, filter_query = get_bulk_selection(request, self.cls, self.filter)
 
         form_cls = self.get_form()
 
         if '_confirm' in request.POST:
             form = form_cls(request.POST)
+            if filter_query is not None:
+                form.fields['pk'].required = False
             if form.is_valid():
 
-                # Delete objects
-                queryset = self.cls.objects.filter(pk__in=pk_list)
+                # Report any protected objects before deleting anything
+                plan = DeletionPlan.for_model(self.cls)
                 try:
-                    deleted_count = queryset.delete()[1][self.cls._meta.label]
+                    plan.check_protected(queryset)
                 except ProtectedError as e:
-                    handle_protectederror(list(queryset), request, e)
+                    handle_protectederror(list(queryset[:1]), request, e)
+                    return redirect(redirect_url)
+
+                # Delete objects. Deletions of more than a single chunk of objects are performed in the background,
+                # which records the selection (rather than the PK of each object) so that it can be resumed.
+                if queryset.count() > DELETION_CHUNK_SIZE:
+                    if filter_query is not None:
+                        job = start_bulk_deletion(request.user, self.cls, filter=self.filter, filter_query=filter_query)
+                    else:
+                        job = start_bulk_deletion(request.user, self.cls, pk_list=pk_list)
+                    messages.info(request, u"Deleting {} {} in the background.".format(
+                        job.total, self.cls._meta.verbose_name_plural
+                    ))
+                    return redirect('users:bulk_deletions')
+                try:
+                    deleted_count = plan.delete(queryset).get(self.cls._meta.label, 0)
+                except ProtectedError as e:
+                    handle_protectederror(list(queryset[:1]), request, e)
                     return redirect(redirect_url)
 
                 msg = u'Deleted {} {}'.format(deleted_count, self.cls._meta.verbose_name_plural)
@@ -590,8 +700,14 @@ class BulkDeleteView(View):
         else:
             form = form_cls(initial={'pk': pk_list})
 
-        selected_objects = self.cls.objects.filter(pk__in=pk_list)
-        if not selected_objects:
+        # Objects selected by filter are only counted for confirmation, rather than listed
+        if filter_query is not None:
+            selected_objects = None
+            selected_count = queryset.count()
+        else:
+            selected_objects = queryset
+            selected_count = len(selected_objects)
+        if not selected_count:
             messages.warning(request, u"No {} were selected for deletion.".format(self.cls._meta.verbose_name_plural))
             return redirect(redirect_url)
 
@@ -600,6 +716,8 @@ class BulkDeleteView(View):
             'parent_obj': parent_obj,
             'obj_type_plural': self.cls._meta.verbose_name_plural,
             'selected_objects': selected_objects,
+            'selected_count': selected_count,
+            'filter_query': filter_query,
             'cancel_url': redirect_url,
         })
 